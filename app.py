@@ -1,17 +1,31 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 from datetime import datetime, time as dt_time
 from zoneinfo import ZoneInfo
-import os
 import time
-import numpy as np
-import telebot
-from telebot import TeleBot
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from io import BytesIO
-from openai import OpenAI
+# Plotly, Matplotlib, OpenAI and yfinance are imported where they're first used
+# (chart, Telegram image, Grok, the Yahoo provider) to keep cold starts fast.
+# `python -m daytrade importtime` shows what each dependency costs.
+from daytrade.market_data import INDICES, unique_symbols
+from daytrade.market_calendar import market_status
+from daytrade.bar_store import BarStore, sync_bars, period_days
+from daytrade.cache import SingleFlightCache
+from daytrade.poller import MarketPoller
+from daytrade.snapshot import MarketSnapshot, signal_line, signal_table
+from daytrade.journal import SignalJournal
+from daytrade.alerts import AlertDispatcher, alert_rows, signal_alert
+from daytrade.backtest import run_backtest, run_gate_backtest
+from daytrade.gates import thresholds_for
+from daytrade.trade_log import TradeLog
+from daytrade.briefing import LLM_BASE_URL, BriefingService, briefing_key, briefing_prompt
+from daytrade.render import PriceCharts, SnapshotRenderer, signal_color
+from daytrade.screener import UNIVERSES, load_universe, page, rescore, screen
+from daytrade.portfolio import account_heat, latest_prices, position_heat, ticker_concentration
+from daytrade.profiling import REGISTRY, RerunProfile
+from daytrade.providers import get_provider
+
+profile = RerunProfile()  # stage timings for this rerun (see Diagnostics at the bottom)
 
 # ====================== PAGE CONFIG ======================
 st.set_page_config(
@@ -44,163 +58,110 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ====================== CACHING ======================
-@st.cache_data(ttl=5, show_spinner=False)
-def get_history(ticker: str, period: str = "2d", interval: str = "1d"):
-    try:
-        return yf.Ticker(ticker).history(period=period, interval=interval)
-    except:
-        return pd.DataFrame()
+@st.cache_resource(show_spinner=False)
+def get_bar_store():
+    # Local 15m bar history shared by every session; survives restarts
+    return BarStore()
+
+@st.cache_resource(show_spinner=False)
+def get_poller():
+    # One background thread per process fetches data + computes signals for every session
+    return MarketPoller(get_bar_store(), TICKERS, journal=SignalJournal().start()).start()
+
+@st.cache_resource(show_spinner=False)
+def get_trade_log():
+    # SQLite journal shared by all sessions; pulls in the old trade_log.csv once
+    trade_log = TradeLog()
+    trade_log.import_csv(CSV_FILE)
+    return trade_log
+
+@st.cache_resource(show_spinner=False)
+def get_alert_dispatcher():
+    # Background Telegram sender shared by all sessions (durable dedupe in alerts.db)
+    return AlertDispatcher().start()
+
+@st.cache_resource(show_spinner=False)
+def get_shared_cache():
+    # One loader per key across all sessions; expired entries are served stale while one refresh runs
+    caches = {
+        "backtest": SingleFlightCache(ttl=1800, stale_ttl=3600, name="backtest"),
+        "intraday": SingleFlightCache(ttl=60, stale_ttl=300, name="intraday"),
+        "screener": SingleFlightCache(ttl=120, stale_ttl=600, name="screener"),
+    }
+    for name, cache in caches.items():
+        REGISTRY.register_cache(name, cache)
+    return caches
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def run_intraday_backtest(tick: str, is_strict: bool):
+def _load_intraday_backtest(tick: str, is_strict: bool, full_gates: bool):
     try:
-        hist = yf.Ticker(tick).history(period="60d", interval="15m")
-        qqq_hist = yf.Ticker("QQQ").history(period="60d", interval="15m")
-        hist.index = hist.index.tz_convert("America/New_York")
-        qqq_hist.index = qqq_hist.index.tz_convert("America/New_York")
-        if len(hist) < 200: return None
-        signals = wins = total_pl = 0
-        pl_list = []
-        max_win_streak = max_loss_streak = current_streak = 0
-        current_is_win = False
-        for day in hist.index.normalize().unique()[-60:]:
-            day_data = hist[hist.index.normalize() == day]
-            morning = day_data.between_time("9:45", "11:30")
-            if morning.empty: continue
-            for j in range(len(morning)):
-                idx = morning.index[j]
-                curr_price = morning['Close'].iloc[j]
-                today_open = day_data['Open'].iloc[0]
-                chg_from_open = (curr_price - today_open) / today_open * 100
-                if chg_from_open < (4.5 if not is_strict else 3) and 9 < idx.hour < 12:
-                    signals += 1
-                    entry = curr_price
-                    future = day_data[day_data.index > idx]
-                    exited = False
-                    for k in range(len(future)):
-                        exit_p = future['Close'].iloc[k]
-                        if exit_p >= entry * 1.03:
-                            pl = 3.0
-                            exited = True
-                            break
-                        if exit_p <= entry * 0.98:
-                            pl = -2.0
-                            exited = True
-                            break
-                        if future.index[k].hour >= 12:
-                            pl = (exit_p - entry) / entry * 100
-                            exited = True
-                            break
-                    if exited:
-                        total_pl += pl
-                        pl_list.append(pl)
-                        if pl > 0:
-                            wins += 1
-                            current_streak = current_streak + 1 if current_is_win else 1
-                            current_is_win = True
-                            max_win_streak = max(max_win_streak, current_streak)
-                        else:
-                            current_streak = current_streak + 1 if not current_is_win else 1
-                            current_is_win = False
-                            max_loss_streak = max(max_loss_streak, current_streak)
-        if signals > 0:
-            win_rate = wins / signals * 100
-            return {
-                "signals": signals,
-                "win_rate": round(win_rate, 1),
-                "avg_pl": round(total_pl / signals, 2),
-                "avg_win": round(np.mean([p for p in pl_list if p > 0]) if wins > 0 else 0, 2),
-                "avg_loss": round(np.mean([p for p in pl_list if p < 0]) if (signals - wins) > 0 else 0, 2),
-                "profit_factor": round(sum(p for p in pl_list if p > 0) / abs(sum(p for p in pl_list if p < 0)) if any(p < 0 for p in pl_list) else float('inf'), 2),
-                "max_win_streak": max_win_streak,
-                "max_loss_streak": max_loss_streak,
-                "total_pl": round(total_pl, 1)
-            }
-        return None
+        store = get_bar_store()
+        sync_bars(store, [tick, "QQQ"], interval="15m", period="60d")
+        hist = store.load(tick, "15m", sessions=60)
+        if not full_gates:
+            return run_backtest(hist, is_strict)
+        qqq_hist = store.load("QQQ", "15m", sessions=60)
+        return run_gate_backtest(hist, qqq_hist, is_strict)
     except:
         return None
 
-@st.cache_data(ttl=60, show_spinner=False)
+def run_intraday_backtest(tick: str, is_strict: bool, full_gates: bool = True):
+    return get_shared_cache()["backtest"].get(
+        (tick, is_strict, full_gates), lambda: _load_intraday_backtest(tick, is_strict, full_gates))
+
+def _load_intraday_history(ticker: str, period: str, interval: str):
+    # Provider failures come back as empty frames, so this never raises on a bad feed
+    store = get_bar_store()
+    sync_bars(store, [ticker], interval=interval, period=period)
+    return store.load(ticker, interval, sessions=period_days(period))
+
 def get_intraday_history(ticker: str, period: str = "5d", interval: str = "15m"):
+    # Shared across sessions: treat the frame as read-only
+    return get_shared_cache()["intraday"].get(
+        (ticker, period, interval), lambda: _load_intraday_history(ticker, period, interval))
+
+def _load_screener(universe: str, is_strict: bool, qqq_chg: float):
+    symbols = UNIVERSES[universe]
+    frames = load_universe(get_bar_store(), symbols)
+    return screen(frames, symbols, qqq_chg, thresholds_for(is_strict))
+
+def run_screener(universe: str, is_strict: bool, qqq_chg: float):
+    # Whole-universe gates in one vectorized pass, shared by every session for 2 minutes;
+    # relative strength + time window are re-checked against this rerun's QQQ move and clock
+    cached = get_shared_cache()["screener"].get(
+        (universe, is_strict), lambda: _load_screener(universe, is_strict, qqq_chg))
+    return rescore(cached, qqq_chg, thresholds_for(is_strict))
+
+@st.cache_resource(show_spinner=False)
+def get_snapshot_renderer():
+    # Telegram PNGs render on one background thread, cached by table + regime for every session
+    renderer = SnapshotRenderer()
+    REGISTRY.register_cache("signals_image", renderer)
+    return renderer
+
+@st.cache_resource(show_spinner=False)
+def get_briefing_service():
+    # One Grok generator per server: every session reads the same streamed briefing, saved to disk
     try:
-        df = yf.Ticker(ticker).history(period=period, interval=interval)
-        if not df.empty:
-            df.index = df.index.tz_convert("America/New_York")
-        return df
+        xai = dict(st.secrets.get("xai", {}))
     except:
-        return pd.DataFrame()
-
-@st.cache_data(ttl=1800, show_spinner=False)
-def get_grok_premarket_briefing(regime: str, qqq_chg: float, vix: float, top_signals: str, price_summary: str):
-    try:
-        client = OpenAI(
-            api_key=st.secrets["xai"]["api_key"],
-            base_url="https://api.x.ai/v1"
-        )
-        prompt = f"""You are an elite day-trading analyst focused ONLY on long-only leveraged ETF momentum-pullback trades (SOXL, TQQQ, TECL, FNGU, NVDL, TSLL, SPXL, QLD, UPRO and any custom tickers added today).
-
-Date: {datetime.now(ZoneInfo("America/New_York")).strftime('%A, %B %d, %Y')}
-Current Regime: {regime}
-QQQ from open: {qqq_chg:+.2f}%
-VIX: {vix}
-
-Current prices (use these EXACT numbers — do not guess or use old data):
-{price_summary}
-
-Current strong signals:
-{top_signals or "None yet"}
-
-EXAMPLES OF PERFECT BRIEFINGS (copy this exact style):
-
-Example 1 (Bullish day):
-1. Overnight news: NVDA beat earnings + China stimulus rumors lifting semis.
-2. Premarket futures: NQ +1.4%, ES +0.9%, NVDA gapping +3.2%, SOXX +2.1%.
-3. Sector rotation: Semis leading (SOXL +4.1% pre), broad tech following.
-4. Key levels: SOXL support 38.50 / resistance 42.80; TQQQ 72.30–78.50; TECL 95–102.
-5. Aggression level: Aggressive Long — strong momentum.
-6. Red flags: None — low gap risk today.
-
-**Recommended Approach:** Enter 9-gate pullbacks aggressively on SOXL/TQQQ/TECL with 2% risk. Trail after +3%.
-
-Example 2 (Neutral/choppy day):
-1. Overnight news: Mixed PPI data + Fed speakers later.
-2. Premarket futures: NQ flat, ES -0.3%, NVDA +0.8%, SOXX +0.4%.
-3. Sector rotation: Rotation into defensives; semis lagging.
-4. Key levels: TQQQ 68.40–71.20; SOXL 36.80–39.10; FNGU 180–188.
-5. Aggression level: Selective Long — tight stops only.
-6. Red flags: VIX 26 — watch for volatility decay on 3x names.
-
-**Recommended Approach:** Only take strongest 9-gate setups on TQQQ/NVDL with 1% risk. Sit out if no clear pullback by 10:30 ET.
-
-Now generate today's briefing in exactly this style. Be direct and actionable. End exactly with: "**Recommended Approach:** ..."
-
-Focus on setups that fit a 9-gate morning pullback system. No bearish or short ideas."""
-        
-        response = client.chat.completions.create(
-            model="grok-4-1-fast",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=950,
-            temperature=0.65
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"⚠️ Grok unavailable right now: {str(e)[:120]}"
+        xai = {}
+    return BriefingService(api_key=xai.get("api_key"), base_url=xai.get("base_url", LLM_BASE_URL))
+
+@st.fragment(run_every=0.5)
+def show_streaming_briefing(day: str, key: str):
+    # Redraws just this box while tokens arrive; one full rerun once it's finished
+    briefing = get_briefing_service().get(day, key)
+    st.markdown(briefing.text + " ▌")
+    if not briefing.streaming:
+        st.rerun()
 
 # ====================== CONFIG ======================
 DEFAULT_ACCOUNT_SIZE = 20000
 CSV_FILE = "trade_log.csv"
-JOURNAL_FILE = "daily_signals.csv"
 TICKERS = ["SOXL", "TQQQ", "TECL", "FNGU", "NVDL", "TSLL", "SPXL", "QLD", "UPRO"]
 KEY_UNDERLYINGS = ["NVDA", "TSLA", "AMD", "AVGO", "AAPL", "MSFT", "META", "AMZN"]
 
-if os.path.exists(CSV_FILE):
-    trades_df = pd.read_csv(CSV_FILE)
-else:
-    trades_df = pd.DataFrame(columns=["Date", "Ticker", "Entry Price", "Exit Price", "Shares", "P/L $", "Notes"])
-    trades_df.to_csv(CSV_FILE, index=False)
-
-if not os.path.exists(JOURNAL_FILE):
-    pd.DataFrame(columns=["Date", "Signal", "Ticker", "Strength", "Price", "Chg%"]).to_csv(JOURNAL_FILE, index=False)
+trade_log = get_trade_log()
 
 # ====================== DYNAMIC TICKERS (fixes custom ticker bug) ======================
 if 'dynamic_tickers' not in st.session_state:
@@ -231,74 +192,50 @@ Only use money you can afford to lose completely.
 st.caption("High Risk / High Reward – Rules only, no emotion")
 
 now_et = datetime.now(ZoneInfo("America/New_York"))
-market_status = "🟢 MARKET OPEN" if dt_time(9, 30) <= now_et.time() <= dt_time(16, 0) else "🔴 MARKET CLOSED"
-st.markdown(f"<h4 style='text-align:center; background:#1e3a8a; color:white; padding:8px; border-radius:12px;'>{market_status} — {now_et.strftime('%H:%M ET')}</h4>", unsafe_allow_html=True)
+# NYSE calendar (holidays, half days, pre / post) — every time check below goes through this
+market = market_status(now_et)
+st.markdown(f"<h4 style='text-align:center; background:#1e3a8a; color:white; padding:8px; border-radius:12px;'>{market.label} — {now_et.strftime('%H:%M ET')}</h4>", unsafe_allow_html=True)
+
+# ====================== MARKET DATA SNAPSHOT (shared background poller) ======================
+poller = get_poller()
+# Open positions ride along in the same batched fetch so Portfolio Heat needs no extra calls
+open_tickers = trade_log.open_tickers()
+if poller.watch(unique_symbols(st.session_state.dynamic_tickers, open_tickers)) or poller.version == 0:
+    with st.spinner("Loading market data..."):
+        poller.wait_for(poller.version + 1, timeout=30)
+snapshot = poller.latest() or MarketSnapshot.empty()
+profile.lap("snapshot")
+intraday_bars = snapshot.intraday
 
 # Intra-day QQQ + VIX for accurate regime
-qqq_hist = get_intraday_history("QQQ")
-if not qqq_hist.empty:
-    today = qqq_hist.index[-1].normalize()
-    today_data = qqq_hist[qqq_hist.index.normalize() == today]
-    qqq_open = today_data['Open'].iloc[0] if not today_data.empty else qqq_hist['Open'].iloc[-1]
-    qqq_curr = qqq_hist['Close'].iloc[-1]
-    qqq_chg_from_open = (qqq_curr - qqq_open) / qqq_open * 100 if qqq_open != 0 else 0
-else:
-    qqq_chg_from_open = 0
-
-vix_hist = get_history("^VIX", "2d")
-vix = round(vix_hist['Close'].iloc[-1], 1) if len(vix_hist) > 0 else 0
-
-if qqq_chg_from_open > 0.8:
-    regime = "🟢 Bullish Day – Trade Aggressively"
-elif qqq_chg_from_open > -0.8:
-    regime = "🟡 Neutral Day – Stick to Strong Buys"
-else:
-    regime = "🔴 Choppy/Bearish Day – Caution Advised"
-
-if vix > 35:
-    vix_status = "🔴 EXTREME VOL – Avoid or ultra tight stops"
-elif vix > 25:
-    vix_status = "🟠 High Vol – Caution, smaller size"
-elif vix > 18:
-    vix_status = "🟡 Normal Vol"
-else:
-    vix_status = "🟢 Low Vol – Aggressive OK"
+qqq_chg_from_open = snapshot.qqq_chg_from_open
+vix = snapshot.vix
+regime = snapshot.regime
+vix_status = snapshot.vix_status
+upstream = snapshot.upstream
+upstream_note = f" · {upstream['calls']:.0f} upstream calls, {upstream['fetch_ms'] / 1000:.1f}s" if upstream else ""
+if poller.next_poll_at is not None and not market.is_open:
+    upstream_note += f" · next update {poller.next_poll_at.strftime('%a %H:%M ET')}"
 
 st.markdown(f"""
 <h3 style='text-align:center; background:#1e3a8a; color:white; padding:14px; border-radius:12px; margin-bottom:12px;'>
     {regime} (QQQ {qqq_chg_from_open:+.1f}%)<br>
     <span style='font-size:1.1em;'>VIX {vix} — {vix_status}</span><br>
-    <span style='font-size:0.95em; opacity:0.9;'>Last Updated: {now_et.strftime('%H:%M:%S ET')}</span>
+    <span style='font-size:0.95em; opacity:0.9;'>Last Updated: {snapshot.taken_at.strftime('%H:%M:%S ET')} (snapshot #{snapshot.version}{upstream_note})</span>
 </h3>
 """, unsafe_allow_html=True)
 
 # ====================== BROAD MARKET INDICES ======================
 st.subheader("📊 Broad Market Indices")
 idx_cols = st.columns(3)
-with idx_cols[0]:
-    try:
-        data = get_history("^DJI", "2d")
-        price = data['Close'].iloc[-1]
-        chg = (price - data['Close'].iloc[-2]) / data['Close'].iloc[-2] * 100
-        st.metric("Dow", f"{price:,.0f}", f"{chg:+.2f}%")
-    except:
-        st.metric("Dow", "—")
-with idx_cols[1]:
-    try:
-        data = get_history("^IXIC", "2d")
-        price = data['Close'].iloc[-1]
-        chg = (price - data['Close'].iloc[-2]) / data['Close'].iloc[-2] * 100
-        st.metric("Nasdaq", f"{price:,.0f}", f"{chg:+.2f}%")
-    except:
-        st.metric("Nasdaq", "—")
-with idx_cols[2]:
-    try:
-        data = get_history("^GSPC", "2d")
-        price = data['Close'].iloc[-1]
-        chg = (price - data['Close'].iloc[-2]) / data['Close'].iloc[-2] * 100
-        st.metric("S&P 500", f"{price:,.0f}", f"{chg:+.2f}%")
-    except:
-        st.metric("S&P 500", "—")
+for idx_col, (symbol, name) in zip(idx_cols, INDICES.items()):
+    with idx_col:
+        quote = snapshot.quote(symbol)
+        if quote:
+            st.metric(name, f"{quote.price:,.0f}", f"{quote.chg_pct:+.2f}%")
+        else:
+            st.metric(name, "—")
+profile.lap("indices")
 
 # Family Telegram Guide
 st.markdown("### 👨‍👩‍👧‍👦 Welcome to Day Trade Monitor – Family Edition")
@@ -334,6 +271,7 @@ with input_cols[2]:
     strategy_mode = st.selectbox("Strategy Mode", ["Balanced (more opportunities)", "Strict (higher win rate)"], index=0)
 
 is_strict = strategy_mode.startswith("Strict")
+th = thresholds_for(is_strict)
 
 base_risk_dollars = account_size * float(risk_pct.strip("%")) / 100
 st.caption(f"**Base Max Loss (fixed risk):** ${base_risk_dollars:,.0f} ({risk_pct})")
@@ -341,21 +279,11 @@ st.caption(f"**Base Max Loss (fixed risk):** ${base_risk_dollars:,.0f} ({risk_pc
 refresh_col, auto_col = st.columns([1, 3])
 with refresh_col:
     if st.button("🔄 Refresh All Data", type="primary", width="stretch"):
+        poller.refresh_now()
+        poller.wait_for(poller.version + 1, timeout=30)
         st.rerun()
 with auto_col:
-    auto_refresh = st.checkbox("Auto-refresh Heat-Map & Signals every 60 seconds (1 minute)", value=True, key="auto_refresh_checkbox")
-
-# Defensive defaults
-ticker_data_list = []
-qqq_chg_from_open = 0.0
-if 'ticker_data_list' not in st.session_state:
-    st.session_state.ticker_data_list = []
-
-# Calculate QQQ change for Trade Plan
-qqq_hist = get_history("QQQ", "5d")
-qqq_open = qqq_hist['Open'].iloc[-1] if not qqq_hist.empty else 0
-qqq_curr = qqq_hist['Close'].iloc[-1] if not qqq_hist.empty else 0
-qqq_chg_from_open = (qqq_curr - qqq_open) / qqq_open * 100 if qqq_open != 0 else 0
+    auto_refresh = st.checkbox("Auto-refresh Heat-Map & Signals every 60 seconds (1 minute) — slower outside 9:30–12:00, paused while the market is closed", value=True, key="auto_refresh_checkbox")
 
 # ====================== MANUAL TICKER INPUT ======================
 st.subheader("🔍 Add Custom Ticker (any symbol)")
@@ -378,107 +306,13 @@ with col_m3:
         st.success("✅ Custom tickers cleared!")
         st.rerun()
 
+profile.lap("controls")
+
 # ====================== SIGNALS + HEAT-MAP ======================
 st.subheader("🚀 Trade Signals")
-ticker_data_list = []
-
-for tick in st.session_state.dynamic_tickers:
-    try:
-        hist = get_intraday_history(tick)
-        if hist.empty or len(hist) < 50: continue
-
-        curr = hist['Close'].iloc[-1]
-        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else curr
-
-        # Correct today's open (first 9:30 bar of the day)
-        today = hist.index[-1].normalize()
-        today_data = hist[hist.index.normalize() == today]
-        today_open = today_data['Open'].iloc[0] if not today_data.empty else curr
-        chg_from_open = (curr - today_open) / today_open * 100 if today_open != 0 else 0
-
-        prev_vol = hist['Volume'].iloc[-2] if len(hist) > 1 else 0
-        curr_vol = hist['Volume'].iloc[-1]
-        vol_ratio = curr_vol / prev_vol if prev_vol > 0 else 1.0
-        vol_ok = curr_vol > prev_vol * (1.5 if not is_strict else 1.8)
-
-        # All indicators now on clean 15m bars
-        delta = hist['Close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(14).mean()
-        loss = -delta.where(delta < 0, 0).rolling(14).mean().abs()
-        loss_safe = loss.replace(0, 1e-10)
-        rs = gain / loss_safe
-        rsi = max(0, min(100, 100 - (100 / (1 + rs)).iloc[-1]))
-        rsi_ok = rsi < (78 if not is_strict else 75)
-
-        ema50 = hist['Close'].ewm(span=50, adjust=False).mean().iloc[-1]
-        ema200 = hist['Close'].ewm(span=200, adjust=False).mean().iloc[-1]
-        bull = ema50 > ema200
-
-        ema9 = hist['Close'].ewm(span=9, adjust=False).mean().iloc[-1]
-        near_9ema = abs(curr - ema9) / ema9 < (0.02 if not is_strict else 0.015)
-        dist_9ema_pct = abs(curr - ema9) / ema9 * 100 if ema9 != 0 else 0
-
-        now_et_time = datetime.now(ZoneInfo("America/New_York")).time()
-        time_ok = dt_time(9, 30) <= now_et_time <= dt_time(12, 0) if not is_strict else dt_time(9, 45) <= now_et_time <= dt_time(11, 30)
-
-        ema12 = hist['Close'].ewm(span=12, adjust=False).mean()
-        ema26 = hist['Close'].ewm(span=26, adjust=False).mean()
-        macd_line = ema12 - ema26
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        macd_hist = macd_line - signal_line
-        macd_bullish = macd_line.iloc[-1] > signal_line.iloc[-1]
-        hist_positive = macd_hist.iloc[-1] > 0
-        hist_rising = macd_hist.iloc[-1] > macd_hist.iloc[-2] if len(macd_hist) > 1 else False
-        histogram_ok = hist_positive and (hist_rising if is_strict else True)
-
-        rel_strength_ok = chg_from_open > qqq_chg_from_open - 0.5
-
-        conditions_met = sum([bull, vol_ok, rsi_ok, chg_from_open < (4.5 if not is_strict else 3),
-                              near_9ema, time_ok, macd_bullish, histogram_ok, rel_strength_ok])
-
-        sacred_passed = bull and (chg_from_open < (4.5 if not is_strict else 3))
-
-        if conditions_met >= 9:
-            label = "Strong Buy"
-        elif conditions_met >= 8 or (conditions_met == 7 and sacred_passed):
-            label = "Caution Buy"
-        elif conditions_met >= 7:
-            label = "Watch"
-        else:
-            label = "Sit Out"
-
-        ticker_data_list.append({
-            "Ticker": tick,
-            "Price": round(curr, 2),
-            "Chg %": round(chg_from_open, 1),
-            "Strength": conditions_met,
-            "Signal": label,
-            "Data": {
-                "curr": curr,
-                "prev": prev_close,
-                "chg_from_open": chg_from_open,
-                "rsi": rsi,
-                "bull": bull,
-                "vol_ok": vol_ok,
-                "near_9ema": near_9ema,
-                "time_ok": time_ok,
-                "macd_bullish": macd_bullish,
-                "histogram_ok": histogram_ok,
-                "rel_strength_ok": rel_strength_ok,
-                "label": label,
-                "strength": conditions_met,
-                "ema9": ema9,
-                "vol_ratio": vol_ratio,
-                "macd_line": macd_line.iloc[-1],
-                "macd_hist": macd_hist.iloc[-1],
-                "dist_9ema_pct": dist_9ema_pct
-            }
-        })
-    except:
-        pass
-
-# Save signals for later sections (auto alerts, Grok, etc.)
-st.session_state.ticker_data_list = ticker_data_list
+# Gates were already evaluated by the poller for both modes; every section below reads these same records
+mode = "strict" if is_strict else "balanced"
+ticker_data_list = snapshot.rows(mode, st.session_state.dynamic_tickers)
 
 # ====================== GROK PRE-MARKET INTELLIGENCE (AUTO + ACCURATE) ======================
 st.subheader("🧠 Grok Pre-Market Intelligence")
@@ -486,59 +320,66 @@ st.caption("Auto-generates 7:30–9:30 ET on trading days • Powered by real Gr
 
 now_et = datetime.now(ZoneInfo("America/New_York"))
 today_str = now_et.strftime("%Y-%m-%d")
-grok_key = f"grok_briefing_{today_str}"
 
-# Weekend / Market Closed Guard
-is_trading_day = now_et.weekday() < 5  # Monday=0 ... Friday=4
+# Weekend / Holiday Guard
+is_trading_day = market.is_trading_day
 
 if not is_trading_day:
-    st.info("🛑 Weekend / Market Closed — No pre-market briefing today. Come back Monday!")
+    st.info(f"🛑 {market.reason} — Market Closed, no pre-market briefing today. "
+            f"Next session: {market.upcoming.open.strftime('%A, %B %d')}")
     st.button("🔄 Generate Grok Briefing Now", type="primary", width="stretch", disabled=True)
 else:
     # Build fresh price summary so Grok never hallucinates prices
-    ticker_list = st.session_state.get("ticker_data_list", [])
     price_summary = "\n".join([
-        f"{row['Ticker']}: ${row['Price']:.2f} ({row['Chg %']:+.1f}%)"
-        for row in ticker_list
+        f"{row.ticker}: ${row.price:.2f} ({row.chg_from_open:+.1f}%)"
+        for row in ticker_data_list
     ]) or "No live prices yet"
 
     strong_summary = "\n".join([
-        f"• {row['Ticker']} @ ${row['Price']} ({row['Chg %']}%) — {row['Strength']}/9"
-        for row in ticker_list if "Strong Buy" in row.get("Signal", "")
+        f"• {signal_line(row)}" for row in snapshot.strong_buys(mode, st.session_state.dynamic_tickers)
     ]) or "None detected yet"
 
     current_regime = regime if 'regime' in locals() else "Neutral Day"
     current_qqq = qqq_chg_from_open if 'qqq_chg_from_open' in locals() else 0.0
     current_vix = vix if 'vix' in locals() else 18.0
 
-    # Auto-run only in morning window on trading days
-    if dt_time(7, 30) <= now_et.time() <= dt_time(9, 30):
-        if grok_key not in st.session_state:
-            with st.spinner("Grok analyzing overnight news + fresh prices..."):
-                briefing = get_grok_premarket_briefing(
-                    current_regime, current_qqq, current_vix, strong_summary, price_summary
-                )
-                st.session_state[grok_key] = briefing
+    # Generated once per day per input bucket (regime, QQQ / VIX bucket, strong buys) for every session
+    briefings = get_briefing_service()
+    bucket = briefing_key(current_regime, current_qqq, current_vix,
+                          [row.ticker for row in snapshot.strong_buys(mode, st.session_state.dynamic_tickers)])
+
+    def request_briefing(force=False):
+        prompt = briefing_prompt(now_et.strftime('%A, %B %d, %Y'), current_regime, current_qqq, current_vix,
+                                 strong_summary, price_summary)
+        return briefings.request(today_str, bucket, prompt, force=force)
+
+    # Auto-run only in morning window on trading days (runs in the background, nobody waits on it)
+    if dt_time(7, 30) <= now_et.time() <= market.session.open.time():
+        request_briefing()
 
     # Display
-    if grok_key in st.session_state:
+    briefing = briefings.get(today_str, bucket) or briefings.latest(today_str)
+    if briefing is not None:
         with st.expander("📋 Today's Grok Briefing (click to expand)", expanded=True):
-            st.markdown(st.session_state[grok_key])
-            if st.button("🔄 Refresh Grok Analysis", key="refresh_grok"):
-                del st.session_state[grok_key]
+            if briefing.streaming:
+                show_streaming_briefing(today_str, briefing.key)
+            else:
+                st.markdown(briefing.text)
+            if briefing.key != bucket:
+                st.caption("Market picture changed since this briefing — refresh for an updated one")
+            if st.button("🔄 Refresh Grok Analysis", key="refresh_grok", disabled=briefing.streaming):
+                request_briefing(force=True)
                 st.rerun()
     else:
         st.info("🕒 Grok briefing will auto-generate between 7:30–9:30 ET (or click the button below)")
 
     # Manual button (works anytime on trading days)
     if st.button("🔄 Generate Grok Briefing Now", type="primary", width="stretch"):
-        with st.spinner("Calling Grok with fresh prices..."):
-            briefing = get_grok_premarket_briefing(
-                current_regime, current_qqq, current_vix, strong_summary, price_summary
-            )
-            st.session_state[grok_key] = briefing
-            st.rerun()
+        request_briefing()
+        st.rerun()
         
+profile.lap("grok")
+
 # ====================== LIVE HEAT-MAP (Click any card to open plan) ======================
 st.subheader(f"📈 Live Heat-Map – {len(st.session_state.dynamic_tickers)} Tickers")
 st.caption("👆 Click any card below to open its full trade plan instantly")
@@ -546,9 +387,8 @@ st.caption("👆 Click any card below to open its full trade plan instantly")
 heat_cols = st.columns(7)
 for i, tick in enumerate(st.session_state.dynamic_tickers):
     try:
-        data = get_history(tick, "2d")
-        price = data['Close'].iloc[-1]
-        chg = (price - data['Close'].iloc[-2]) / data['Close'].iloc[-2] * 100
+        quote = snapshot.quote(tick)
+        price, chg = quote.price, quote.chg_pct
         color = "#15803d" if chg > 0 else "#b91c1c"
         
         with heat_cols[i % 7]:
@@ -558,48 +398,20 @@ for i, tick in enumerate(st.session_state.dynamic_tickers):
                 width="stretch",
                 help=f"Open full plan for {tick}"
             ):
-                # Set selected ticker and load its data
+                # The plan below reads this ticker's record from the snapshot
                 st.session_state.selected_ticker = tick
-                for row in st.session_state.get("ticker_data_list", []):
-                    if row["Ticker"] == tick:
-                        st.session_state.ticker_data = row["Data"]
-                        break
-                else:
-                    st.session_state.ticker_data = {}  # fallback
                 st.rerun()   # instantly shows the plan below
                 
     except:
         with heat_cols[i % 7]:
             st.button(f"**{tick}**\n—\n—", key=f"heat_{tick}_err", disabled=True, width="stretch")
 
+profile.lap("heat_map")
+
 # ====================== SIGNAL OVERVIEW TABLE ======================
 st.subheader("📋 Signal Overview Table (click row to open plan)")
 if ticker_data_list:
-    table_data = []
-    for row in ticker_data_list:
-        # Updated emojis + logic for Caution Buy
-        if "Strong Buy" in row["Signal"]:
-            color_emoji = "🟢"
-        elif "Caution Buy" in row["Signal"] or "Buy" in row["Signal"]:
-            color_emoji = "🟡"          # yellow circle for Caution Buy
-        elif "Watch" in row["Signal"]:
-            color_emoji = "🟡"
-        else:
-            color_emoji = "🔴"
-        
-        table_data.append({
-            "Signal": f"{color_emoji} {row['Signal']}",
-            "Ticker": row["Ticker"],
-            "Strength": row["Strength"],
-            "Price": row["Price"],
-            "Chg %": row["Chg %"],
-            "RSI": round(row["Data"]["rsi"], 1),
-            "Vol ×": round(row["Data"]["vol_ratio"], 1),
-            "To 9EMA %": round(row["Data"]["dist_9ema_pct"], 2),
-            "MACD Hist": round(row["Data"]["macd_hist"], 4)
-        })
-    df_table = pd.DataFrame(table_data)
-    df_table = df_table.sort_values(by="Strength", ascending=False)
+    df_table = signal_table(ticker_data_list)
 
     # ====================== ROW COLORING (Styler) ======================
     def color_row(row):
@@ -619,10 +431,6 @@ if ticker_data_list:
     
     st.dataframe(styled_table, width="stretch", height=530, hide_index=True)
 
-    # Save for safe Telegram image generation (prevents crashes)
-    st.session_state.df_table = df_table.copy()
-    st.session_state.regime = regime
-
     # Narrowed, centered, bolder dropdown + auto-load plan
     st.markdown("<h4 style='text-align: center; margin-bottom: 8px;'>Open full plan for:</h4>", unsafe_allow_html=True)
     col1, col_mid, col3 = st.columns([1, 2, 1])
@@ -634,58 +442,91 @@ if ticker_data_list:
             label_visibility="hidden"
         )
     
-    # Auto-load the selected plan
-    for row in ticker_data_list:
-        if row["Ticker"] == selected:
-            st.session_state.selected_ticker = selected
-            st.session_state.ticker_data = row["Data"]
-            break
+    # Auto-load the selected plan (only when the dropdown changes, so card clicks aren't overridden)
+    if selected and selected != st.session_state.get("plan_select_last"):
+        st.session_state.selected_ticker = selected
+        st.session_state.plan_select_last = selected
+
+profile.lap("table_style")
+
+# ====================== SCREENER (whole universe, top-N only) ======================
+st.subheader("🔭 Screener – Hundreds of Tickers")
+with st.expander("Rank a whole universe by gate strength (only the top tickers are shown)", expanded=False):
+    sc1, sc2, sc3 = st.columns([2, 1, 1])
+    with sc1:
+        screen_universe = st.selectbox("Universe", list(UNIVERSES), key="screen_universe",
+                                       format_func=lambda k: f"{k.replace('_', ' ').title()} ({len(UNIVERSES[k])})")
+    with sc2:
+        screen_top = st.selectbox("Show top", [21, 42, 105, 210], index=1, key="screen_top")
+    with sc3:
+        st.write("")
+        if st.button("🔭 Run Screener", type="primary", width="stretch"):
+            st.session_state.screen_active = True
+
+    if st.session_state.get("screen_active"):
+        with st.spinner(f"Screening {len(UNIVERSES[screen_universe])} tickers..."):
+            screened = run_screener(screen_universe, is_strict, snapshot.qqq_chg_from_open)
+        top = screened[:screen_top]
+        pages = page(top, 1)[1]
+        if st.session_state.get("screen_page", 1) > pages:
+            st.session_state.screen_page = pages  # fewer pages after switching universe / top-N
+        screen_page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key="screen_page")
+        page_records, _ = page(top, screen_page)
+        st.caption(f"{len(screened)} of {len(UNIVERSES[screen_universe])} tickers had enough 15m history · "
+                   "click a card to add it to the watchlist and open its plan")
+
+        screen_cols = st.columns(7)
+        for i, rec in enumerate(page_records):
+            with screen_cols[i % 7]:
+                if st.button(f"**{rec.ticker}**\n{rec.strength}/9\n${rec.price:,.2f}", key=f"screen_{rec.ticker}",
+                             width="stretch", help=f"{rec.label} – add {rec.ticker} to the watchlist"):
+                    if rec.ticker not in st.session_state.dynamic_tickers:
+                        st.session_state.dynamic_tickers.append(rec.ticker)
+                    st.session_state.selected_ticker = rec.ticker
+                    st.rerun()
+
+        if page_records:
+            st.dataframe(signal_table(page_records).style.apply(
+                lambda row: [f"background-color: {signal_color(row['Signal'])}; color: white"] * len(row), axis=1
+            ), width="stretch", hide_index=True)
+profile.lap("screener")
 
 # ====================== AUTO ALERTS (Only BUY + Strong Buy) ======================
-ticker_data_list = st.session_state.get("ticker_data_list", [])
 now_et = datetime.now(ZoneInfo("America/New_York"))
 
-if dt_time(9, 30) <= now_et.time() <= dt_time(12, 0):
-    for row in ticker_data_list:
-        strength = row["Strength"]
-        ticker = row["Ticker"]
-        price = row["Price"]
-        chg = row["Chg %"]
-        
-        if strength >= 8:  # Only Buy (8+) and Strong Buy (9)
-            alert_key = f"alert_{ticker}_{strength}"
-            last = st.session_state.get(alert_key, 0)
-            
-            if time.time() - last > 900:  # 15-minute debounce
-                if strength >= 9:
-                    msg = f"🚀 Strong Buy {ticker} @ ${price} (+{chg}%) — {strength}/9 gates"
-                else:
-                    msg = f"🟢 BUY {ticker} @ ${price} (+{chg}%) — {strength}/9 gates"
-                
-                # Send via Telegram
-                if "telegram_token" in st.session_state and "telegram_chat_id" in st.session_state:
-                    try:
-                        bot = TeleBot(st.session_state.telegram_token)
-                        bot.send_message(st.session_state.telegram_chat_id, msg)
-                    except:
-                        pass
-                
+# Only Buy (8+) and Strong Buy (9), 9:30-12:00 — and only on a real session, not stale bars on a holiday
+buy_rows = alert_rows(ticker_data_list, now_et.time()) if market.is_open else []
+if buy_rows:
+    if "telegram_token" in st.session_state and "telegram_chat_id" in st.session_state:
+        # Queued for the background sender; one alert per chat/ticker/strength/15m bar, across all sessions
+        queued = get_alert_dispatcher().submit_alerts([
+            signal_alert(st.session_state.telegram_token, st.session_state.telegram_chat_id, row)
+            for row in buy_rows
+        ])
+        for alert in queued:
+            st.toast(f"Alert sent for {alert.ticker} ({alert.strength}/9)", icon="📨")
+    else:
+        for row in buy_rows:
+            alert_key = f"alert_{row.ticker}_{row.strength}"
+            if time.time() - st.session_state.get(alert_key, 0) > 900:  # 15-minute debounce
                 st.session_state[alert_key] = time.time()
-                st.toast(f"Alert sent for {ticker} ({strength}/9)", icon="📨")
+                st.toast(f"Alert for {row.ticker} ({row.strength}/9)", icon="📨")
+
+profile.lap("alerts")
 
 # ====================== TRADE PLAN + DIAGNOSTICS ======================
 st.markdown("---")
 st.subheader("📋 Trade Plan + Diagnostics")
 
-if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
-    data = st.session_state.ticker_data
-    tick = st.session_state.selected_ticker
+data = snapshot.signal(mode, st.session_state.get("selected_ticker"))
+if data is not None:
+    tick = data.ticker
     override = st.checkbox("**Override Time Window**", value=False, key="time_override")
 
     # Caution Buy badge for conditional 7-gate setups
-    is_caution_buy = data.get("label") == "Caution Buy" and data.get("strength", 0) == 7
+    is_caution_buy = data.label == "Caution Buy" and data.strength == 7
 
-    header = f"🚀 **{data.get('label', 'UNKNOWN')} – {tick}**"
+    header = f"🚀 **{data.label} – {tick}**"
     if is_caution_buy:
         header = f"🚀 **Caution Buy** 🟡 (7/9 gates — sacred gates passed) – {tick}"
 
@@ -698,38 +539,38 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
 
     dcols = st.columns(3)
     with dcols[0]:
-        trend_pass = data.get("bull", False)
+        trend_pass = data.bull
         st.metric("1. Bullish Trend (EMA50>200)", "✅ PASS" if trend_pass else "❌ FAIL", 
                   delta="**MUST PASS**" if not trend_pass else None)
-        st.metric("2. Volume OK", "✅ PASS" if data.get("vol_ok") else "❌ FAIL")
-        st.metric("3. Near 9-EMA", "✅ PASS" if data.get("near_9ema") or override_9ema else "❌ FAIL (overridden)" if override_9ema else "❌ FAIL")
+        st.metric("2. Volume OK", "✅ PASS" if data.vol_ok else "❌ FAIL")
+        st.metric("3. Near 9-EMA", "✅ PASS" if data.near_9ema or override_9ema else "❌ FAIL (overridden)" if override_9ema else "❌ FAIL")
     with dcols[1]:
-        st.metric("4. Healthy Pullback from Open", "✅ PASS" if data.get("chg_from_open", 0) < (4.5 if not is_strict else 3) else "❌ FAIL", 
-                  delta="**MUST PASS**" if data.get("chg_from_open", 0) >= (4.5 if not is_strict else 3) else None)
-        st.metric("5. RSI Not Overbought", "✅ PASS" if data.get("rsi", 0) < (78 if not is_strict else 75) else "❌ FAIL")
-        st.metric("6. MACD Line Bullish", "✅ PASS" if data.get("macd_bullish") else "❌ FAIL")
+        st.metric("4. Healthy Pullback from Open", "✅ PASS" if data.pullback_ok else "❌ FAIL", 
+                  delta="**MUST PASS**" if not data.pullback_ok else None)
+        st.metric("5. RSI Not Overbought", "✅ PASS" if data.rsi_ok else "❌ FAIL")
+        st.metric("6. MACD Line Bullish", "✅ PASS" if data.macd_bullish else "❌ FAIL")
     with dcols[2]:
-        st.metric("7. Time Window", "✅ PASS" if data.get("time_ok") else "❌ FAIL", delta="OVERRIDDEN" if override else None)
-        st.metric("8. MACD Histogram", "✅ PASS" if data.get("histogram_ok") else "❌ FAIL")
-        st.metric("9. QQQ Rel Strength", "✅ PASS" if data.get("rel_strength_ok") else "❌ FAIL")
+        st.metric("7. Time Window", "✅ PASS" if data.time_ok else "❌ FAIL", delta="OVERRIDDEN" if override else None)
+        st.metric("8. MACD Histogram", "✅ PASS" if data.histogram_ok else "❌ FAIL")
+        st.metric("9. QQQ Rel Strength", "✅ PASS" if data.rel_strength_ok else "❌ FAIL")
 
     st.subheader("📊 Live Indicator Readings")
     c1, c2, c3 = st.columns(3)
     with c1:
-        st.metric("Current Price", f"${data.get('curr', 0):,.2f}")
-        st.metric("RSI (14)", f"{data.get('rsi', 0):.1f}")
-        st.metric("% From Today's Open", f"{data.get('chg_from_open', 0):+.1f}%")
+        st.metric("Current Price", f"${data.price:,.2f}")
+        st.metric("RSI (14)", f"{data.rsi:.1f}")
+        st.metric("% From Today's Open", f"{data.chg_from_open:+.1f}%")
     with c2:
-        st.metric("Distance to 9-EMA", f"{data.get('dist_9ema_pct', 0):.2f}%")
-        st.metric("Volume vs Yesterday", f"{data.get('vol_ratio', 1.0):.1f}×")
-        st.metric("Rel Strength vs QQQ", f"{data.get('chg_from_open', 0) - qqq_chg_from_open:+.1f}%")
+        st.metric("Distance to 9-EMA", f"{data.dist_9ema_pct:.2f}%")
+        st.metric("Volume vs Yesterday", f"{data.vol_ratio:.1f}×")
+        st.metric("Rel Strength vs QQQ", f"{data.chg_from_open - qqq_chg_from_open:+.1f}%")
     with c3:
-        st.metric("MACD Line", f"{data.get('macd_line', 0):+.4f}")
-        st.metric("MACD Histogram", f"{data.get('macd_hist', 0):+.4f}")
-        st.metric("9-EMA Value", f"${data.get('ema9', 0):,.2f}")
+        st.metric("MACD Line", f"{data.macd_line:+.4f}")
+        st.metric("MACD Histogram", f"{data.macd_hist:+.4f}")
+        st.metric("9-EMA Value", f"${data.ema9:,.2f}")
 
     st.subheader("📏 Advanced Position Sizer")
-    dynamic_risk = 2.0 if "Strong Buy" in data.get("label", "") else 1.0
+    dynamic_risk = 2.0 if "Strong Buy" in data.label else 1.0
     use_dynamic = st.checkbox("Use dynamic risk based on signal strength", value=True)
     
     if use_dynamic:
@@ -744,18 +585,18 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
     st.caption(f"**Current risk used:** {risk_pct:.1f}% → **${dynamic_risk_dollars:,.0f}** max loss this trade")
 
     # Sacred gate protection
-    sacred_1_fail = not data.get("bull", False)
-    sacred_4_fail = data.get("chg_from_open", 0) >= (4.5 if not is_strict else 3)
+    sacred_1_fail = not data.bull
+    sacred_4_fail = not data.pullback_ok
 
     if sacred_1_fail or sacred_4_fail:
         st.error("🚨 NEVER TRADE THIS SETUP — One or both SACRED GATES failed (Bullish Trend or Healthy Pullback). Walk away.")
         st.caption("These two gates are non-negotiable. Overriding them destroys the edge.")
 
     # Show plan anyway if user wants (with heavy warning)
-    show_plan = (data.get("label") in ["Caution Buy", "Strong Buy"]) and not (sacred_1_fail or sacred_4_fail)
+    show_plan = (data.label in ["Caution Buy", "Strong Buy"]) and not (sacred_1_fail or sacred_4_fail)
     
     if show_plan:
-        if "Strong Buy" in data.get("label", ""):
+        if "Strong Buy" in data.label:
             justification = "✅ **Strong Buy** (9/9) → Full conviction = **2.0%** account risk"
         else:
             justification = "✅ **Buy** (7–8/9) → Standard conviction = **1.0%** account risk"
@@ -766,8 +607,8 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
             # Use the clean calculation from above
             dynamic_risk_dollars = dynamic_risk_dollars  # already correct
 
-            buy_low = round(data.get("curr", 0) * 0.97, 2)
-            buy_high = round(data.get("curr", 0) * 0.985, 2)
+            buy_low = round(data.price * 0.97, 2)
+            buy_high = round(data.price * 0.985, 2)
             suggested_buy = round((buy_low + buy_high) / 2, 2)
             risk_per_share = round(suggested_buy * 0.02, 2)
             shares = int(dynamic_risk_dollars / risk_per_share)
@@ -814,20 +655,9 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
             st.markdown("**5. Quick Log This Trade**")
             if st.button("📝 Log This Trade to Journal (auto-filled)", type="primary", use_container_width="Stretch"):
                 entry_price = suggested_buy
-                notes_auto = f"Signal: {data.get('label')} | Strength: {data.get('strength')}/9 | Risk: {risk_pct:.1f}% | Plan followed"
-                
-                new_row = pd.DataFrame([{
-                    "Date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    "Ticker": tick,
-                    "Entry Price": entry_price,
-                    "Exit Price": "",
-                    "Shares": shares,
-                    "P/L $": "",
-                    "Notes": notes_auto
-                }])
+                notes_auto = f"Signal: {data.label} | Strength: {data.strength}/9 | Risk: {risk_pct:.1f}% | Plan followed"
                 
-                trades_df = pd.concat([trades_df, new_row], ignore_index=True)
-                trades_df.to_csv(CSV_FILE, index=False)
+                trade_log.add_trade(tick, entry_price, shares, notes=notes_auto)
                 
                 st.success(f"✅ Trade logged! {tick} @ ${entry_price:,.2f} — {shares:,} shares")
                 st.rerun()
@@ -839,7 +669,7 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
             st.caption(f"Max risk this trade ≈ **${dynamic_risk_dollars:,.0f}** ({risk_pct:.1f}%)")
 
             st.markdown("**4. Smart Trailing Stop Suggestion**")
-            trail_pct = 1.0 if "Strong Buy" in data.get("label", "") else 0.5
+            trail_pct = 1.0 if "Strong Buy" in data.label else 0.5
             breakeven_trail = round(suggested_buy * (1 + trail_pct / 100), 2)
             st.markdown(f"• Once +3% target is hit, move stop to **${breakeven_trail:,.2f}**")
 
@@ -847,85 +677,23 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
 
         st.subheader(f"📊 {tick} – 5-Day Price Action with EMA9 + MACD")
 
-        # Fetch fresh 5-day 15m data (same function the rest of the app uses)
-        hist = get_intraday_history(tick, period="5d", interval="15m")
+        # Reuse the 5-day 15m bars from this refresh's snapshot (compact arrays -> a frame only for plotting)
+        bars = intraday_bars.get(tick)
+        if bars:
+            hist = bars.to_frame()
+        else:
+            hist = get_intraday_history(tick, period="5d", interval="15m")
         
         if not hist.empty:
-            # Calculate EMA9 and MACD for the chart
-            hist['EMA9'] = hist['Close'].ewm(span=9, adjust=False).mean()
-            
-            ema12 = hist['Close'].ewm(span=12, adjust=False).mean()
-            ema26 = hist['Close'].ewm(span=26, adjust=False).mean()
-            macd_line = ema12 - ema26
-            signal_line = macd_line.ewm(span=9, adjust=False).mean()
-            macd_hist = macd_line - signal_line
-
-            # Create clean subplot chart
-            fig = make_subplots(
-                rows=2, cols=1,
-                shared_xaxes=True,
-                vertical_spacing=0.03,
-                row_heights=[0.70, 0.30],
-                subplot_titles=(f"{tick} Price + EMA9", "MACD Histogram")
-            )
-
-            # Candlestick
-            fig.add_trace(
-                go.Candlestick(
-                    x=hist.index,
-                    open=hist['Open'],
-                    high=hist['High'],
-                    low=hist['Low'],
-                    close=hist['Close'],
-                    name="Price"
-                ),
-                row=1, col=1
-            )
-
-            # EMA9 line
-            fig.add_trace(
-                go.Scatter(
-                    x=hist.index,
-                    y=hist['EMA9'],
-                    line=dict(color="#FFD700", width=2),
-                    name="EMA9"
-                ),
-                row=1, col=1
-            )
-
-            # MACD Histogram (green/red bars)
-            colors = ['#00cc00' if val >= 0 else '#ff0000' for val in macd_hist]
-            fig.add_trace(
-                go.Bar(
-                    x=hist.index,
-                    y=macd_hist,
-                    marker_color=colors,
-                    name="MACD Histogram"
-                ),
-                row=2, col=1
-            )
-
-            # MACD lines (optional thin lines)
-            fig.add_trace(
-                go.Scatter(x=hist.index, y=macd_line, line=dict(color="#00ccff", width=1), name="MACD Line"),
-                row=2, col=1
-            )
-            fig.add_trace(
-                go.Scatter(x=hist.index, y=signal_line, line=dict(color="#ff00ff", width=1), name="Signal Line"),
-                row=2, col=1
-            )
-
-            # Layout polish
-            fig.update_layout(
-                height=680,
-                template="plotly_dark",
-                showlegend=True,
-                legend=dict(orientation="h", yanchor="bottom", y=1.02),
-                xaxis_rangeslider_visible=False
-            )
-            fig.update_xaxes(rangebreaks=[dict(bounds=["16:00", "09:30"], pattern="hour")])
-
-            st.plotly_chart(fig, use_container_width=True)
+            # EMA9 and MACD come from the same indicator streams as the gates
+            engine = poller.engine
+            engine.update(tick, "15m", hist)
+            # One figure per ticker per session: unchanged bars reuse it, a new bar only rewrites its traces
+            if 'price_charts' not in st.session_state:
+                st.session_state.price_charts = PriceCharts()
+            with profile.stage("chart_build"):
+                fig = st.session_state.price_charts.figure(tick, hist.join(engine.frame(tick, "15m")))
+                st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("Chart data temporarily unavailable — refresh in 60 seconds")
 
@@ -961,10 +729,17 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
         """)
 
     st.subheader("📊 Realistic Intraday Backtest – Last 60 Trading Days")
-    backtest_key = f"backtest_{tick}"
+    bt_mode = st.radio(
+        "Backtest entries",
+        ["All 9 gates (Caution Buy or better)", "Pullback from open only (legacy)"],
+        horizontal=True,
+        key=f"bt_mode_{tick}"
+    )
+    full_gates = bt_mode.startswith("All 9")
+    backtest_key = f"backtest_{tick}_{'gates' if full_gates else 'pullback'}"
     if st.button("🚀 Run Realistic Intraday Backtest on " + tick, type="secondary", key=f"bt_{tick}", width="stretch"):
         with st.spinner("Running cached backtest..."):
-            results = run_intraday_backtest(tick, is_strict)
+            results = run_intraday_backtest(tick, is_strict, full_gates)
             if results:
                 st.session_state[backtest_key] = results
             else:
@@ -990,46 +765,58 @@ if "selected_ticker" in st.session_state and st.session_state.selected_ticker:
         with st.container(border=True):
             st.subheader("🎯 Win Probability Estimate")
             st.metric("Based on 60-day realistic backtest", f"{r['win_rate']}% win rate")
-            prob_note = "Strong buy signals average 65-72% win rate with strict discipline" if "Strong Buy" in data.get("label", "") else "BUY signals average 58-65% win rate with strict discipline"
+            prob_note = "Strong buy signals average 65-72% win rate with strict discipline" if "Strong Buy" in data.label else "BUY signals average 58-65% win rate with strict discipline"
             st.caption(f"**{prob_note}** — This is your edge. Follow the plan.")
 
     st.caption("**Real-world trading on this strategy should return better than this backtest.**")
 
+elif st.session_state.get("selected_ticker"):
+    st.info(f"⏳ No signal yet for {st.session_state.selected_ticker} — waiting on enough 15m bars from the next refresh")
 else:
     st.info("👆 Click any colored card or row above to see full trade plan + backtest + win probability")
 
+profile.lap("trade_plan")
+
 # ====================== PORTFOLIO HEAT ======================
 st.subheader("🔥 Portfolio Heat / Open Risk")
 if st.button("🔄 Refresh Heat", type="secondary", width="stretch"):
+    poller.refresh_now()
+    poller.wait_for(poller.version + 1, timeout=30)
     st.rerun()
-if os.path.exists(CSV_FILE):
-    df_log = pd.read_csv(CSV_FILE)
-    open_trades = df_log[(df_log["Exit Price"].isnull()) | (df_log["Exit Price"] == 0) | (df_log["Exit Price"] == "")]
-    if len(open_trades) == 0:
-        st.success("✅ No open positions – Account Heat: 0%")
-    else:
-        heat_rows = []
-        for _, trade in open_trades.iterrows():
-            tick = trade["Ticker"]
-            shares = float(trade["Shares"])
-            entry = float(trade["Entry Price"])
-            try:
-                curr_price = yf.Ticker(tick).history(period="1d")['Close'].iloc[-1]
-                unreal_pnl = shares * (curr_price - entry)
-                exposure = shares * curr_price
-                heat_rows.append({
-                    "Ticker": tick,
-                    "Shares": int(shares),
-                    "Entry": f"${entry:,.2f}",
-                    "Current": f"${curr_price:,.2f}",
-                    "Unreal P/L $": f"${unreal_pnl:,.0f}",
-                    "Unreal P/L %": f"{(curr_price - entry)/entry*100:+.1f}%",
-                    "Exposure %": f"{exposure / account_size * 100:.1f}%"
-                })
-            except:
-                heat_rows.append({"Ticker": tick, "Shares": int(shares), "Entry": f"${entry:,.2f}", "Current": "—", "Unreal P/L $": "—", "Unreal P/L %": "—", "Exposure %": "—"})
-        heat_df = pd.DataFrame(heat_rows)
-        st.dataframe(heat_df, width="stretch", hide_index=True)
+open_trades = trade_log.open_trades()
+if len(open_trades) == 0:
+    st.success("✅ No open positions – Account Heat: 0%")
+else:
+    # Priced from the shared snapshot, one quote per distinct ticker
+    lots = position_heat(open_trades, latest_prices(snapshot, open_tickers), account_size)
+    heat = account_heat(lots, account_size)
+    h1, h2, h3 = st.columns(3)
+    h1.metric("Account Heat", f"{heat['heat_pct']:.1f}%", f"${heat['exposure']:,.0f} exposed", delta_color="off")
+    h2.metric("Unrealized P/L", f"${heat['unreal_pl']:,.0f}")
+    h3.metric("Open Lots", heat["lots"], f"{len(open_tickers)} tickers", delta_color="off")
+    if heat["unpriced"]:
+        st.caption(f"⚠️ {heat['unpriced']} lot(s) have no price yet – waiting on the next market data refresh")
+
+    def dash_nan(fmt):
+        return lambda v: "—" if pd.isna(v) else fmt.format(v)
+    money = dash_nan("${:,.2f}")
+    st.dataframe(ticker_concentration(lots, account_size).style.format({
+        "Shares": "{:,.0f}", "Avg Entry": money, "Current": money,
+        "Unreal P/L $": dash_nan("${:,.0f}"),
+        "Exposure $": dash_nan("${:,.0f}"),
+        "Exposure %": dash_nan("{:.1f}%"),
+        "Share of Heat %": dash_nan("{:.0f}%"),
+    }), width="stretch", hide_index=True)
+
+    with st.expander(f"All open lots ({heat['lots']})", expanded=False):
+        st.dataframe(lots.drop(columns=["Cost $", "Exposure $"]).style.format({
+            "Shares": "{:,.0f}", "Entry": money, "Current": money,
+            "Unreal P/L $": dash_nan("${:,.0f}"),
+            "Unreal P/L %": dash_nan("{:+.1f}%"),
+            "Exposure %": dash_nan("{:.1f}%"),
+        }), width="stretch", hide_index=True)
+
+profile.lap("portfolio_heat")
 
 # ====================== RULES, PSYCHOLOGY, TRADE LOG ======================
 st.markdown("---")
@@ -1080,24 +867,12 @@ with st.expander("📒 Trade Log"):
         if st.button("Log Trade", width="stretch"):
             if log_ticker and entry_price > 0 and log_shares > 0:
                 pl = (exit_price - entry_price) * log_shares if exit_price > 0 else None
-                new_row = pd.DataFrame([{
-                    "Date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    "Ticker": log_ticker.upper(),
-                    "Entry Price": entry_price,
-                    "Exit Price": exit_price if exit_price > 0 else "",
-                    "Shares": log_shares,
-                    "P/L $": pl if pl is not None else "",
-                    "Notes": notes
-                }])
-                trades_df = pd.concat([trades_df, new_row], ignore_index=True)
-                trades_df.to_csv(CSV_FILE, index=False)
+                trade_log.add_trade(log_ticker, entry_price, log_shares, exit_price=exit_price, pl=pl, notes=notes)
                 st.success("✅ Trade logged!")
     with col_log2:
         if st.button("📥 Download Full Trade Log as Excel", type="primary", width="stretch"):
-            from io import BytesIO
             output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                trades_df.to_excel(writer, index=False, sheet_name="Trade_Log")
+            trade_log.to_excel(output)
             output.seek(0)
             st.download_button(
                 label="⬇️ Click to Download Excel",
@@ -1105,7 +880,7 @@ with st.expander("📒 Trade Log"):
                 file_name="day_trade_log.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
-    st.dataframe(trades_df.tail(10), width="stretch")
+    st.dataframe(trade_log.last_trades(10), width="stretch")
 
 # ====================== TELEGRAM ALERTS (at very bottom) ======================
 st.subheader("📲 Telegram Alerts")
@@ -1118,94 +893,49 @@ if tg_token and tg_chat:
     st.success("✅ Telegram saved")
 if st.button("🔵 Send Test Telegram Now"):
     try:
-        bot = TeleBot(st.session_state.telegram_token)
-        bot.send_message(st.session_state.telegram_chat_id, "✅ TEST SUCCESSFUL! Day Trade Monitor is ready 🚀")
+        get_alert_dispatcher().send_message(
+            st.session_state.telegram_token, st.session_state.telegram_chat_id,
+            "✅ TEST SUCCESSFUL! Day Trade Monitor is ready 🚀"
+        ).result(timeout=20)  # the user is waiting on this one, so report the outcome
         st.success("✅ Test sent!")
     except Exception as e:
         st.error(f"Test failed: {str(e)[:80]}")
 
-import matplotlib.pyplot as plt
-from io import BytesIO
-
-# ====================== PRETTIER IMAGE GENERATOR (no Chrome needed) ======================
-def create_signals_image(df_table, regime):
-    fig, ax = plt.subplots(figsize=(11, len(df_table)*0.65 + 2))
-    ax.axis('off')
-    
-    # Create beautiful table
-    table = ax.table(cellText=df_table.values,
-                     colLabels=df_table.columns,
-                     cellLoc='center',
-                     loc='center',
-                     bbox=[0, 0, 1, 1])
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    table.scale(1.4, 2.4)
-    
-    # Style header (dark blue)
-    for j in range(len(df_table.columns)):
-        table[(0, j)].set_facecolor('#1e3a8a')
-        table[(0, j)].set_text_props(weight='bold', color='white')
-    
-    # Color rows based on Signal (supports Caution Buy)
-    for i in range(len(df_table)):
-        signal = str(df_table.iloc[i, 0])
-        if "Strong Buy" in signal:
-            color = '#15803d'      # dark green
-        elif "Caution Buy" in signal:
-            color = '#f59e0b'      # orange — clear “caution” signal
-        elif "Buy" in signal:
-            color = '#16a34a'      # green
-        elif "Watch" in signal:
-            color = '#f59e0b'
-        else:  # Sit Out
-            color = '#b91c1c'      # red
-        for j in range(len(df_table.columns)):
-            table[(i+1, j)].set_facecolor(color)
-            table[(i+1, j)].set_text_props(color='white')
-    
-    plt.title("📈 Day Trade Monitor — Live Signals Snapshot", fontsize=18, pad=30, color='#1e3a8a')
-    plt.suptitle(f"{regime}\n{datetime.now(ZoneInfo('America/New_York')).strftime('%A, %B %d %Y — %H:%M ET')}", 
-                 fontsize=12, y=0.98)
-    
-    img_bytes = BytesIO()
-    plt.savefig(img_bytes, format='png', bbox_inches='tight', dpi=220, facecolor='white')
-    img_bytes.seek(0)
-    plt.close(fig)
-    return img_bytes
-
 # ====================== DAILY AUTO MORNING TELEGRAM + PRETTIER IMAGE + GROK ======================
 auto_morning = st.checkbox("✅ Receive daily morning summary automatically (8-9 AM ET with image + Grok)", value=True, key="auto_morning")
 
 now_et = datetime.now(ZoneInfo("America/New_York"))
 today_str = now_et.strftime("%Y-%m-%d")
-grok_key = f"grok_briefing_{today_str}"
+briefing = get_briefing_service().latest(today_str)
 
-if auto_morning and dt_time(8, 0) <= now_et.time() <= dt_time(9, 0):
+if auto_morning and market.is_trading_day and dt_time(8, 0) <= now_et.time() <= dt_time(9, 0):
     if st.session_state.get("daily_sent_date", "") != today_str:
         if "telegram_token" in st.session_state and "telegram_chat_id" in st.session_state:
             try:
-                bot = TeleBot(st.session_state.telegram_token)
+                dispatcher = get_alert_dispatcher()
                 
                 # Safe fallbacks (prevents crashes if no signals or table not created)
-                df_table_safe = st.session_state.get("df_table", pd.DataFrame([["No signals yet", "", "", "", "", "", "", "", ""]]))
-                regime_safe = st.session_state.get("regime", "Neutral Day")
+                df_table_safe = signal_table(ticker_data_list) if ticker_data_list else pd.DataFrame([["No signals yet", "", "", "", "", "", "", "", ""]])
+                regime_safe = regime
                 
                 summary = f"📈 Day Trade Monitor Morning Summary\n\nMarket Regime: {regime_safe}\n\nStrong Buy Signals:\n"
-                strong = [row for row in st.session_state.get("ticker_data_list", []) if "Strong Buy" in row["Signal"]]
+                strong = snapshot.strong_buys(mode, st.session_state.dynamic_tickers)
                 for row in strong:
-                    summary += f"• {row['Ticker']} @ ${row['Price']} (+{row['Chg %']}%) — {row['Strength']}/9\n"
+                    summary += f"• {signal_line(row)}\n"
                 if not strong:
                     summary += "None right now\n"
                 
                 # Append Grok briefing if it exists
-                if grok_key in st.session_state:
-                    summary += f"\n\n🧠 GROK PRE-MARKET BRIEFING:\n{st.session_state[grok_key]}"
+                if briefing is not None and briefing.done:
+                    summary += f"\n\n🧠 GROK PRE-MARKET BRIEFING:\n{briefing.text}"
                 
-                img_bytes = create_signals_image(df_table_safe, regime_safe)
+                with profile.stage("image_render"):
+                    photo = get_snapshot_renderer().submit(df_table_safe, regime_safe)
                 
-                bot.send_message(st.session_state.telegram_chat_id, summary)
-                bot.send_photo(st.session_state.telegram_chat_id, photo=img_bytes, caption="📸 Daily Signals Snapshot")
+                # Queued for the background sender — the page doesn't wait on Telegram
+                token, chat_id = st.session_state.telegram_token, st.session_state.telegram_chat_id
+                dispatcher.send_message(token, chat_id, summary)
+                dispatcher.send_photo(token, chat_id, photo, caption="📸 Daily Signals Snapshot")
                 
                 st.session_state.daily_sent_date = today_str
                 st.toast("📨 Daily morning summary + Grok + image sent automatically!", icon="✅")
@@ -1216,35 +946,63 @@ if auto_morning and dt_time(8, 0) <= now_et.time() <= dt_time(9, 0):
 if st.button("📨 Send Morning Summary to Telegram (Manual with Image + Grok)", type="primary", width="stretch"):
     if "telegram_token" in st.session_state and "telegram_chat_id" in st.session_state:
         try:
-            bot = TeleBot(st.session_state.telegram_token)
+            dispatcher = get_alert_dispatcher()
             
             # Safe fallbacks
-            df_table_safe = st.session_state.get("df_table", pd.DataFrame([["No signals yet", "", "", "", "", "", "", "", ""]]))
-            regime_safe = st.session_state.get("regime", "Neutral Day")
+            df_table_safe = signal_table(ticker_data_list) if ticker_data_list else pd.DataFrame([["No signals yet", "", "", "", "", "", "", "", ""]])
+            regime_safe = regime
             
             summary = f"📈 Day Trade Monitor Morning Summary\n\nMarket Regime: {regime_safe}\n\nStrong Buy Signals:\n"
-            strong = [row for row in st.session_state.get("ticker_data_list", []) if "Strong Buy" in row["Signal"]]
+            strong = snapshot.strong_buys(mode, st.session_state.dynamic_tickers)
             for row in strong:
-                summary += f"• {row['Ticker']} @ ${row['Price']} (+{row['Chg %']}%) — {row['Strength']}/9\n"
+                summary += f"• {signal_line(row)}\n"
             if not strong:
                 summary += "None right now\n"
             
-            grok_key = f"grok_briefing_{today_str}"
-            if grok_key in st.session_state:
-                summary += f"\n\n🧠 GROK PRE-MARKET BRIEFING:\n{st.session_state[grok_key]}"
+            if briefing is not None and briefing.done:
+                summary += f"\n\n🧠 GROK PRE-MARKET BRIEFING:\n{briefing.text}"
             
-            img_bytes = create_signals_image(df_table_safe, regime_safe)
+            with profile.stage("image_render"):
+                photo = get_snapshot_renderer().submit(df_table_safe, regime_safe)
             
-            bot.send_message(st.session_state.telegram_chat_id, summary)
-            bot.send_photo(st.session_state.telegram_chat_id, photo=img_bytes, caption="📸 Daily Signals Snapshot")
+            token, chat_id = st.session_state.telegram_token, st.session_state.telegram_chat_id
+            dispatcher.send_message(token, chat_id, summary)
+            dispatcher.send_photo(token, chat_id, photo, caption="📸 Daily Signals Snapshot")
             st.success("✅ Manual summary + Grok briefing + image sent!")
         except Exception as e:
             st.error(f"Failed: {str(e)[:100]}")
 
+profile.lap("telegram")
+
+# ====================== DIAGNOSTICS (rerun profiling) ======================
+if st.checkbox("🩺 Show diagnostics (where each refresh spends its time)", value=False, key="show_diagnostics"):
+    with st.expander("🩺 Diagnostics", expanded=True):
+        st.caption(f"This rerun so far: {profile.elapsed_ms:,.0f} ms · poll #{snapshot.version}: "
+                   + ", ".join(f"{k} {v:,.0f} ms" for k, v in snapshot.timings.items()))
+        st.dataframe(pd.DataFrame(
+            [{"Stage": k, "This rerun ms": round(v, 1)} for k, v in profile.stages.items()]
+        ), width="stretch", hide_index=True)
+        st.markdown("**Rolling p50 / p95 (this server process)**")
+        st.dataframe(pd.DataFrame(REGISTRY.summary()), width="stretch", hide_index=True)
+        st.markdown("**Cache hits / misses**")
+        get_shared_cache()  # registers the shared caches even if nothing has used them yet
+        get_snapshot_renderer()
+        st.dataframe(pd.DataFrame.from_dict(REGISTRY.cache_stats(), orient="index").fillna(0), width="stretch")
+        st.download_button("⬇️ Prometheus metrics", REGISTRY.prometheus_text(get_provider().metrics()),
+                           file_name="daytrade.prom", mime="text/plain")
+        st.caption(f"Also written to `{REGISTRY.prom_file}` (every {REGISTRY.export_seconds}s) "
+                   f"and one JSON line per rerun / poll to `{REGISTRY.log_file}`")
+        st.caption(f"Bar buffers ({len(snapshot.intraday)} symbols): "
+                   + ", ".join(f"{k} {v / 1024:,.0f} KB" for k, v in poller.memory().items()))
+    profile.lap("diagnostics")
+profile.finish(version=snapshot.version, tickers=len(st.session_state.dynamic_tickers))
+
 # ====================== SAFE 60-SECOND REFRESH ======================
+# Same cadence as the poller: 60s in the signal window, slower around it, off while the market is closed
+refresh_seconds = market.cadence()
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = time.time() - 70
-if auto_refresh and time.time() - st.session_state.last_refresh >= 60:
+if auto_refresh and refresh_seconds and time.time() - st.session_state.last_refresh >= refresh_seconds:
     st.session_state.last_refresh = time.time()
     st.rerun()
 
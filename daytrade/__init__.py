@@ -0,0 +1 @@
+"""Day Trade Monitor signal engine (everything that does not need Streamlit)."""
@@ -0,0 +1,197 @@
+"""Command line entry point: ``python -m daytrade <command>``.
+
+    python -m daytrade scan                 # one pass: print the signal table, send alerts
+    python -m daytrade scan --loop          # keep polling on the NYSE calendar (systemd / tmux friendly)
+    python -m daytrade sweep --tickers ...  # parameter sweep, see daytrade.sweep
+    python -m daytrade importtime           # cold-start import cost per dependency
+    python -m daytrade bench                # offline benchmarks on synthetic bars, see daytrade.bench
+    python -m daytrade replay --date ...    # replay recorded sessions through the pipeline, see daytrade.replay
+    python -m daytrade provider record ...  # fill a Parquet dir for DAYTRADE_PROVIDER=parquet:<dir>
+    python -m daytrade llm-stub             # offline OpenAI-compatible stand-in for the Grok briefing
+
+Nothing here imports Streamlit, Plotly or Matplotlib.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import timedelta
+
+TICKERS = ["SOXL", "TQQQ", "TECL", "FNGU", "NVDL", "TSLL", "SPXL", "QLD", "UPRO"]
+SECRETS_FILE = os.path.join(".streamlit", "secrets.toml")
+
+
+def telegram_credentials(args) -> tuple:
+    """--telegram-* flags, then TELEGRAM_TOKEN / TELEGRAM_CHAT_ID, then [telegram] in secrets.toml."""
+    token = args.telegram_token or os.environ.get("TELEGRAM_TOKEN")
+    chat_id = args.telegram_chat_id or os.environ.get("TELEGRAM_CHAT_ID")
+    if (not token or not chat_id) and os.path.exists(SECRETS_FILE):
+        import tomllib
+        with open(SECRETS_FILE, "rb") as fh:
+            section = tomllib.load(fh).get("telegram", {})
+        token = token or section.get("token")
+        chat_id = chat_id or section.get("chat_id")
+    return (token, str(chat_id)) if token and chat_id else (None, None)
+
+
+def print_snapshot(snapshot, mode: str, tickers, as_json: bool):
+    rows = snapshot.rows(mode, tickers)
+    if as_json:
+        print(json.dumps({
+            "version": snapshot.version,
+            "taken_at": snapshot.taken_at.isoformat(),
+            "regime": snapshot.regime,
+            "qqq_chg_from_open": round(snapshot.qqq_chg_from_open, 2),
+            "vix": snapshot.vix,
+            "vix_status": snapshot.vix_status,
+            "signals": [{"ticker": r.ticker, "price": round(r.price, 2), "chg_pct": round(r.chg_from_open, 1),
+                         "strength": r.strength, "signal": r.label} for r in rows],
+        }, default=float))
+        return
+    print(f"{snapshot.taken_at:%Y-%m-%d %H:%M:%S ET}  {snapshot.regime} (QQQ {snapshot.qqq_chg_from_open:+.1f}%)"
+          f"  VIX {snapshot.vix} — {snapshot.vix_status}")
+    for r in sorted(rows, key=lambda r: r.strength, reverse=True):
+        print(f"  {r.ticker:<6} {r.label:<12} {r.strength}/9  ${r.price:>9,.2f}  {r.chg_from_open:+.1f}%")
+    sys.stdout.flush()
+
+
+def cmd_scan(args) -> int:
+    from daytrade.alerts import AlertDispatcher, alert_rows, signal_alert
+    from daytrade.bar_store import BarStore
+    from daytrade.journal import SignalJournal
+    from daytrade.market_calendar import market_status, poll_delay
+    from daytrade.poller import MarketPoller, market_clock
+
+    tickers = args.tickers or TICKERS
+    mode = "strict" if args.strict else "balanced"
+    journal = SignalJournal().start()
+    poller = MarketPoller(BarStore(), tickers, poll_seconds=args.interval, journal=journal)
+    token, chat_id = (None, None) if args.no_alerts else telegram_credentials(args)
+    dispatcher = AlertDispatcher().start() if token else None
+
+    while True:
+        started = time.monotonic()
+        snapshot = poller.poll_once()
+        print_snapshot(snapshot, mode, tickers, args.json)
+        if dispatcher and market_status(snapshot.taken_at).is_open:
+            rows = alert_rows(snapshot.rows(mode, tickers), snapshot.taken_at.time())
+            queued = dispatcher.submit_alerts([signal_alert(token, chat_id, row) for row in rows])
+            for alert in queued:
+                logging.info("alert queued: %s", alert.text)
+        if not args.loop:
+            if dispatcher:
+                dispatcher.flush(timeout=60)
+            journal.stop()
+            return 0
+        if args.ignore_calendar:
+            delay = args.interval - (time.monotonic() - started)
+        else:
+            # Slower outside the signal window, nothing at all while the market is closed
+            now = market_clock()
+            delay = poll_delay(now, args.interval)
+            if delay > args.interval:
+                logging.info("%s; next scan %s", market_status(now).label, f"{now + timedelta(seconds=delay):%a %H:%M ET}")
+        time.sleep(max(0.0, delay))
+
+
+def cmd_sweep(args) -> int:
+    from daytrade.sweep import main as sweep_main
+    sweep_main(args.rest)
+    return 0
+
+
+def cmd_bench(args) -> int:
+    from daytrade.bench import main as bench_main
+    return bench_main(args.rest)
+
+
+def cmd_replay(args) -> int:
+    from daytrade.replay import main as replay_main
+    return replay_main(args.rest)
+
+
+def cmd_provider(args) -> int:
+    from daytrade.providers import main as provider_main
+    return provider_main(args.rest)
+
+
+def cmd_screen(args) -> int:
+    from daytrade.screener import main as screen_main
+    return screen_main(args.rest)
+
+
+def cmd_llm_stub(args) -> int:
+    from daytrade.briefing import main as stub_main
+    return stub_main(args.rest)
+
+
+def cmd_importtime(args) -> int:
+    from daytrade.diagnostics import format_report, import_report
+
+    report = import_report(args.modules or None)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade", description="Day Trade Monitor (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="run the 9-gate scanner (and Telegram alerts) without the UI")
+    scan.add_argument("--tickers", nargs="+", help="default: the core 9 leveraged ETFs")
+    scan.add_argument("--strict", action="store_true", help="Strict thresholds instead of Balanced")
+    scan.add_argument("--loop", action="store_true", help="keep scanning instead of a single pass")
+    scan.add_argument("--interval", type=int, default=60,
+                      help="seconds between scans with --loop in the 9:30-12:00 window (slower outside it)")
+    scan.add_argument("--ignore-calendar", action="store_true",
+                      help="scan every --interval seconds around the clock, even while the market is closed")
+    scan.add_argument("--json", action="store_true", help="one JSON object per scan")
+    scan.add_argument("--no-alerts", action="store_true")
+    scan.add_argument("--telegram-token")
+    scan.add_argument("--telegram-chat-id")
+    scan.set_defaults(func=cmd_scan)
+
+    sweep = sub.add_parser("sweep", help="parameter sweep backtest (see python -m daytrade.sweep -h)",
+                           add_help=False)
+    sweep.set_defaults(func=cmd_sweep, passthrough=True)
+
+    bench = sub.add_parser("bench", help="offline benchmark suite (see python -m daytrade.bench -h)",
+                           add_help=False)
+    bench.set_defaults(func=cmd_bench, passthrough=True)
+
+    replay = sub.add_parser("replay", help="deterministic replay of recorded sessions (see python -m daytrade.replay -h)",
+                            add_help=False)
+    replay.set_defaults(func=cmd_replay, passthrough=True)
+
+    provider = sub.add_parser("provider", help="record / generate bars for the Parquet provider", add_help=False)
+    provider.set_defaults(func=cmd_provider, passthrough=True)
+
+    screen = sub.add_parser("screen", help="rank a whole universe by gate strength (see python -m daytrade.screener -h)",
+                            add_help=False)
+    screen.set_defaults(func=cmd_screen, passthrough=True)
+
+    llm_stub = sub.add_parser("llm-stub", help="local stand-in for the Grok endpoint (streams a canned briefing)",
+                              add_help=False)
+    llm_stub.set_defaults(func=cmd_llm_stub, passthrough=True)
+
+    importtime = sub.add_parser("importtime", help="cold import time per dependency (-X importtime, aggregated)")
+    importtime.add_argument("modules", nargs="*", help="default: everything app.py loads")
+    importtime.add_argument("--json", action="store_true")
+    importtime.set_defaults(func=cmd_importtime)
+
+    # sweep / bench own their flags; everything after the command name goes to them untouched
+    args, rest = parser.parse_known_args(argv)
+    if rest and not getattr(args, "passthrough", False):
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.rest = rest
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
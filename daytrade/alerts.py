@@ -0,0 +1,252 @@
+"""Non-blocking Telegram alert dispatch.
+
+Pages never talk to Telegram directly: they hand alerts/messages to the
+process-wide ``AlertDispatcher``, whose sender thread batches signal
+alerts per chat, reuses one ``TeleBot`` (and its pooled HTTP session) per
+bot token and retries 429s, 5xx and network errors with exponential
+backoff (a bad chat id or a blocked bot fails at once). Signal alerts are
+de-duplicated in SQLite on (chat, ticker, strength, bar timestamp), so a
+reload or a second open session never pages the same setup twice.
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import date, time as dt_time
+
+log = logging.getLogger(__name__)
+
+ALERT_DB_FILE = os.environ.get("DAYTRADE_ALERT_DB", "alerts.db")
+BATCH_WINDOW_SECONDS = 2.0
+MAX_RETRIES = 4
+BACKOFF_SECONDS = 1.0
+ALERT_WINDOW = (dt_time(9, 30), dt_time(12, 0))
+MIN_ALERT_STRENGTH = 8   # BUY (8/9) and Strong Buy (9/9) only
+PHOTO_RENDER_TIMEOUT = 60  # seconds the sender waits on a photo that's still rendering
+DEDUPE_KEEP_DAYS = 7
+
+
+@dataclass(frozen=True)
+class Alert:
+    token: str
+    chat_id: str
+    ticker: str
+    strength: int
+    bar_ts: str
+    text: str
+
+    @property
+    def key(self) -> tuple:
+        return (str(self.chat_id), self.ticker, int(self.strength), self.bar_ts)
+
+
+def signal_alert(token: str, chat_id: str, signal) -> Alert:
+    """Alert for one ``TickerSignal`` (8/9 = BUY, 9/9 = Strong Buy)."""
+    head = "🚀 Strong Buy" if signal.strength >= 9 else "🟢 BUY"
+    text = (f"{head} {signal.ticker} @ ${signal.price:,.2f} ({signal.chg_from_open:+.1f}%)"
+            f" — {signal.strength}/9 gates")
+    bar_ts = signal.bar_ts
+    if not bar_ts:
+        bar_ts = time.strftime("%Y-%m-%dT%H:") + f"{time.localtime().tm_min // 15 * 15:02d}"
+    return Alert(token, str(chat_id), signal.ticker, signal.strength, bar_ts, text)
+
+
+def alert_rows(signals, now_et_time) -> list:
+    """Signals worth paging about right now (inside the morning window, 8+/9 gates)."""
+    if not ALERT_WINDOW[0] <= now_et_time <= ALERT_WINDOW[1]:
+        return []
+    return [s for s in signals if s.strength >= MIN_ALERT_STRENGTH]
+
+
+def _retry_after(error: Exception, default: float) -> float:
+    # Telegram's 429 response says exactly how long to wait
+    params = (getattr(error, "result_json", None) or {}).get("parameters") or {}
+    return params.get("retry_after", default)
+
+
+def _is_transient(error: Exception) -> bool:
+    # 429 and 5xx can succeed later; 400 / 401 / 403 (bad chat id, bad token, bot blocked) never will
+    code = getattr(error, "error_code", None)                                 # ApiTelegramException
+    if code is None:
+        code = getattr(getattr(error, "result", None), "status_code", None)   # ApiHTTPException
+    if code is not None:
+        return code == 429 or code >= 500
+    return isinstance(error, OSError)   # requests' ConnectionError / Timeout, socket errors
+
+
+class AlertDedupeStore:
+    def __init__(self, path: str = ALERT_DB_FILE):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sent_alerts ("
+                " chat_id TEXT NOT NULL, ticker TEXT NOT NULL, strength INTEGER NOT NULL,"
+                " bar_ts TEXT NOT NULL, sent_at REAL NOT NULL,"
+                " PRIMARY KEY (chat_id, ticker, strength, bar_ts))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def claim(self, alert: Alert) -> bool:
+        """Atomically reserve an alert; False if it was already claimed (by any session)."""
+        with self._connect() as conn:
+            cur = conn.execute("INSERT OR IGNORE INTO sent_alerts VALUES (?, ?, ?, ?, ?)", (*alert.key, time.time()))
+        return cur.rowcount == 1
+
+    def release(self, alert: Alert):
+        # Delivery failed for good; let a later refresh try again
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM sent_alerts WHERE chat_id = ? AND ticker = ? AND strength = ? AND bar_ts = ?", alert.key
+            )
+
+    def prune(self, max_age_days: float = DEDUPE_KEEP_DAYS):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sent_alerts WHERE sent_at < ?", (time.time() - max_age_days * 86400,))
+
+
+class AlertDispatcher:
+    def __init__(self, dedupe: AlertDedupeStore = None, batch_window: float = BATCH_WINDOW_SECONDS,
+                 max_retries: int = MAX_RETRIES, backoff: float = BACKOFF_SECONDS, bot_factory=None):
+        self.dedupe = dedupe or AlertDedupeStore()
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._bot_factory = bot_factory
+        self._bots = {}
+        self._queue = queue.Queue()
+        self._thread = None
+        self.sent = 0
+        self.failed = 0
+
+    def start(self) -> "AlertDispatcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="alert-sender", daemon=True)
+            self._thread.start()
+        return self
+
+    # ---------- caller side (never blocks on the network) ----------
+    def submit_alerts(self, alerts) -> list:
+        """Queue signal alerts; returns the ones that were new (not already sent/queued)."""
+        accepted = [a for a in alerts if self.dedupe.claim(a)]
+        for alert in accepted:
+            self._queue.put(("alert", alert, None))
+        return accepted
+
+    def send_message(self, token: str, chat_id: str, text: str) -> Future:
+        future = Future()
+        self._queue.put(("message", (token, chat_id, text), future))
+        return future
+
+    def send_photo(self, token: str, chat_id: str, photo, caption: str = None) -> Future:
+        """``photo`` is PNG bytes or a Future of them (e.g. from ``SnapshotRenderer.submit``)."""
+        future = Future()
+        self._queue.put(("photo", (token, chat_id, photo, caption), future))
+        return future
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until everything queued before this call has been sent (or given up on)."""
+        barrier = Future()
+        self._queue.put(("flush", None, barrier))
+        try:
+            barrier.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    # ---------- sender thread ----------
+    def _bot(self, token: str):
+        if token not in self._bots:
+            if self._bot_factory is not None:
+                self._bots[token] = self._bot_factory(token)
+            else:
+                from telebot import TeleBot
+                self._bots[token] = TeleBot(token, threaded=False)
+        return self._bots[token]
+
+    def _with_retry(self, fn):
+        delay = self.backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    raise
+                wait = _retry_after(e, delay)
+                log.warning("Telegram call failed (%s), retrying in %.1fs", str(e)[:120], wait)
+                time.sleep(wait)
+                delay *= 2
+
+    def _drain(self) -> list:
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _send_alert_batch(self, token: str, chat_id: str, alerts: list):
+        text = "\n".join(a.text for a in alerts)
+        try:
+            self._with_retry(lambda: self._bot(token).send_message(chat_id, text))
+            self.sent += 1
+        except Exception:
+            self.failed += 1
+            log.exception("Dropping %d alert(s) for chat %s", len(alerts), chat_id)
+            for alert in alerts:
+                self.dedupe.release(alert)
+
+    def _send_direct(self, kind: str, payload: tuple, future: Future):
+        token, chat_id = payload[0], payload[1]
+        try:
+            if kind == "message":
+                result = self._with_retry(lambda: self._bot(token).send_message(chat_id, payload[2]))
+            else:
+                photo = payload[2]
+                if isinstance(photo, Future):
+                    photo = photo.result(timeout=PHOTO_RENDER_TIMEOUT)
+                result = self._with_retry(
+                    lambda: self._bot(token).send_photo(chat_id, photo=photo, caption=payload[3])
+                )
+            self.sent += 1
+            future.set_result(result)
+        except Exception as e:
+            self.failed += 1
+            log.exception("Telegram %s to chat %s failed", kind, chat_id)
+            future.set_exception(e)
+
+    def _prune(self):
+        try:
+            self.dedupe.prune()
+        except Exception:
+            log.exception("Pruning %s failed", self.dedupe.path)
+
+    def _run(self):
+        pruned_on = None
+        while True:
+            if pruned_on != date.today():      # on start, then once a day
+                self._prune()
+                pruned_on = date.today()
+            batches, barriers = {}, []
+            for kind, payload, future in self._drain():
+                if kind == "alert":
+                    batches.setdefault((payload.token, payload.chat_id), []).append(payload)
+                elif kind == "flush":
+                    barriers.append(future)
+                else:
+                    self._send_direct(kind, payload, future)
+            for (token, chat_id), alerts in batches.items():
+                self._send_alert_batch(token, chat_id, alerts)
+            for barrier in barriers:
+                barrier.set_result(None)
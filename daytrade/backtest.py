@@ -0,0 +1,229 @@
+"""Vectorized morning-pullback backtests over 15m bars.
+
+``run_backtest`` groups the bars into sessions once, lays them out as a
+(sessions x bars-per-session) grid and finds every entry's first exit
+(+3% target, -2% stop or the first bar at/after noon) with array
+comparisons + ``argmax`` instead of nested Python loops.
+``run_gate_backtest`` enters on the full 9-gate label instead of the
+pullback check alone. ``backtest_reference`` is the original loop, kept
+so the two can be compared bar-for-bar.
+"""
+import numpy as np
+import pandas as pd
+
+from daytrade.gates import GateThresholds, gate_frame, thresholds_for
+
+MARKET_TZ = "America/New_York"
+# between_time("9:45", "11:30") combined with 9 < hour < 12 leaves 10:00-11:30 ET
+ENTRY_START = 10 * 60       # minutes since midnight
+ENTRY_END = 11 * 60 + 30    # 11:30 ET (inclusive, like between_time)
+EXIT_HOUR = 12
+TAKE_PROFIT_PCT = 3.0
+STOP_LOSS_PCT = 2.0
+MAX_SESSIONS = 60
+MIN_BARS = 200
+# Labels that count as an entry for each "minimum signal" choice
+ENTRY_LABELS = {
+    "Strong Buy": ("Strong Buy",),
+    "Caution Buy": ("Strong Buy", "Caution Buy"),
+}
+
+
+def pullback_limit(is_strict: bool) -> float:
+    return 4.5 if not is_strict else 3
+
+
+def session_grid(hist: pd.DataFrame, sessions: int = MAX_SESSIONS) -> dict:
+    """Bars of the last ``sessions`` days as padded (day x slot) NumPy arrays."""
+    index = hist.index
+    days = index.normalize()
+    codes, uniques = pd.factorize(days, sort=True)
+    keep = codes >= len(uniques) - sessions
+    codes = codes[keep] - max(len(uniques) - sessions, 0)
+    close = hist['Close'].to_numpy(dtype=float)[keep]
+    open_ = hist['Open'].to_numpy(dtype=float)[keep]
+    minutes = (index.hour * 60 + index.minute).to_numpy()[keep]
+
+    n_days = codes.max() + 1 if len(codes) else 0
+    first = np.searchsorted(codes, np.arange(n_days))
+    lengths = np.diff(np.append(first, len(codes)))
+    slot = np.arange(len(codes)) - first[codes]
+    width = lengths.max() if n_days else 0
+
+    grid_close = np.full((n_days, width), np.nan)
+    grid_minutes = np.full((n_days, width), -1)
+    grid_close[codes, slot] = close
+    grid_minutes[codes, slot] = minutes
+    return {
+        "keep": keep,
+        "codes": codes,
+        "slot": slot,
+        "close": close,
+        "minutes": minutes,
+        "day_open": open_[first] if n_days else np.empty(0),
+        "grid_close": grid_close,
+        "grid_minutes": grid_minutes,
+        "lengths": lengths,
+    }
+
+
+def simulate_exits(grid: dict, entries: np.ndarray, take_profit: float = TAKE_PROFIT_PCT,
+                   stop_loss: float = STOP_LOSS_PCT) -> np.ndarray:
+    """P/L % for each entry bar (NaN where the session ended before any exit rule fired)."""
+    rows = grid["codes"][entries]
+    cols = grid["slot"][entries]
+    entry = grid["close"][entries][:, None]
+    future_close = grid["grid_close"][rows]
+    future_minutes = grid["grid_minutes"][rows]
+    slots = np.arange(future_close.shape[1])[None, :]
+    later = (slots > cols[:, None]) & (slots < grid["lengths"][rows][:, None])
+
+    hit_target = later & (future_close >= entry * (1 + take_profit / 100))
+    hit_stop = later & (future_close <= entry * (1 - stop_loss / 100))
+    hit_time = later & (future_minutes >= EXIT_HOUR * 60)
+    exit_any = hit_target | hit_stop | hit_time
+    first = exit_any.argmax(axis=1)
+    pick = np.arange(len(first))
+
+    exit_price = future_close[pick, first]
+    pl = np.where(
+        hit_target[pick, first], take_profit,
+        np.where(hit_stop[pick, first], -stop_loss, (exit_price - entry[:, 0]) / entry[:, 0] * 100),
+    )
+    return np.where(exit_any.any(axis=1), pl, np.nan)
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def backtest_stats(pl: np.ndarray, signals: int):
+    """Summary dict shown on the plan page; ``pl`` holds the P/L % of exited trades in order."""
+    if signals == 0:
+        return None
+    wins_mask = pl > 0
+    wins = int(wins_mask.sum())
+    winners, losers = pl[wins_mask], pl[pl < 0]
+    # cumsum adds left to right, exactly like the running total the loop version kept
+    total_pl = float(np.cumsum(pl)[-1]) if len(pl) else 0
+    win_sum = float(np.cumsum(winners)[-1]) if len(winners) else 0
+    loss_sum = float(np.cumsum(losers)[-1]) if len(losers) else 0
+    return {
+        "signals": signals,
+        "win_rate": round(wins / signals * 100, 1),
+        "avg_pl": round(total_pl / signals, 2),
+        "avg_win": round(np.mean(winners) if wins > 0 else 0, 2),
+        "avg_loss": round(np.mean(losers) if (signals - wins) > 0 else 0, 2),
+        "profit_factor": round(win_sum / abs(loss_sum) if len(losers) else float('inf'), 2),
+        "max_win_streak": _longest_run(wins_mask),
+        "max_loss_streak": _longest_run(~wins_mask),
+        "total_pl": round(total_pl, 1)
+    }
+
+
+def backtest_entries(grid: dict, entries: np.ndarray, take_profit: float = TAKE_PROFIT_PCT,
+                     stop_loss: float = STOP_LOSS_PCT):
+    pl = simulate_exits(grid, entries, take_profit, stop_loss)
+    return backtest_stats(pl[~np.isnan(pl)], len(entries))
+
+
+def run_backtest(hist: pd.DataFrame, is_strict: bool, max_chg_from_open: float = None,
+                 take_profit: float = TAKE_PROFIT_PCT, stop_loss: float = STOP_LOSS_PCT):
+    """Pullback-from-open backtest on NY-time 15m bars; same stats as ``backtest_reference``."""
+    if len(hist) < MIN_BARS:
+        return None
+    if max_chg_from_open is None:
+        max_chg_from_open = pullback_limit(is_strict)
+    grid = session_grid(hist)
+    day_open = grid["day_open"][grid["codes"]]
+    chg_from_open = (grid["close"] - day_open) / day_open * 100
+    morning = (grid["minutes"] >= ENTRY_START) & (grid["minutes"] <= ENTRY_END)
+    entries = np.flatnonzero(morning & (chg_from_open < max_chg_from_open))
+    return backtest_entries(grid, entries, take_profit, stop_loss)
+
+
+def gate_entries(gates: pd.DataFrame, grid: dict, min_label: str = "Caution Buy") -> np.ndarray:
+    """Positions (within the grid's sessions) of bars labelled ``min_label`` or better."""
+    return np.flatnonzero(gates["label"].isin(ENTRY_LABELS[min_label]).to_numpy()[grid["keep"]])
+
+
+def run_gate_backtest(hist: pd.DataFrame, qqq_hist: pd.DataFrame, is_strict: bool, min_label: str = "Caution Buy",
+                      th: GateThresholds = None, take_profit: float = TAKE_PROFIT_PCT,
+                      stop_loss: float = STOP_LOSS_PCT):
+    """Backtest that enters whenever the bar's 9-gate label is ``min_label`` or better.
+
+    Gates are computed for the whole history (so EMA200 is warmed up) and
+    entries are then limited to the last 60 sessions, like ``run_backtest``.
+    ``th`` overrides the Balanced/Strict thresholds picked by ``is_strict``.
+    """
+    if len(hist) < MIN_BARS:
+        return None
+    gates = gate_frame(hist, qqq_hist, th or thresholds_for(is_strict))
+    grid = session_grid(hist)
+    return backtest_entries(grid, gate_entries(gates, grid, min_label), take_profit, stop_loss)
+
+
+def backtest_reference(hist: pd.DataFrame, is_strict: bool):
+    """The original bar-by-bar loop (slow); used to check ``run_backtest`` against."""
+    if len(hist) < MIN_BARS: return None
+    signals = wins = total_pl = 0
+    pl_list = []
+    max_win_streak = max_loss_streak = current_streak = 0
+    current_is_win = False
+    for day in hist.index.normalize().unique()[-60:]:
+        day_data = hist[hist.index.normalize() == day]
+        morning = day_data.between_time("9:45", "11:30")
+        if morning.empty: continue
+        for j in range(len(morning)):
+            idx = morning.index[j]
+            curr_price = morning['Close'].iloc[j]
+            today_open = day_data['Open'].iloc[0]
+            chg_from_open = (curr_price - today_open) / today_open * 100
+            if chg_from_open < (4.5 if not is_strict else 3) and 9 < idx.hour < 12:
+                signals += 1
+                entry = curr_price
+                future = day_data[day_data.index > idx]
+                exited = False
+                for k in range(len(future)):
+                    exit_p = future['Close'].iloc[k]
+                    if exit_p >= entry * 1.03:
+                        pl = 3.0
+                        exited = True
+                        break
+                    if exit_p <= entry * 0.98:
+                        pl = -2.0
+                        exited = True
+                        break
+                    if future.index[k].hour >= 12:
+                        pl = (exit_p - entry) / entry * 100
+                        exited = True
+                        break
+                if exited:
+                    total_pl += pl
+                    pl_list.append(pl)
+                    if pl > 0:
+                        wins += 1
+                        current_streak = current_streak + 1 if current_is_win else 1
+                        current_is_win = True
+                        max_win_streak = max(max_win_streak, current_streak)
+                    else:
+                        current_streak = current_streak + 1 if not current_is_win else 1
+                        current_is_win = False
+                        max_loss_streak = max(max_loss_streak, current_streak)
+    if signals > 0:
+        win_rate = wins / signals * 100
+        return {
+            "signals": signals,
+            "win_rate": round(win_rate, 1),
+            "avg_pl": round(total_pl / signals, 2),
+            "avg_win": round(np.mean([p for p in pl_list if p > 0]) if wins > 0 else 0, 2),
+            "avg_loss": round(np.mean([p for p in pl_list if p < 0]) if (signals - wins) > 0 else 0, 2),
+            "profit_factor": round(sum(p for p in pl_list if p > 0) / abs(sum(p for p in pl_list if p < 0)) if any(p < 0 for p in pl_list) else float('inf'), 2),
+            "max_win_streak": max_win_streak,
+            "max_loss_streak": max_loss_streak,
+            "total_pl": round(total_pl, 1)
+        }
+    return None
@@ -0,0 +1,154 @@
+"""Persistent OHLCV bar store (SQLite) with incremental, append-only updates.
+
+Bars are keyed by (symbol, interval, ts) and carry their New York session
+date, so reads can be limited to the last N sessions without touching the
+rest of the history. ``sync_bars`` backfills a symbol once per requested
+period and afterwards only asks Yahoo for bars from the last stored
+timestamp onwards (the last bar is re-fetched because it may still be
+forming), one request per group of symbols last stored on the same session.
+"""
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from daytrade.market_data import MARKET_TZ, fetch_batch
+
+BAR_DB_FILE = os.environ.get("DAYTRADE_BAR_DB", "market_bars.db")
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol   TEXT    NOT NULL,
+    interval TEXT    NOT NULL,
+    ts       INTEGER NOT NULL,
+    day      TEXT    NOT NULL,
+    open     REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (symbol, interval, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bars_day ON bars (symbol, interval, day);
+CREATE TABLE IF NOT EXISTS backfills (
+    symbol     TEXT    NOT NULL,
+    interval   TEXT    NOT NULL,
+    days       INTEGER NOT NULL,
+    fetched_at REAL    NOT NULL,
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+
+def period_days(period: str) -> int:
+    # Yahoo periods we use: "5d", "60d", "1mo"...
+    if period.endswith("mo"):
+        return int(period[:-2]) * 30
+    if period.endswith("y"):
+        return int(period[:-1]) * 365
+    return int(period.rstrip("d"))
+
+
+class BarStore:
+    def __init__(self, path: str = BAR_DB_FILE):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per call keeps this safe across Streamlit's script threads
+        return sqlite3.connect(self.path, timeout=30)
+
+    def last_timestamp(self, symbol: str, interval: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(ts) FROM bars WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+        return pd.Timestamp(row[0], unit="s", tz="UTC").tz_convert(MARKET_TZ) if row[0] is not None else None
+
+    def backfilled_days(self, symbol: str, interval: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT days FROM backfills WHERE symbol = ? AND interval = ?", (symbol, interval)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def mark_backfilled(self, symbol: str, interval: str, days: int):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO backfills VALUES (?, ?, ?, ?)", (symbol, interval, days, time.time())
+            )
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """Upsert bars; returns the number of rows written."""
+        if df is None or df.empty:
+            return 0
+        df = df[COLUMNS].dropna(subset=["Close"])
+        index = df.index.tz_convert(MARKET_TZ) if df.index.tz is not None else df.index.tz_localize(MARKET_TZ)
+        ts = (index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+        rows = list(zip(
+            [symbol] * len(df), [interval] * len(df), ts.tolist(), index.strftime("%Y-%m-%d"),
+            *(df[c].astype(float).tolist() for c in COLUMNS),
+        ))
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def load(self, symbol: str, interval: str, sessions: int = None) -> pd.DataFrame:
+        """Bars for ``symbol`` as a NY-indexed OHLCV frame, optionally only the last ``sessions`` days."""
+        query = "SELECT ts, open, high, low, close, volume FROM bars WHERE symbol = ? AND interval = ?"
+        params = [symbol, interval]
+        if sessions:
+            query += (" AND day >= (SELECT MIN(day) FROM (SELECT DISTINCT day FROM bars"
+                      " WHERE symbol = ? AND interval = ? ORDER BY day DESC LIMIT ?))")
+            params += [symbol, interval, sessions]
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY ts", params).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=COLUMNS)
+        df = pd.DataFrame(rows, columns=["ts"] + COLUMNS)
+        df.index = pd.to_datetime(df.pop("ts"), unit="s", utc=True).dt.tz_convert(MARKET_TZ).rename(None)
+        return df
+
+    def prune(self, keep_sessions: int):
+        """Drop everything older than the last ``keep_sessions`` days of each (symbol, interval)."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM bars WHERE day < (SELECT MIN(day) FROM (SELECT DISTINCT b.day FROM bars b"
+                " WHERE b.symbol = bars.symbol AND b.interval = bars.interval ORDER BY b.day DESC LIMIT ?))",
+                (keep_sessions,),
+            )
+
+
+def sync_bars(store: BarStore, symbols, interval: str = "15m", period: str = "5d") -> dict:
+    """Bring the store up to date for ``symbols`` and return how many bars each one received.
+
+    Symbols that were never backfilled as far as ``period`` get one bulk
+    ``period`` download. The rest are grouped by the session of their last
+    stored bar, and each group gets one bulk download starting at its
+    oldest last bar, so one symbol that was last synced days ago doesn't
+    make every up-to-date symbol download those days again.
+    """
+    days = period_days(period)
+    last_seen = {s: store.last_timestamp(s, interval) for s in symbols if store.backfilled_days(s, interval) >= days}
+    warm = {s: ts for s, ts in last_seen.items() if ts is not None}
+    cold = [s for s in symbols if s not in warm]
+    written = {}
+
+    if cold:
+        for sym, df in fetch_batch(cold, period=period, interval=interval).items():
+            written[sym] = store.append(sym, interval, df)
+            if not df.empty:
+                store.mark_backfilled(sym, interval, days)
+
+    groups = {}
+    for sym, ts in warm.items():
+        groups.setdefault(ts.date(), []).append(sym)
+    for group in groups.values():
+        start = min(warm[s] for s in group)
+        for sym, df in fetch_batch(group, interval=interval, start=start).items():
+            written[sym] = store.append(sym, interval, df)
+    return written
+
+
+def load_bars(store: BarStore, symbols, interval: str = "15m", sessions: int = 5) -> dict:
+    return {sym: store.load(sym, interval, sessions) for sym in symbols}
@@ -0,0 +1,306 @@
+"""Offline benchmark suite on deterministic synthetic bars.
+
+Times the hot paths of the dashboard at several universe sizes without
+touching the network, and writes the numbers to JSON so two commits can
+be compared::
+
+    python -m daytrade bench                                   # 9/50/500 tickers x 5/60/250 days
+    python -m daytrade bench --tickers 9 50 --days 5 60 --out before.json
+    python -m daytrade bench --compare before.json after.json
+
+Cases (each timed per scale):
+
+* ``gates_cold``     – 9-gate evaluation of every ticker with an empty indicator engine
+* ``gates_warm``     – the steady-state poll: one new bar per ticker on a warm engine
+* ``screener``       – the same 9 gates for every ticker in one wide-array pass (``daytrade.screener``)
+* ``backtest``       – the app's ``run_intraday_backtest`` path (bar store load + 9-gate backtest)
+* ``signals_image``  – the Telegram PNG of the signal table (one row per ticker)
+* ``price_chart``    – Plotly chart build + JSON payload for one ticker over all days
+* ``price_chart_refresh`` – the auto-refresh: one new bar written into the session's cached figure + JSON
+* ``trade_log``      – 50 inserts, open / last-10 queries and the Excel export on tickers x days lots
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from daytrade.market_data import BENCHMARK
+
+DEFAULT_TICKERS = (9, 50, 500)
+DEFAULT_DAYS = (5, 60, 250)
+CASES = ("gates_cold", "gates_warm", "screener", "backtest", "signals_image", "price_chart",
+         "price_chart_refresh", "trade_log")
+BUDGET_SECONDS = 5.0   # stop repeating a case once it has used this much wall time
+
+
+def timed(fn, setup=None, repeat: int = 3, budget: float = BUDGET_SECONDS) -> dict:
+    """Run ``fn(setup())`` up to ``repeat`` times (at least once); only ``fn`` is timed."""
+    times = []
+    spent = time.perf_counter()
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg) if setup else fn()
+        times.append((time.perf_counter() - t0) * 1000)
+        if time.perf_counter() - spent > budget:
+            break
+    return {
+        "runs": len(times),
+        "min_ms": round(min(times), 3),
+        "median_ms": round(statistics.median(times), 3),
+        "mean_ms": round(statistics.fmean(times), 3),
+    }
+
+
+class Scale:
+    """Synthetic universe + the stores a case needs, built once per (tickers, days)."""
+
+    def __init__(self, tickers: int, days: int, seed: int, workdir: str):
+        from daytrade.synthetic import synthetic_symbols, synthetic_universe
+
+        self.tickers, self.days, self.seed = tickers, days, seed
+        self.workdir = workdir
+        self.symbols = synthetic_symbols(tickers)
+        self.frames = synthetic_universe(tickers, days, seed)
+        self.bars = sum(len(self.frames[s]) for s in self.symbols)
+
+    def signal_rows(self) -> list:
+        from daytrade.gates import BALANCED
+        from daytrade.indicators import IndicatorEngine
+        from daytrade.signals import evaluate_watchlist
+        return evaluate_watchlist(self.symbols, self.frames, 0.0, BALANCED, IndicatorEngine())
+
+    def signal_table(self) -> pd.DataFrame:
+        # The app's signal table (the image input)
+        from daytrade.snapshot import signal_table
+        return signal_table(self.signal_rows())
+
+    def bar_store(self):
+        from daytrade.backtest import MAX_SESSIONS
+        from daytrade.bar_store import BarStore
+        store = BarStore(os.path.join(self.workdir, f"bars_{self.tickers}_{self.days}.db"))
+        for symbol in self.symbols + [BENCHMARK]:
+            frame = self.frames[symbol]
+            sessions = frame.index.normalize().unique()[-MAX_SESSIONS:]
+            store.append(symbol, "15m", frame[frame.index.normalize() >= sessions[0]])
+        return store
+
+    def trade_log(self):
+        from daytrade.trade_log import TradeLog
+        log = TradeLog(os.path.join(self.workdir, f"trades_{self.tickers}_{self.days}.db"))
+        rng = np.random.default_rng(self.seed)
+        lots = self.tickers * self.days
+        entry = rng.uniform(10, 150, lots)
+        is_open = rng.random(lots) < 0.05
+        exit_price = np.where(is_open, np.nan, entry * (1 + rng.normal(0, 0.02, lots)))
+        shares = rng.integers(10, 500, lots).astype(float)
+        dates = pd.date_range("2024-01-01 10:00", periods=lots, freq="15min").strftime("%Y-%m-%d %H:%M")
+        rows = [
+            (dates[i], self.symbols[i % self.tickers], float(entry[i]),
+             None if is_open[i] else float(exit_price[i]), float(shares[i]),
+             None if is_open[i] else float(shares[i] * (exit_price[i] - entry[i])), "bench", int(is_open[i]))
+            for i in range(lots)
+        ]
+        with log._connect() as conn:
+            conn.executemany(
+                "INSERT INTO trades (date, ticker, entry_price, exit_price, shares, pl, notes, is_open)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+        return log
+
+
+# ---------- cases ----------
+def case_gates_cold(scale: Scale, repeat: int) -> dict:
+    from daytrade.gates import BALANCED
+    from daytrade.indicators import IndicatorEngine
+    from daytrade.signals import evaluate_watchlist
+    return timed(lambda engine: evaluate_watchlist(scale.symbols, scale.frames, 0.0, BALANCED, engine),
+                 setup=IndicatorEngine, repeat=repeat)
+
+
+def case_gates_warm(scale: Scale, repeat: int) -> dict:
+    from daytrade.gates import BALANCED
+    from daytrade.indicators import IndicatorEngine
+    from daytrade.signals import evaluate_watchlist
+
+    previous = {s: f.iloc[:-1] for s, f in scale.frames.items()}
+    warm = IndicatorEngine()
+    evaluate_watchlist(scale.symbols, previous, 0.0, BALANCED, warm)
+
+    def setup():
+        # Roll every stream back to "one bar behind" without paying the cold rebuild again
+        engine = IndicatorEngine()
+        engine._streams = {key: _copy_stream(stream) for key, stream in warm._streams.items()}
+        return engine
+    return timed(lambda engine: evaluate_watchlist(scale.symbols, scale.frames, 0.0, BALANCED, engine),
+                 setup=setup, repeat=repeat)
+
+
+def _copy_stream(stream):
+    from copy import copy
+    clone = copy(stream)
+    clone._series = stream._series.copy()
+    return clone
+
+
+def case_screener(scale: Scale, repeat: int) -> dict:
+    from daytrade.gates import BALANCED
+    from daytrade.screener import screen
+    return timed(lambda: screen(scale.frames, scale.symbols, 0.0, BALANCED), repeat=repeat)
+
+
+def case_backtest(scale: Scale, repeat: int) -> dict:
+    from daytrade.backtest import MAX_SESSIONS, run_gate_backtest
+    store = scale.bar_store()
+
+    def run():
+        qqq_hist = store.load(BENCHMARK, "15m", sessions=MAX_SESSIONS)
+        for symbol in scale.symbols:
+            run_gate_backtest(store.load(symbol, "15m", sessions=MAX_SESSIONS), qqq_hist, False)
+    return timed(run, repeat=repeat)
+
+
+def case_signals_image(scale: Scale, repeat: int) -> dict:
+    from daytrade.render import signals_image
+    table = scale.signal_table()
+    return timed(lambda: signals_image(table, "🟡 Neutral Day – Stick to Strong Buys"), repeat=repeat)
+
+
+def case_price_chart(scale: Scale, repeat: int) -> dict:
+    from daytrade.indicators import indicator_frame
+    from daytrade.render import price_chart
+    hist = scale.frames[scale.symbols[0]]
+    hist = hist.join(indicator_frame(hist["Close"])[["EMA9", "MACD", "Signal", "MACD Hist"]])
+    return timed(lambda: price_chart(scale.symbols[0], hist).to_json(), repeat=repeat)
+
+
+def case_price_chart_refresh(scale: Scale, repeat: int) -> dict:
+    from daytrade.indicators import indicator_frame
+    from daytrade.render import PriceCharts
+    hist = scale.frames[scale.symbols[0]]
+    hist = hist.join(indicator_frame(hist["Close"])[["EMA9", "MACD", "Signal", "MACD Hist"]])
+
+    def setup():
+        charts = PriceCharts()
+        charts.figure(scale.symbols[0], hist.iloc[:-1])
+        return charts
+    return timed(lambda charts: charts.figure(scale.symbols[0], hist).to_json(), setup=setup, repeat=repeat)
+
+
+def case_trade_log(scale: Scale, repeat: int) -> dict:
+    log = scale.trade_log()
+
+    def run():
+        for i in range(50):
+            log.add_trade(scale.symbols[i % scale.tickers], 25.0 + i, 100)
+        log.open_trades()
+        log.last_trades(10)
+        log.to_excel(BytesIO())
+    return timed(run, repeat=repeat)
+
+
+# ---------- driver ----------
+def git_commit() -> str:
+    try:
+        repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=repo, timeout=5).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def run_bench(tickers=DEFAULT_TICKERS, days=DEFAULT_DAYS, cases=CASES, repeat: int = 3, seed: int = 0,
+              progress=None) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="daytrade-bench-") as workdir:
+        for n in tickers:
+            for d in days:
+                scale = Scale(n, d, seed, workdir)
+                for case in cases:
+                    row = {"case": case, "tickers": n, "days": d, "bars": scale.bars}
+                    try:
+                        row.update(globals()[f"case_{case}"](scale, repeat))
+                    except Exception as e:  # e.g. a 500-row PNG beyond matplotlib's size limit
+                        row["error"] = f"{type(e).__name__}: {str(e)[:160]}"
+                    results.append(row)
+                    if progress:
+                        progress(row)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def format_row(row: dict) -> str:
+    label = f"{row['case']:<14} {row['tickers']:>4} tickers x {row['days']:>3} days"
+    if "error" in row:
+        return f"{label}   ERROR {row['error']}"
+    return f"{label}   {row['median_ms']:>10,.1f} ms median  ({row['runs']} run{'s' * (row['runs'] != 1)})"
+
+
+def compare(before: dict, after: dict) -> list:
+    """Rows present in both reports with the median ratio (after / before)."""
+    old = {(r["case"], r["tickers"], r["days"]): r for r in before["results"] if "error" not in r}
+    rows = []
+    for r in after["results"]:
+        key = (r["case"], r["tickers"], r["days"])
+        if "error" in r or key not in old:
+            continue
+        rows.append({"case": r["case"], "tickers": r["tickers"], "days": r["days"],
+                     "before_ms": old[key]["median_ms"], "after_ms": r["median_ms"],
+                     "ratio": round(r["median_ms"] / old[key]["median_ms"], 3) if old[key]["median_ms"] else None})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=list(DEFAULT_TICKERS))
+    parser.add_argument("--days", type=int, nargs="+", default=list(DEFAULT_DAYS))
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two result files and exit")
+    args = parser.parse_args(argv)
+    warnings.filterwarnings("ignore", message="Glyph .* missing from font")  # emoji in the PNG title
+
+    if args.compare:
+        with open(args.compare[0]) as fh, open(args.compare[1]) as gh:
+            before, after = json.load(fh), json.load(gh)
+        print(f"{before['meta']['commit']} -> {after['meta']['commit']}")
+        for r in compare(before, after):
+            print(f"{r['case']:<14} {r['tickers']:>4} x {r['days']:>3}   {r['before_ms']:>10,.1f} -> "
+                  f"{r['after_ms']:>10,.1f} ms   x{r['ratio']}")
+        return 0
+
+    report = run_bench(args.tickers, args.days, args.cases, args.repeat, args.seed,
+                       progress=lambda row: print(format_row(row), flush=True))
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\n{len(report['results'])} results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
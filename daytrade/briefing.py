@@ -0,0 +1,322 @@
+"""Grok pre-market briefing, generated once per trading day per input bucket.
+
+The prompt carries live prices, but a new briefing is only worth paying
+for when the picture changes: another regime, QQQ / VIX moving into a
+different bucket, or a different set of strong buys. ``briefing_key``
+folds the inputs into that bucket. ``BriefingService`` (one per process)
+starts at most one background generation per (day, key), streams the
+tokens into a ``Briefing`` that every session polls, and writes finished
+briefings to ``briefings/<day>.json`` so other sessions and restarts
+reuse them.
+
+``python -m daytrade llm-stub`` serves an OpenAI-compatible
+``/v1/chat/completions`` (streaming included) that writes a canned
+briefing from the prompt's prices, to exercise the flow offline::
+
+    python -m daytrade llm-stub --port 8089 &
+    DAYTRADE_LLM_BASE_URL=http://127.0.0.1:8089/v1 streamlit run app.py
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+
+from daytrade.profiling import REGISTRY
+
+log = logging.getLogger(__name__)
+
+BRIEFING_DIR = os.environ.get("DAYTRADE_BRIEFING_DIR", "briefings")
+LLM_BASE_URL = os.environ.get("DAYTRADE_LLM_BASE_URL", "https://api.x.ai/v1")
+LLM_API_KEY = os.environ.get("DAYTRADE_LLM_API_KEY")
+LLM_MODEL = os.environ.get("DAYTRADE_LLM_MODEL", "grok-4-1-fast")
+MAX_TOKENS = 950
+TEMPERATURE = 0.65
+QQQ_BUCKET = 0.5      # % QQQ move per bucket
+VIX_BUCKET = 5        # VIX points per bucket
+STUB_PORT = 8089
+
+
+def briefing_prompt(date_label: str, regime: str, qqq_chg: float, vix: float, top_signals: str,
+                    price_summary: str) -> str:
+    return f"""You are an elite day-trading analyst focused ONLY on long-only leveraged ETF momentum-pullback trades (SOXL, TQQQ, TECL, FNGU, NVDL, TSLL, SPXL, QLD, UPRO and any custom tickers added today).
+
+Date: {date_label}
+Current Regime: {regime}
+QQQ from open: {qqq_chg:+.2f}%
+VIX: {vix}
+
+Current prices (use these EXACT numbers — do not guess or use old data):
+{price_summary}
+
+Current strong signals:
+{top_signals or "None yet"}
+
+EXAMPLES OF PERFECT BRIEFINGS (copy this exact style):
+
+Example 1 (Bullish day):
+1. Overnight news: NVDA beat earnings + China stimulus rumors lifting semis.
+2. Premarket futures: NQ +1.4%, ES +0.9%, NVDA gapping +3.2%, SOXX +2.1%.
+3. Sector rotation: Semis leading (SOXL +4.1% pre), broad tech following.
+4. Key levels: SOXL support 38.50 / resistance 42.80; TQQQ 72.30–78.50; TECL 95–102.
+5. Aggression level: Aggressive Long — strong momentum.
+6. Red flags: None — low gap risk today.
+
+**Recommended Approach:** Enter 9-gate pullbacks aggressively on SOXL/TQQQ/TECL with 2% risk. Trail after +3%.
+
+Example 2 (Neutral/choppy day):
+1. Overnight news: Mixed PPI data + Fed speakers later.
+2. Premarket futures: NQ flat, ES -0.3%, NVDA +0.8%, SOXX +0.4%.
+3. Sector rotation: Rotation into defensives; semis lagging.
+4. Key levels: TQQQ 68.40–71.20; SOXL 36.80–39.10; FNGU 180–188.
+5. Aggression level: Selective Long — tight stops only.
+6. Red flags: VIX 26 — watch for volatility decay on 3x names.
+
+**Recommended Approach:** Only take strongest 9-gate setups on TQQQ/NVDL with 1% risk. Sit out if no clear pullback by 10:30 ET.
+
+Now generate today's briefing in exactly this style. Be direct and actionable. End exactly with: "**Recommended Approach:** ..."
+
+Focus on setups that fit a 9-gate morning pullback system. No bearish or short ideas."""
+
+
+def briefing_key(regime: str, qqq_chg: float, vix: float, strong_tickers) -> str:
+    """Input bucket: regime, QQQ in 0.5% steps, VIX in 5-point steps and the strong-buy set."""
+    qqq = math.floor(qqq_chg / QQQ_BUCKET) * QQQ_BUCKET
+    vix_floor = int(vix // VIX_BUCKET) * VIX_BUCKET
+    strong = ",".join(sorted(set(strong_tickers))) or "-"
+    return f"{regime.split('–')[0].strip()}|QQQ {qqq:+.1f}%|VIX {vix_floor}+|{strong}"
+
+
+class Briefing:
+    """One generation; ``text`` grows while ``status`` is "streaming"."""
+    __slots__ = ("day", "key", "text", "status", "error", "started_at", "finished_at")
+
+    def __init__(self, day: str, key: str, text: str = "", status: str = "streaming", error: str = None,
+                 started_at: float = None, finished_at: float = None):
+        self.day = day
+        self.key = key
+        self.text = text
+        self.status = status          # "streaming" / "done" / "error"
+        self.error = error
+        self.started_at = started_at if started_at is not None else time.time()
+        self.finished_at = finished_at
+
+    @property
+    def streaming(self) -> bool:
+        return self.status == "streaming"
+
+    @property
+    def done(self) -> bool:
+        return self.status == "done"
+
+    def to_dict(self) -> dict:
+        return {"text": self.text, "started_at": self.started_at, "finished_at": self.finished_at}
+
+
+class BriefingService:
+    def __init__(self, api_key: str = None, base_url: str = LLM_BASE_URL, model: str = LLM_MODEL,
+                 directory: str = BRIEFING_DIR, client=None):
+        self.api_key = api_key or LLM_API_KEY
+        self.base_url = base_url
+        self.model = model
+        self.directory = directory
+        self._client = client            # tests / the stub can hand in a ready OpenAI client
+        self._briefings = {}             # (day, key) -> Briefing
+        self._loaded = set()             # days read from disk
+        self._lock = threading.Lock()
+
+    # ---------- persistence ----------
+    def _path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{day}.json")
+
+    def _load(self, day: str):
+        # Caller holds the lock
+        if day in self._loaded:
+            return
+        self._loaded.add(day)
+        try:
+            with open(self._path(day)) as fh:
+                stored = json.load(fh)
+        except (OSError, ValueError):
+            return
+        for key, entry in stored.items():
+            self._briefings.setdefault((day, key), Briefing(day, key, entry["text"], "done",
+                                                            started_at=entry.get("started_at"),
+                                                            finished_at=entry.get("finished_at")))
+
+    def _save(self, day: str):
+        with self._lock:
+            done = {b.key: b.to_dict() for (d, _), b in self._briefings.items() if d == day and b.done}
+        path = self._path(day)
+        tmp = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "w") as fh:
+                json.dump(done, fh, ensure_ascii=False, indent=1)
+            os.replace(tmp, path)
+        except OSError:
+            log.exception("could not write %s", path)
+
+    # ---------- reading ----------
+    def get(self, day: str, key: str):
+        with self._lock:
+            self._load(day)
+            return self._briefings.get((day, key))
+
+    def latest(self, day: str):
+        """Most recently started briefing of the day that has text (finished or still streaming)."""
+        with self._lock:
+            self._load(day)
+            usable = [b for (d, _), b in self._briefings.items() if d == day and (b.done or b.streaming)]
+        return max(usable, key=lambda b: b.started_at) if usable else None
+
+    # ---------- generating ----------
+    def request(self, day: str, key: str, prompt: str, force: bool = False) -> Briefing:
+        """The briefing for (day, key); starts a background generation unless one exists or is running."""
+        REGISTRY.cache_event("grok_briefing", "calls")
+        with self._lock:
+            self._load(day)
+            current = self._briefings.get((day, key))
+            if current is not None and (current.streaming or (current.done and not force)):
+                return current
+            briefing = self._briefings[(day, key)] = Briefing(day, key)
+        REGISTRY.cache_event("grok_briefing", "misses")
+        threading.Thread(target=self._generate, args=(briefing, prompt), name="grok-briefing", daemon=True).start()
+        return briefing
+
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key or "missing", base_url=self.base_url)
+        return self._client
+
+    def _generate(self, briefing: Briefing, prompt: str):
+        started = time.perf_counter()
+        try:
+            stream = self.client().chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                stream=True,
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    briefing.text += delta
+            briefing.text = briefing.text.strip()
+            briefing.status = "done"
+        except Exception as e:
+            briefing.error = str(e)[:120]
+            briefing.text = f"⚠️ Grok unavailable right now: {briefing.error}"
+            briefing.status = "error"     # not persisted: the next request tries again
+        briefing.finished_at = time.time()
+        REGISTRY.observe("briefing", "generate", (time.perf_counter() - started) * 1000)
+        if briefing.done:
+            self._save(briefing.day)
+
+
+# ---------- offline stand-in for the LLM endpoint ----------
+_PRICE_LINE = re.compile(r"^([A-Z.^]+): \$([\d,.]+) \(([+-][\d.]+)%\)", re.M)
+
+
+def stub_briefing(prompt: str) -> str:
+    """A briefing in the house style built only from the prompt's own numbers."""
+    regime = re.search(r"Current Regime: (.*)", prompt)
+    vix = re.search(r"VIX: ([\d.]+)", prompt)
+    qqq = re.search(r"QQQ from open: ([+-][\d.]+)%", prompt)
+    prices = [(t, float(p.replace(",", "")), float(c)) for t, p, c in _PRICE_LINE.findall(prompt)]
+    leaders = sorted(prices, key=lambda p: p[2], reverse=True)[:3]
+    levels = "; ".join(f"{t} support {p * 0.98:.2f} / resistance {p * 1.03:.2f}" for t, p, _ in leaders)
+    vix_value = float(vix.group(1)) if vix else 0.0
+    bullish = regime is not None and "Bullish" in regime.group(1)
+    names = "/".join(t for t, _, _ in leaders) or "TQQQ"
+    return "\n".join([
+        "1. Overnight news: (offline stub) no news feed — numbers below come from the dashboard.",
+        f"2. Premarket futures: QQQ {qqq.group(1) if qqq else '+0.00'}% from the open.",
+        f"3. Sector rotation: strongest on the watchlist — {', '.join(f'{t} {c:+.1f}%' for t, _, c in leaders) or 'n/a'}.",
+        f"4. Key levels: {levels or 'no prices yet'}.",
+        f"5. Aggression level: {'Aggressive Long' if bullish else 'Selective Long'} — {regime.group(1) if regime else 'unknown regime'}.",
+        f"6. Red flags: {'VIX ' + format(vix_value, 'g') + ' — size down on 3x names' if vix_value > 25 else 'None beyond normal gap risk'}.",
+        "",
+        f"**Recommended Approach:** Only take 9-gate pullbacks on {names} with "
+        f"{'2%' if bullish else '1%'} risk. Trail after +3%.",
+    ])
+
+
+def stub_server(host: str = "127.0.0.1", port: int = STUB_PORT, delay: float = 0.03):
+    """OpenAI-compatible ``POST /v1/chat/completions`` (SSE when ``stream`` is set), bound but not serving.
+
+    ``port=0`` binds a free port; read it back from ``server_address``.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt, *args):
+            log.info("llm-stub %s", fmt % args)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = (body.get("messages") or [{}])[-1].get("content", "")
+            text = stub_briefing(prompt)
+            base = {"id": f"stub-{time.time_ns()}", "created": int(time.time()), "model": body.get("model", "stub")}
+            if not body.get("stream"):
+                payload = json.dumps({**base, "object": "chat.completion", "choices": [{
+                    "index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}]})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload.encode())))
+                self.end_headers()
+                self.wfile.write(payload.encode())
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            for piece in re.findall(r"\S+\s*", text):
+                self._event({**base, "object": "chat.completion.chunk",
+                             "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+                time.sleep(delay)
+            self._event({**base, "object": "chat.completion.chunk",
+                         "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def _event(self, payload: dict):
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+            self.wfile.flush()
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def serve_stub(host: str = "127.0.0.1", port: int = STUB_PORT, delay: float = 0.03):
+    """Run ``stub_server`` until interrupted; blocks."""
+    server = stub_server(host, port, delay)
+    log.info("llm stub on http://%s:%d/v1 (point DAYTRADE_LLM_BASE_URL at it)", host, server.server_address[1])
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade llm-stub",
+                                     description="Offline OpenAI-compatible stand-in for the Grok endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--delay", type=float, default=0.03, help="seconds between streamed tokens")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    serve_stub(args.host, args.port, args.delay)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
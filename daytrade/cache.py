@@ -0,0 +1,110 @@
+"""Process-wide cache with single-flight loads and stale-while-revalidate.
+
+``st.cache_data`` lets every session that misses at the same moment run
+the loader itself, so when an entry expires at 9:30 N open dashboards
+fire N identical Yahoo requests. ``SingleFlightCache.get(key, loader)``
+instead:
+
+* returns a fresh value straight from memory,
+* for a missing key, runs the loader once; concurrent callers for the same
+  key wait on that one result (or its exception),
+* for an expired key still inside ``stale_ttl``, returns the old value
+  immediately and refreshes it once in the background.
+
+A failed background refresh keeps serving the stale value until it ages
+out completely.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+STAT_FIELDS = ("hits", "stale_hits", "misses", "coalesced", "refreshes", "errors")
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+
+
+class SingleFlightCache:
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_entries: int = 512, workers: int = 4,
+                 name: str = "cache"):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.name = name
+        self._entries = {}
+        self._inflight = {}              # key -> Future of the one running load
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-refresh")
+        self._stats = dict.fromkeys(STAT_FIELDS, 0)
+
+    def get(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry.stored_at if entry is not None else None
+            if entry is not None and age < self.ttl:
+                self._stats["hits"] += 1
+                return entry.value
+            if entry is not None and age < self.ttl + self.stale_ttl:
+                self._stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._stats["refreshes"] += 1
+                    future = self._inflight[key] = Future()
+                    self._pool.submit(self._load, key, loader, future)
+                return entry.value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                self._stats["misses"] += 1
+                future = self._inflight[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        if leader:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _load(self, key, loader, future: Future):
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                self._inflight.pop(key, None)
+            log.warning("%s: load for %r failed: %s", self.name, key, e)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, time.monotonic())
+            self._inflight.pop(key, None)
+            if len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k].stored_at)
+                del self._entries[oldest]
+        future.set_result(value)
+
+    def peek(self, key, default=None):
+        """Whatever is cached for ``key`` (fresh or stale) without loading or counting."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.value if entry is not None else default
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["inflight"] = len(self._inflight)
+        return stats
@@ -0,0 +1,68 @@
+"""Import-time budget report (``python -X importtime`` aggregated per package).
+
+Each module is imported in a fresh interpreter so the numbers are cold
+start costs, which is what a redeploy / idle wake-up pays.
+
+    python -m daytrade importtime                 # the app's dependencies
+    python -m daytrade importtime plotly.graph_objects openai
+"""
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+APP_IMPORTS = [
+    "streamlit", "pandas", "numpy", "yfinance", "plotly.graph_objects",
+    "matplotlib.pyplot", "openai", "telebot", "daytrade.poller",
+]
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(module: str) -> list:
+    """[(qualified name, self µs, cumulative µs, depth)] for a cold ``import module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise ImportError(f"{module}: {proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2))
+    return rows
+
+
+def import_report(modules=None) -> list:
+    """One dict per requested module: cumulative ms and the packages that dominate it."""
+    report = []
+    for module in modules or APP_IMPORTS:
+        try:
+            rows = import_times(module)
+        except ImportError as e:
+            report.append({"module": module, "error": str(e)})
+            continue
+        per_package = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            per_package[name.split(".")[0]] += self_us
+        total = next((cum for name, _, cum, _ in reversed(rows) if name == module), sum(per_package.values()))
+        top = sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        report.append({
+            "module": module,
+            "cumulative_ms": round(total / 1000, 1),
+            "modules_loaded": len(rows),
+            "top_packages_ms": {pkg: round(us / 1000, 1) for pkg, us in top},
+        })
+    return sorted(report, key=lambda r: r.get("cumulative_ms", 0), reverse=True)
+
+
+def format_report(report: list) -> str:
+    lines = [f"{'module':<24} {'cold import':>12} {'modules':>8}  heaviest packages (self time)"]
+    for r in report:
+        if "error" in r:
+            lines.append(f"{r['module']:<24} {'n/a':>12} {'':>8}  {r['error']}")
+            continue
+        top = ", ".join(f"{pkg} {ms:.0f}ms" for pkg, ms in r["top_packages_ms"].items())
+        lines.append(f"{r['module']:<24} {r['cumulative_ms']:>10.0f}ms {r['modules_loaded']:>8}  {top}")
+    return "\n".join(lines)
@@ -0,0 +1,102 @@
+"""The 9 trade gates: thresholds, labels and a per-bar (vectorized) evaluation."""
+from dataclasses import dataclass
+from datetime import time as dt_time
+
+import numpy as np
+import pandas as pd
+
+from daytrade.indicators import indicator_frame
+
+GATE_NAMES = [
+    "bull", "vol_ok", "rsi_ok", "pullback_ok", "near_9ema",
+    "time_ok", "macd_bullish", "histogram_ok", "rel_strength_ok",
+]
+LABELS = ["Strong Buy", "Caution Buy", "Watch", "Sit Out"]
+
+
+@dataclass(frozen=True)
+class GateThresholds:
+    max_chg_from_open: float = 4.5   # sacred gate 4 (% above today's open)
+    min_vol_ratio: float = 1.5       # vs previous bar
+    max_rsi: float = 78
+    max_dist_9ema: float = 0.02      # fraction of the 9-EMA
+    window_start: dt_time = dt_time(9, 30)
+    window_end: dt_time = dt_time(12, 0)
+    require_hist_rising: bool = False
+    rel_strength_margin: float = 0.5  # may lag QQQ by this many % points
+
+
+BALANCED = GateThresholds()
+STRICT = GateThresholds(
+    max_chg_from_open=3, min_vol_ratio=1.8, max_rsi=75, max_dist_9ema=0.015,
+    window_start=dt_time(9, 45), window_end=dt_time(11, 30), require_hist_rising=True,
+)
+
+
+def thresholds_for(is_strict: bool) -> GateThresholds:
+    return STRICT if is_strict else BALANCED
+
+
+def signal_label(conditions_met: int, sacred_passed: bool) -> str:
+    if conditions_met >= 9:
+        return "Strong Buy"
+    elif conditions_met >= 8 or (conditions_met == 7 and sacred_passed):
+        return "Caution Buy"
+    elif conditions_met >= 7:
+        return "Watch"
+    return "Sit Out"
+
+
+def session_change_from_open(bars: pd.DataFrame) -> pd.Series:
+    """Per-bar % change vs the first open of that bar's session."""
+    day_open = bars['Open'].groupby(bars.index.normalize()).transform("first")
+    return (bars['Close'] - day_open) / day_open * 100
+
+
+def gate_frame(hist: pd.DataFrame, qqq_hist: pd.DataFrame = None, th: GateThresholds = BALANCED,
+               ind: pd.DataFrame = None) -> pd.DataFrame:
+    """Every gate as a boolean column for every bar, plus strength / sacred / label.
+
+    Same rules as the live loop, except the time window is checked against
+    each bar's own timestamp instead of the wall clock. Pass ``ind``
+    (from ``indicator_frame``) to reuse indicators across threshold sets.
+    """
+    close = hist['Close']
+    if ind is None:
+        ind = indicator_frame(close)
+    chg_from_open = session_change_from_open(hist)
+    if qqq_hist is not None and not qqq_hist.empty:
+        qqq_chg = session_change_from_open(qqq_hist).reindex(hist.index, method="ffill").fillna(0.0)
+    else:
+        qqq_chg = pd.Series(0.0, index=hist.index)
+
+    volume = hist['Volume']
+    prev_volume = volume.shift(1).fillna(0)
+    minutes = hist.index.hour * 60 + hist.index.minute
+    start = th.window_start.hour * 60 + th.window_start.minute
+    end = th.window_end.hour * 60 + th.window_end.minute
+    hist_rising = ind['MACD Hist'] > ind['MACD Hist'].shift(1)
+
+    gates = pd.DataFrame({
+        "bull": ind['EMA50'] > ind['EMA200'],
+        "vol_ok": volume > prev_volume * th.min_vol_ratio,
+        "rsi_ok": ind['RSI'] < th.max_rsi,
+        "pullback_ok": chg_from_open < th.max_chg_from_open,
+        "near_9ema": (close - ind['EMA9']).abs() / ind['EMA9'] < th.max_dist_9ema,
+        "time_ok": pd.Series((minutes >= start) & (minutes <= end), index=hist.index),
+        "macd_bullish": ind['MACD'] > ind['Signal'],
+        "histogram_ok": (ind['MACD Hist'] > 0) & (hist_rising if th.require_hist_rising else True),
+        "rel_strength_ok": chg_from_open > qqq_chg - th.rel_strength_margin,
+    }, index=hist.index)
+
+    strength = gates[GATE_NAMES].sum(axis=1).to_numpy()
+    sacred = (gates["bull"] & gates["pullback_ok"]).to_numpy()
+    labels = np.select(
+        [strength >= 9, (strength >= 8) | ((strength == 7) & sacred), strength >= 7],
+        LABELS[:3], default=LABELS[3],
+    )
+    gates["chg_from_open"] = chg_from_open
+    gates["strength"] = strength
+    gates["sacred_passed"] = sacred
+    gates["label"] = labels
+    return gates
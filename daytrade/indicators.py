@@ -0,0 +1,219 @@
+"""Streaming indicator engine for the 9-gate signal loop.
+
+Keeps EMA9/12/26/50/200, MACD(12,26,9) and RSI(14) state per
+(symbol, interval) and advances it one bar at a time, so a refresh that
+brings one new 15m bar costs one update instead of re-running ``ewm`` /
+``rolling`` over five days of history.
+
+The bar that is still forming keeps changing between refreshes, so each
+stream holds a *committed* state (every bar except the newest) and
+re-applies only the newest bar on top of it.
+
+Per-bar outputs for the chart live in a float32 ``RingBuffer`` (int64
+timestamps), not in one Python object per bar.
+"""
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from daytrade.ringbuffer import RingBuffer, as_bars, bar_index
+
+RSI_PERIOD = 14
+EMA_SPANS = (9, 12, 26, 50, 200)
+MACD_SIGNAL_SPAN = 9
+MAX_SERIES_BARS = 2000  # per-bar outputs kept for the chart (~75 sessions of 15m bars)
+SERIES_COLUMNS = ("EMA9", "MACD", "Signal", "MACD Hist")
+
+
+def _alpha(span: int) -> float:
+    # Same smoothing as pandas ewm(span=..., adjust=False)
+    return 2.0 / (span + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorValues:
+    ts: int                 # bar time, ns since the epoch
+    close: float
+    ema9: float
+    ema12: float
+    ema26: float
+    ema50: float
+    ema200: float
+    macd_line: float
+    signal_line: float
+    macd_hist: float
+    prev_macd_hist: float
+    rsi: float
+    bars: int
+
+
+class _State:
+    __slots__ = ("ts", "close", "emas", "signal", "gains", "losses", "gain_sum", "loss_sum", "values", "bars")
+
+    def __init__(self):
+        self.ts = None
+        self.close = None
+        self.emas = None
+        self.signal = None
+        self.gains = deque(maxlen=RSI_PERIOD)
+        self.losses = deque(maxlen=RSI_PERIOD)
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.values = None
+        self.bars = 0
+
+    def advance(self, ts, close: float) -> "_State":
+        """New state with one more bar applied; ``self`` is left untouched."""
+        nxt = _State()
+        nxt.ts = ts
+        nxt.close = close
+        nxt.bars = self.bars + 1
+        nxt.gains = deque(self.gains, maxlen=RSI_PERIOD)
+        nxt.losses = deque(self.losses, maxlen=RSI_PERIOD)
+        nxt.gain_sum, nxt.loss_sum = self.gain_sum, self.loss_sum
+
+        if self.emas is None:
+            nxt.emas = {span: close for span in EMA_SPANS}
+        else:
+            nxt.emas = {span: self.emas[span] + _alpha(span) * (close - self.emas[span]) for span in EMA_SPANS}
+            delta = close - self.close
+            if len(nxt.gains) == RSI_PERIOD:
+                nxt.gain_sum -= nxt.gains[0]
+                nxt.loss_sum -= nxt.losses[0]
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            nxt.gains.append(gain)
+            nxt.losses.append(loss)
+            nxt.gain_sum += gain
+            nxt.loss_sum += loss
+
+        macd_line = nxt.emas[12] - nxt.emas[26]
+        alpha = _alpha(MACD_SIGNAL_SPAN)
+        nxt.signal = macd_line if self.signal is None else self.signal + alpha * (macd_line - self.signal)
+        macd_hist = macd_line - nxt.signal
+
+        if len(nxt.gains) < RSI_PERIOD:
+            rsi = math.nan
+        else:
+            # Simple-average RSI over the last 14 close-to-close moves
+            avg_gain = nxt.gain_sum / RSI_PERIOD
+            avg_loss = max(nxt.loss_sum / RSI_PERIOD, 1e-10)
+            rsi = max(0.0, min(100.0, 100 - 100 / (1 + avg_gain / avg_loss)))
+
+        nxt.values = IndicatorValues(
+            ts=ts, close=close,
+            ema9=nxt.emas[9], ema12=nxt.emas[12], ema26=nxt.emas[26], ema50=nxt.emas[50], ema200=nxt.emas[200],
+            macd_line=macd_line, signal_line=nxt.signal, macd_hist=macd_hist,
+            prev_macd_hist=self.values.macd_hist if self.values is not None else math.nan,
+            rsi=rsi, bars=nxt.bars,
+        )
+        return nxt
+
+
+class IndicatorStream:
+    """Indicator state for one (symbol, interval)."""
+
+    def __init__(self):
+        self._committed = _State()
+        self._latest = None
+        self._series = RingBuffer(MAX_SERIES_BARS, SERIES_COLUMNS)
+        self._tz = None
+
+    @property
+    def latest(self):
+        return self._latest.values if self._latest is not None else None
+
+    def can_extend(self, bars) -> bool:
+        # The new bars have to overlap what we've seen, otherwise bars may be missing
+        ts = self._committed.ts
+        bars = as_bars(bars)
+        return ts is None or (len(bars) > 0 and bars.ts[0] <= ts and bars.tz == self._tz)
+
+    def extend(self, bars) -> int:
+        """Apply bars (``Bars`` or an OHLCV frame) newer than the committed state; returns how many were (re)applied."""
+        bars = as_bars(bars)
+        ts = self._committed.ts
+        start = 0 if ts is None else int(np.searchsorted(bars.ts, ts, side="right"))
+        if start >= len(bars):
+            return 0
+        self._tz = bars.tz
+        stamps = bars.ts[start:].tolist()
+        closes = bars.close[start:].tolist()
+        state = self._committed
+        for i in range(len(stamps) - 1):
+            state = state.advance(stamps[i], closes[i])
+            v = state.values
+            self._series.append(stamps[i], (v.ema9, v.macd_line, v.signal_line, v.macd_hist))
+        self._committed = state
+        self._latest = state.advance(stamps[-1], closes[-1])
+        return len(stamps)
+
+    def frame(self) -> pd.DataFrame:
+        """Per-bar EMA9 / MACD outputs (committed bars + the forming one) for charting."""
+        if self._latest is None:
+            return pd.DataFrame(columns=list(SERIES_COLUMNS))
+        ts, values = self._series.arrays()
+        v = self._latest.values
+        ts = np.append(ts, v.ts)
+        values = np.vstack([values, np.array([[v.ema9, v.macd_line, v.signal_line, v.macd_hist]], dtype=np.float32)])
+        return pd.DataFrame(values.astype(float), index=bar_index(ts, self._tz), columns=list(SERIES_COLUMNS))
+
+
+def indicator_frame(close: pd.Series) -> pd.DataFrame:
+    """Whole-history counterpart of the streams (backtests, screeners): one column per indicator."""
+    emas = {span: close.ewm(span=span, adjust=False).mean() for span in EMA_SPANS}
+    macd_line = emas[12] - emas[26]
+    signal_line = macd_line.ewm(span=MACD_SIGNAL_SPAN, adjust=False).mean()
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).rolling(RSI_PERIOD).mean()
+    avg_loss = (-delta.clip(upper=0)).rolling(RSI_PERIOD).mean().clip(lower=1e-10)
+    rsi = (100 - 100 / (1 + avg_gain / avg_loss)).clip(0, 100)
+    return pd.DataFrame({
+        "EMA9": emas[9], "EMA50": emas[50], "EMA200": emas[200],
+        "MACD": macd_line, "Signal": signal_line, "MACD Hist": macd_line - signal_line, "RSI": rsi,
+    })
+
+
+class IndicatorEngine:
+    """Process-wide registry of indicator streams keyed by (symbol, interval)."""
+
+    def __init__(self):
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, symbol: str, interval: str, bars) -> IndicatorStream:
+        stream = IndicatorStream()
+        stream.extend(bars)
+        with self._lock:
+            self._streams[(symbol, interval)] = stream
+        return stream
+
+    def update(self, symbol: str, interval: str, bars):
+        """Advance (or rebuild) the stream with ``bars`` and return its latest IndicatorValues."""
+        bars = as_bars(bars)
+        with self._lock:
+            stream = self._streams.get((symbol, interval))
+            if stream is not None and stream.can_extend(bars):
+                stream.extend(bars)
+                return stream.latest
+        return self.rebuild(symbol, interval, bars).latest
+
+    def frame(self, symbol: str, interval: str) -> pd.DataFrame:
+        with self._lock:
+            stream = self._streams.get((symbol, interval))
+            return stream.frame() if stream is not None else IndicatorStream().frame()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(stream._series.nbytes for stream in self._streams.values())
+
+    def retain(self, symbols, interval: str):
+        """Drop ``interval`` streams for symbols nobody watches any more."""
+        keep = set(symbols)
+        with self._lock:
+            for key in [k for k in self._streams if k[1] == interval and k[0] not in keep]:
+                del self._streams[key]
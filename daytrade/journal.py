@@ -0,0 +1,222 @@
+"""Signal journal: every 9-gate evaluation, buffered and written as Parquet.
+
+``record()`` only appends dicts to an in-memory list, so the poller never
+waits on disk. A background thread flushes the buffer every
+``flush_seconds`` (or as soon as it holds ``max_rows``) to one part file in
+the day's partition::
+
+    signal_journal/date=2025-06-02/part-093015-000041.parquet
+
+When the day rolls over, the previous day's parts are compacted into a
+single ``journal.parquet`` and partitions older than ``keep_days`` are
+deleted. ``load_day()`` reads one partition back with pyarrow.
+"""
+import logging
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from daytrade.market_data import MARKET_TZ
+
+log = logging.getLogger(__name__)
+
+JOURNAL_DIR = os.environ.get("DAYTRADE_JOURNAL_DIR", "signal_journal")
+KEEP_DAYS = 30
+FLUSH_SECONDS = 30.0
+MAX_ROWS = 5000
+
+GATE_FIELDS = ("bull", "vol_ok", "rsi_ok", "pullback_ok", "near_9ema", "time_ok", "macd_bullish", "histogram_ok",
+               "rel_strength_ok")
+VALUE_FIELDS = ("chg_from_open", "rsi", "vol_ratio", "ema9", "dist_9ema_pct", "macd_line", "macd_hist")
+
+
+def _today() -> date:
+    return datetime.now(ZoneInfo(MARKET_TZ)).date()
+
+
+def _et_date(ts: datetime) -> date:
+    # Naive timestamps are already ET wall time (the poller's clock)
+    return ts.astimezone(ZoneInfo(MARKET_TZ)).date() if ts.tzinfo is not None else ts.date()
+
+
+def journal_rows(taken_at: datetime, mode: str, signals, snapshot_version: int = 0) -> list:
+    """Flatten ``TickerSignal``s (see ``evaluate_ticker``) into journal records."""
+    records = []
+    for sig in signals:
+        record = {
+            "taken_at": taken_at,
+            "version": snapshot_version,
+            "mode": mode,
+            "ticker": sig.ticker,
+            "signal": sig.label,
+            "strength": sig.strength,
+            "sacred_passed": sig.sacred_passed,
+            "price": round(sig.price, 2),
+            "chg_pct": round(sig.chg_from_open, 1),
+            "bar_ts": sig.bar_ts,
+            "curr": sig.price,
+            "prev": sig.prev_close,
+        }
+        record.update({name: getattr(sig, name) for name in GATE_FIELDS})
+        record.update({name: getattr(sig, name) for name in VALUE_FIELDS})
+        records.append(record)
+    return records
+
+
+class SignalJournal:
+    def __init__(self, root: str = JOURNAL_DIR, keep_days: int = KEEP_DAYS,
+                 flush_seconds: float = FLUSH_SECONDS, max_rows: int = MAX_ROWS):
+        self.root = root
+        self.keep_days = keep_days
+        self.flush_seconds = flush_seconds
+        self.max_rows = max_rows
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()   # one writer at a time (thread flush vs explicit flush)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._seq = 0
+        self._current_day = None
+
+    def start(self) -> "SignalJournal":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="signal-journal", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def record(self, taken_at: datetime, mode: str, rows, snapshot_version: int = 0) -> int:
+        records = journal_rows(taken_at, mode, rows, snapshot_version)
+        with self._lock:
+            self._buffer.extend(records)
+            full = len(self._buffer) >= self.max_rows
+        if full:
+            self._wake.set()
+        return len(records)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    # ---------- writing ----------
+    def partition(self, day) -> str:
+        return os.path.join(self.root, f"date={day:%Y-%m-%d}")
+
+    def flush(self) -> int:
+        with self._lock:
+            records, self._buffer = self._buffer, []
+        if not records:
+            return 0
+        frame = pd.DataFrame.from_records(records)
+        with self._io_lock:
+            # Rows are partitioned by the ET date they were evaluated on, whatever the host's timezone
+            days = frame["taken_at"].map(_et_date)
+            for day, part in frame.groupby(days, sort=True):
+                self._roll_to(day)
+                folder = self.partition(day)
+                os.makedirs(folder, exist_ok=True)
+                self._seq += 1
+                name = f"part-{datetime.now(ZoneInfo(MARKET_TZ)):%H%M%S}-{self._seq:06d}.parquet"
+                tmp = os.path.join(folder, "." + name)
+                part.reset_index(drop=True).to_parquet(tmp, index=False)
+                os.replace(tmp, os.path.join(folder, name))   # readers never see half a file
+        return len(records)
+
+    def _roll_to(self, day: date):
+        if self._current_day is not None and day > self._current_day:
+            self.compact(self._current_day)
+            self.prune(today=day)
+        if self._current_day is None or day > self._current_day:
+            self._current_day = day
+
+    def compact(self, day) -> bool:
+        """Merge a finished day's part files into one ``journal.parquet``."""
+        folder = self.partition(day)
+        parts = sorted(f for f in os.listdir(folder) if f.startswith("part-")) if os.path.isdir(folder) else []
+        if not parts:
+            return False
+        frame = load_day(day, self.root)
+        tmp = os.path.join(folder, ".journal.parquet")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, os.path.join(folder, "journal.parquet"))
+        for name in parts:
+            os.remove(os.path.join(folder, name))
+        return True
+
+    def prune(self, today: date = None) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+        cutoff = (today or _today()) - timedelta(days=self.keep_days)
+        removed = 0
+        for name in os.listdir(self.root):
+            try:
+                day = date.fromisoformat(name.removeprefix("date="))
+            except ValueError:
+                continue
+            if day < cutoff:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+                removed += 1
+        return removed
+
+    def _housekeep(self):
+        # After a restart: compact days that never got their rollover, drop expired ones
+        today = _today()
+        for day in journal_days(self.root):
+            if day < today:
+                self.compact(day)
+        self.prune(today=today)
+
+    def _run(self):
+        try:
+            with self._io_lock:
+                self._housekeep()
+        except Exception:
+            log.exception("signal journal housekeeping failed")
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("signal journal flush failed")
+
+
+def journal_days(root: str = JOURNAL_DIR) -> list:
+    if not os.path.isdir(root):
+        return []
+    days = []
+    for name in os.listdir(root):
+        try:
+            days.append(date.fromisoformat(name.removeprefix("date=")))
+        except ValueError:
+            continue
+    return sorted(days)
+
+
+def load_day(day, root: str = JOURNAL_DIR, columns=None) -> pd.DataFrame:
+    """One day's journal (all part files plus any compacted file), oldest first."""
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    folder = os.path.join(root, f"date={day:%Y-%m-%d}")
+    files = sorted(os.path.join(folder, f) for f in os.listdir(folder)
+                   if f.endswith(".parquet") and not f.startswith(".")) if os.path.isdir(folder) else []
+    if not files:
+        return pd.DataFrame()
+    import pyarrow as pa
+    import pyarrow.dataset as pds
+    import pyarrow.parquet as pq
+    # Parts written before a column was added read back as nulls instead of dropping the column
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files])
+    frame = pds.dataset(files, schema=schema, format="parquet").to_table(columns=columns).to_pandas()
+    return frame.sort_values("taken_at", kind="stable").reset_index(drop=True) if "taken_at" in frame else frame
@@ -0,0 +1,227 @@
+"""NYSE trading calendar: holidays, half days and the pre / regular / post sessions.
+
+Rule-based (no exchange-calendar dependency): the ten NYSE holidays with
+their weekend observance rules, the 1:00 PM early closes before
+Independence Day, after Thanksgiving and on Christmas Eve, plus the
+one-off closures listed in ``SPECIAL_CLOSURES``.
+
+The poller sleeps on ``poll_delay`` and the app reads ``market_status``,
+so "is the market open", "is this a trading day" and "when is the next
+poll" all come from the same early-close-aware schedule.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from daytrade.market_data import MARKET_TZ
+
+PRE_MARKET_OPEN = dt_time(4, 0)
+REGULAR_OPEN = dt_time(9, 30)
+REGULAR_CLOSE = dt_time(16, 0)
+EARLY_CLOSE = dt_time(13, 0)
+POST_MARKET_CLOSE = dt_time(20, 0)
+EARLY_POST_MARKET_CLOSE = dt_time(17, 0)
+SIGNAL_WINDOW = (REGULAR_OPEN, dt_time(12, 0))   # where the gates and alerts live
+
+POLL_SECONDS = 60                 # full cadence, inside the signal window
+AFTERNOON_POLL_SECONDS = 120      # regular session after the window: prices still move, no new setups
+PRE_MARKET_POLL_SECONDS = 300     # daily bars / VIX for the briefing, 15m bars don't move yet
+CLOSE_SETTLE_SECONDS = 120        # one last poll once the closing bar is final
+MAX_IDLE_SECONDS = 900            # long sleeps wake up this often to re-check the clock (no fetch)
+
+SPECIAL_CLOSURES = {
+    date(2012, 10, 29): "Hurricane Sandy",
+    date(2012, 10, 30): "Hurricane Sandy",
+    date(2018, 12, 5): "National Day of Mourning (George H.W. Bush)",
+    date(2025, 1, 9): "National Day of Mourning (Jimmy Carter)",
+}
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th ``weekday`` (Mon=0) of the month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # Anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def _observed(day: date) -> date:
+    # Saturday holidays move to Friday, Sunday holidays to Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def holidays(year: int) -> dict:
+    """date -> name of every full-day NYSE closure in ``year``."""
+    days = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    # A Saturday New Year's Day isn't observed on the Friday before (that's the last day of the fiscal year)
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days[_observed(new_year)] = "New Year's Day"
+    if year >= 2022:
+        days[_observed(date(year, 6, 19))] = "Juneteenth"
+    days.update({d: name for d, name in SPECIAL_CLOSURES.items() if d.year == year})
+    return days
+
+
+@lru_cache(maxsize=None)
+def early_closes(year: int) -> dict:
+    """date -> reason of every 1:00 PM close in ``year``."""
+    days = {}
+    july3 = date(year, 7, 3)
+    if july3.weekday() < 4:          # Mon-Thu; a Friday July 3 is the observed holiday itself
+        days[july3] = "Independence Day eve"
+    days[_nth_weekday(year, 11, 3, 4) + timedelta(days=1)] = "Day after Thanksgiving"
+    christmas_eve = date(year, 12, 24)
+    if christmas_eve.weekday() < 4:
+        days[christmas_eve] = "Christmas Eve"
+    return days
+
+
+def closed_reason(day: date):
+    """Why ``day`` has no session ("Weekend", the holiday's name) or None on a trading day."""
+    if day.weekday() >= 5:
+        return "Weekend"
+    return holidays(day.year).get(day)
+
+
+def is_trading_day(day: date) -> bool:
+    return closed_reason(day) is None
+
+
+@dataclass(frozen=True, slots=True)
+class Session:
+    """One trading day's hours, tz-aware ET."""
+    day: date
+    pre_open: datetime
+    open: datetime
+    close: datetime
+    post_close: datetime
+    early_close: bool
+
+
+def session(day: date):
+    """``day``'s Session, or None when the exchange is closed all day."""
+    if not is_trading_day(day):
+        return None
+    tz = ZoneInfo(MARKET_TZ)
+    early = day in early_closes(day.year)
+    at = lambda t: datetime.combine(day, t, tzinfo=tz)
+    return Session(day=day, pre_open=at(PRE_MARKET_OPEN), open=at(REGULAR_OPEN),
+                   close=at(EARLY_CLOSE if early else REGULAR_CLOSE),
+                   post_close=at(EARLY_POST_MARKET_CLOSE if early else POST_MARKET_CLOSE), early_close=early)
+
+
+def next_session(after: date) -> Session:
+    """First session strictly after ``after``."""
+    day = after + timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return session(day)
+
+
+@dataclass(frozen=True, slots=True)
+class MarketStatus:
+    """Where ``now`` sits in the calendar: phase is "pre", "open", "post" or "closed"."""
+    now: datetime
+    phase: str
+    session: Session           # today's, None on weekends / holidays
+    upcoming: Session          # the next session that hasn't closed yet (today's until it has)
+    reason: str = None         # weekend / holiday name when there's no session today
+
+    @property
+    def is_trading_day(self) -> bool:
+        return self.session is not None
+
+    @property
+    def is_open(self) -> bool:
+        return self.phase == "open"
+
+    @property
+    def in_signal_window(self) -> bool:
+        return self.is_open and SIGNAL_WINDOW[0] <= self.now.time() <= SIGNAL_WINDOW[1]
+
+    def cadence(self, poll_seconds: int = POLL_SECONDS):
+        """Seconds between polls in this phase; None while closed (after hours included)."""
+        if self.is_open:
+            return poll_seconds if self.now.time() < SIGNAL_WINDOW[1] else max(poll_seconds, AFTERNOON_POLL_SECONDS)
+        if self.phase == "pre":
+            return max(poll_seconds, PRE_MARKET_POLL_SECONDS)
+        return None
+
+    @property
+    def label(self) -> str:
+        opens = f"opens {self.upcoming.open:%a %b %d %H:%M} ET"
+        if self.is_open:
+            if self.session.early_close:
+                return f"🟢 MARKET OPEN · early close {self.session.close:%H:%M} ET"
+            return "🟢 MARKET OPEN"
+        if self.phase == "pre":
+            return f"🟡 PRE-MARKET · opens {self.session.open:%H:%M} ET"
+        if self.phase == "post":
+            return f"🟠 AFTER HOURS · {opens}"
+        return f"🔴 MARKET CLOSED{f' ({self.reason})' if self.reason else ''} · {opens}"
+
+
+def market_status(now: datetime) -> MarketStatus:
+    now = now.astimezone(ZoneInfo(MARKET_TZ))
+    today = session(now.date())
+    if today is None:
+        return MarketStatus(now, "closed", None, next_session(now.date()), closed_reason(now.date()))
+    upcoming = today if now < today.close else next_session(today.day)
+    if today.pre_open <= now < today.open:
+        phase = "pre"
+    elif today.open <= now < today.close:
+        phase = "open"
+    elif today.close <= now < today.post_close:
+        phase = "post"
+    else:
+        phase = "closed"
+    return MarketStatus(now, phase, today, upcoming)
+
+
+def poll_delay(now: datetime, poll_seconds: int = POLL_SECONDS) -> float:
+    """Seconds until the next upstream poll is due.
+
+    Full cadence in the signal window, slower in the afternoon and pre-market,
+    one last poll ``CLOSE_SETTLE_SECONDS`` after the close, then nothing until
+    the next session's pre-market.
+    """
+    status = market_status(now)
+    now, today = status.now, status.session
+    until = lambda t: max(0.0, (t - now).total_seconds())
+    if status.is_open:
+        return min(status.cadence(poll_seconds), until(today.close + timedelta(seconds=CLOSE_SETTLE_SECONDS)))
+    if status.phase == "pre":
+        return min(status.cadence(poll_seconds), until(today.open))
+    if today is not None and today.close <= now < today.close + timedelta(seconds=CLOSE_SETTLE_SECONDS):
+        return until(today.close + timedelta(seconds=CLOSE_SETTLE_SECONDS))
+    return until(status.upcoming.pre_open)
@@ -0,0 +1,72 @@
+"""Batched market data fetches.
+
+One bulk request per interval covers the whole watchlist plus the
+benchmark / volatility / index symbols, and is split back into the same
+per-symbol OHLCV frames that ``yf.Ticker(...).history()`` used to return.
+"""
+import pandas as pd
+
+from daytrade.ringbuffer import as_bars
+
+MARKET_TZ = "America/New_York"
+BENCHMARK = "QQQ"
+VIX = "^VIX"
+INDICES = {"^DJI": "Dow", "^IXIC": "Nasdaq", "^GSPC": "S&P 500"}
+
+
+def unique_symbols(*groups) -> list:
+    # Keeps first-seen order so the batch key is stable between reruns
+    return list(dict.fromkeys(s for group in groups for s in group))
+
+
+def intraday_symbols(watchlist) -> list:
+    return unique_symbols(watchlist, [BENCHMARK])
+
+
+def daily_symbols(watchlist) -> list:
+    return unique_symbols(watchlist, [BENCHMARK, VIX], INDICES)
+
+
+def split_batch(raw: pd.DataFrame, symbols) -> dict:
+    frames = {}
+    for sym in symbols:
+        if raw is None or raw.empty:
+            df = pd.DataFrame()
+        elif isinstance(raw.columns, pd.MultiIndex):
+            df = raw[sym] if sym in raw.columns.get_level_values(0) else pd.DataFrame()
+        else:
+            df = raw if len(symbols) == 1 else pd.DataFrame()
+        # Bulk downloads align every symbol on one index, so drop the padding rows
+        df = df.dropna(how="all").copy()
+        if not df.empty and df.index.tz is not None:
+            df.index = df.index.tz_convert(MARKET_TZ)
+        frames[sym] = df
+    return frames
+
+
+def fetch_batch(symbols, period: str = "5d", interval: str = "15m", start=None) -> dict:
+    """Bulk-download ``symbols``; ``start`` (a timestamp) overrides ``period`` for incremental pulls.
+
+    Goes through the process-wide provider (Yahoo unless ``DAYTRADE_PROVIDER`` says otherwise),
+    which rate-limits, times out and counts every upstream call.
+    """
+    from daytrade.providers import get_provider
+    return get_provider().bars(symbols, interval=interval, period=period, start=start)
+
+
+def last_change(df: pd.DataFrame):
+    """(last close, % change vs previous close) or None when there are < 2 bars."""
+    if df is None or len(df) < 2:
+        return None
+    price = df['Close'].iloc[-1]
+    prev = df['Close'].iloc[-2]
+    if not prev:
+        return None
+    return price, (price - prev) / prev * 100
+
+
+def change_from_open(df: pd.DataFrame) -> float:
+    """% change of the last bar vs the first bar of the latest session."""
+    if df is None or len(df) == 0:
+        return 0.0
+    return as_bars(df).change_from_open()
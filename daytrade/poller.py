@@ -0,0 +1,224 @@
+"""One background market-data poller per process.
+
+The poller thread owns every upstream fetch and the gate computation.
+Each poll publishes an immutable ``MarketSnapshot`` with an increasing
+``version``; Streamlit sessions (and anything else) only read the latest
+snapshot, so N open dashboards cost the same Yahoo traffic and CPU as one.
+
+Fetched frames are merged into one ``BarRing`` per (symbol, interval) and
+dropped; snapshots only carry the rings' compact ``Bars`` views.
+
+Between polls the thread sleeps on the NYSE calendar (``poll_delay``):
+full cadence in the 9:30-12:00 signal window, slower in the afternoon and
+pre-market, and no upstream fetches at all while the market is closed
+(a session asking for a new ticker still wakes it).
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from zoneinfo import ZoneInfo
+
+from daytrade.bar_store import BarStore, load_bars, sync_bars
+from daytrade.gates import BALANCED, STRICT
+from daytrade.indicators import IndicatorEngine
+from daytrade.market_calendar import MAX_IDLE_SECONDS, POLL_SECONDS, poll_delay
+from daytrade.market_data import BENCHMARK, MARKET_TZ, VIX, daily_symbols, fetch_batch, intraday_symbols
+from daytrade.profiling import REGISTRY, RerunProfile
+from daytrade.providers import get_provider, metrics_delta
+from daytrade.ringbuffer import BarRing, ring_capacity
+from daytrade.signals import evaluate_watchlist, market_regime, vix_regime
+from daytrade.snapshot import MarketSnapshot, build_quotes
+
+log = logging.getLogger(__name__)
+
+WATCH_TTL_SECONDS = 3600  # custom tickers nobody asked for in an hour are dropped
+MODES = {"balanced": BALANCED, "strict": STRICT}
+
+
+def market_clock() -> datetime:
+    return datetime.now(ZoneInfo(MARKET_TZ))
+
+
+class LiveSource:
+    """Yahoo via the local bar store: 15m bars are synced incrementally, daily bars fetched in one batch."""
+
+    def __init__(self, store: BarStore):
+        self.store = store
+
+    def intraday(self, symbols) -> dict:
+        try:
+            sync_bars(self.store, symbols, interval="15m", period="5d")
+        except Exception:
+            log.exception("15m sync failed; serving stored bars")
+        return load_bars(self.store, symbols, "15m", sessions=5)
+
+    def daily(self, symbols) -> dict:
+        return fetch_batch(symbols, period="5d", interval="1d")
+
+
+class MarketPoller:
+    def __init__(self, store: BarStore, core_tickers, poll_seconds: int = POLL_SECONDS,
+                 engine: IndicatorEngine = None, journal=None, source=None, clock=market_clock,
+                 metrics=REGISTRY, schedule=poll_delay):
+        self.store = store
+        self.engine = engine or IndicatorEngine()
+        self.journal = journal           # optional SignalJournal; gets every evaluation
+        self.source = source or LiveSource(store)   # anything with intraday(symbols) / daily(symbols)
+        self.clock = clock               # -> tz-aware ET datetime; replays pass a simulated one
+        self.metrics = metrics           # MetricsRegistry the poll stage timings go to
+        self.poll_seconds = poll_seconds  # cadence inside the signal window
+        self.schedule = schedule         # (now, poll_seconds) -> seconds until the next poll
+        self.next_poll_at = None         # ET datetime the sleeping thread will poll again
+        self._core = tuple(core_tickers)
+        self._requested = {}             # custom ticker -> last time a session asked for it
+        self._rings = {}                 # (symbol, interval) -> BarRing, only touched by the poll thread
+        self._lock = threading.Lock()
+        self._published = threading.Condition()
+        self._snapshot = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- session side ----------
+    def start(self) -> "MarketPoller":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="market-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def watch(self, tickers) -> bool:
+        """Register tickers a session shows; returns True (and wakes the poller) if any are new."""
+        now = time.time()
+        with self._lock:
+            new = [t for t in tickers if t not in self._core and t not in self._requested]
+            for t in tickers:
+                if t not in self._core:
+                    self._requested[t] = now
+        if new:
+            self._wake.set()
+        return bool(new)
+
+    def refresh_now(self):
+        self._wake.set()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
+    def latest(self):
+        return self._snapshot
+
+    def wait_for(self, min_version: int = 1, timeout: float = 30):
+        """Block until a snapshot with ``version >= min_version`` exists (or timeout); returns latest."""
+        with self._published:
+            self._published.wait_for(lambda: self.version >= min_version, timeout=timeout)
+        return self._snapshot
+
+    # ---------- poller side ----------
+    def watchlist(self) -> tuple:
+        cutoff = time.time() - WATCH_TTL_SECONDS
+        with self._lock:
+            for t in [t for t, seen in self._requested.items() if seen < cutoff]:
+                del self._requested[t]
+            return self._core + tuple(self._requested)
+
+    def _merge(self, frames: dict, symbols, interval: str) -> dict:
+        """Fold fetched frames into the rings; symbol -> Bars for every requested symbol we hold bars for."""
+        for sym, df in frames.items():
+            ring = self._rings.get((sym, interval))
+            if ring is None:
+                ring = self._rings[(sym, interval)] = BarRing(ring_capacity(interval))
+            ring.update(df)
+        wanted = set(symbols)
+        for key in [k for k in self._rings if k[1] == interval and k[0] not in wanted]:
+            del self._rings[key]     # dropped from the watchlist
+        bars = {}
+        for sym in symbols:
+            ring = self._rings.get((sym, interval))
+            if ring is not None and len(ring):
+                bars[sym] = ring.view()
+        return bars
+
+    def memory(self) -> dict:
+        """Array bytes held per interval by the bar rings, plus the indicator chart series."""
+        used = {}
+        for (_, interval), ring in list(self._rings.items()):
+            used[interval] = used.get(interval, 0) + ring.nbytes
+        used["indicators"] = self.engine.nbytes
+        return used
+
+    def poll_once(self) -> MarketSnapshot:
+        profile = RerunProfile("poll", self.metrics)
+        watchlist = self.watchlist()
+        provider = get_provider()
+        before = provider.metrics()
+        symbols = daily_symbols(watchlist)
+        bar_symbols = intraday_symbols(watchlist)
+        intraday = self._merge(self.source.intraday(bar_symbols), bar_symbols, "15m")
+        profile.lap("fetch_15m")
+        daily = self._merge(self.source.daily(symbols), symbols, "1d")
+        profile.lap("fetch_1d")
+        self.engine.retain(bar_symbols, "15m")
+        upstream = metrics_delta(before, provider.metrics())
+
+        # One QQQ number for the banner and every rel-strength gate (same 15m basis as the backtest)
+        qqq_bars = intraday.get(BENCHMARK) or daily.get(BENCHMARK)
+        qqq_chg = qqq_bars.change_from_open() if qqq_bars else 0.0
+        vix_hist = daily.get(VIX)
+        vix = round(float(vix_hist.close[-1]), 1) if vix_hist else 0
+
+        now_et = self.clock()
+        signals = {
+            mode: tuple(evaluate_watchlist(watchlist, intraday, qqq_chg, th, self.engine, now_et.time()))
+            for mode, th in MODES.items()
+        }
+        quotes = build_quotes(symbols, intraday, daily)
+        profile.lap("gates")
+        snapshot = MarketSnapshot(
+            version=self.version + 1,
+            taken_at=now_et,
+            watchlist=watchlist,
+            intraday=MappingProxyType(intraday),
+            daily=MappingProxyType(daily),
+            qqq_chg_from_open=qqq_chg,
+            vix=vix,
+            regime=market_regime(qqq_chg),
+            vix_status=vix_regime(vix),
+            signals=MappingProxyType(signals),
+            quotes=MappingProxyType(quotes),
+            upstream=MappingProxyType(upstream),
+            timings=MappingProxyType(dict(profile.stages)),
+        )
+        with self._published:
+            self._snapshot = snapshot
+            self._published.notify_all()
+        if self.journal is not None:
+            for mode, rows in signals.items():
+                self.journal.record(now_et, mode, rows, snapshot.version)
+            profile.lap("journal")
+        profile.finish(version=snapshot.version, symbols=len(symbols))
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                log.exception("market poll failed")
+            self._sleep()
+
+    def _sleep(self):
+        # Long closed-market sleeps are cut into MAX_IDLE_SECONDS naps that only re-read the clock
+        while not self._stop.is_set():
+            now = self.clock()
+            delay = self.schedule(now, self.poll_seconds)
+            self.next_poll_at = now + timedelta(seconds=delay)
+            if self._wake.wait(min(delay, MAX_IDLE_SECONDS)) or delay <= MAX_IDLE_SECONDS:
+                break
+        self._wake.clear()
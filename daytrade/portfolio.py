@@ -0,0 +1,57 @@
+"""Open-position valuation for the Portfolio Heat panel.
+
+Prices come from the poller snapshot (one batched fetch for every ticker
+on screen plus every open position), and P/L / exposure are plain column
+math over the open lots, so the panel costs the same with 1 lot or 100.
+"""
+import numpy as np
+import pandas as pd
+
+
+def latest_prices(snapshot, tickers) -> pd.Series:
+    """Snapshot price per ticker (the same quote the heat-map shows); NaN when we have no data."""
+    return pd.Series({tick: snapshot.price(tick) for tick in tickers}, dtype=float)
+
+
+def position_heat(open_trades: pd.DataFrame, prices: pd.Series, account_size: float) -> pd.DataFrame:
+    """Per-lot unrealized P/L and exposure (numbers, not strings) for the open trades."""
+    lots = open_trades[["Ticker", "Shares", "Entry Price"]].copy()
+    lots["Shares"] = lots["Shares"].astype(float)
+    lots["Entry"] = lots.pop("Entry Price").astype(float)
+    lots["Cost $"] = lots["Shares"] * lots["Entry"]
+    lots["Current"] = lots["Ticker"].map(prices).astype(float)
+    lots["Unreal P/L $"] = lots["Shares"] * (lots["Current"] - lots["Entry"])
+    lots["Unreal P/L %"] = (lots["Current"] - lots["Entry"]) / lots["Entry"].replace(0, np.nan) * 100
+    lots["Exposure $"] = lots["Shares"] * lots["Current"]
+    lots["Exposure %"] = lots["Exposure $"] / account_size * 100 if account_size else np.nan
+    return lots
+
+
+def ticker_concentration(lots: pd.DataFrame, account_size: float) -> pd.DataFrame:
+    """Roll the lots up per ticker, largest exposure first."""
+    by_ticker = lots.groupby("Ticker", sort=False).agg(
+        Lots=("Shares", "size"),
+        Shares=("Shares", "sum"),
+        Cost=("Cost $", "sum"),
+        Current=("Current", "first"),
+        PL=("Unreal P/L $", lambda v: v.sum(min_count=1)),
+        Exposure=("Exposure $", lambda v: v.sum(min_count=1)),
+    ).rename(columns={"PL": "Unreal P/L $", "Exposure": "Exposure $"})
+    by_ticker["Avg Entry"] = by_ticker.pop("Cost") / by_ticker["Shares"].replace(0, np.nan)
+    by_ticker["Exposure %"] = by_ticker["Exposure $"] / account_size * 100 if account_size else np.nan
+    total = by_ticker["Exposure $"].sum()
+    by_ticker["Share of Heat %"] = by_ticker["Exposure $"] / total * 100 if total else np.nan
+    by_ticker = by_ticker.sort_values("Exposure $", ascending=False).reset_index()
+    return by_ticker[["Ticker", "Lots", "Shares", "Avg Entry", "Current", "Unreal P/L $",
+                      "Exposure $", "Exposure %", "Share of Heat %"]]
+
+
+def account_heat(lots: pd.DataFrame, account_size: float) -> dict:
+    exposure = float(lots["Exposure $"].sum())
+    return {
+        "exposure": exposure,
+        "heat_pct": exposure / account_size * 100 if account_size else 0.0,
+        "unreal_pl": float(lots["Unreal P/L $"].sum()),
+        "unpriced": int(lots["Current"].isna().sum()),
+        "lots": len(lots),
+    }
@@ -0,0 +1,240 @@
+"""Hot-path timings for the dashboard and the poller.
+
+Every Streamlit rerun gets a ``RerunProfile``: sections call
+``profile.lap("heat_map")`` when they finish (or wrap one call in
+``with profile.stage("chart_build"):``), and ``profile.finish()`` hands
+the stage times to the process-wide ``REGISTRY``. The poller reports its
+own stages (15m fetch, daily fetch, gate math, journal) the same way.
+
+The registry keeps a rolling window per stage for p50 / p95 plus
+cumulative sums / counts, and exports them two ways:
+
+* ``daytrade.prom``: Prometheus text format (point node_exporter's
+  textfile collector at it, or just ``cat`` it),
+* ``profile_log.jsonl``: one JSON line per rerun / poll, rolled over to
+  ``.1`` past ``MAX_LOG_BYTES``, for graphing a trading day. Lines go
+  through a queue to one writer thread, so reruns never wait on the disk.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+PROMETHEUS_FILE = os.environ.get("DAYTRADE_PROM_FILE", "daytrade.prom")
+PROFILE_LOG = os.environ.get("DAYTRADE_PROFILE_LOG", "profile_log.jsonl")
+WINDOW = 500                 # samples per stage kept for the quantiles
+MAX_LOG_BYTES = 5_000_000
+EXPORT_SECONDS = 15          # rewrite the .prom file at most this often
+QUANTILES = (0.5, 0.95)
+
+
+class _Series:
+    __slots__ = ("window", "total", "count")
+
+    def __init__(self, window: int):
+        self.window = deque(maxlen=window)
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = WINDOW, prom_file: str = PROMETHEUS_FILE, log_file: str = PROFILE_LOG,
+                 max_log_bytes: int = MAX_LOG_BYTES, export_seconds: float = EXPORT_SECONDS):
+        self.window = window
+        self.prom_file = prom_file
+        self.log_file = log_file
+        self.max_log_bytes = max_log_bytes
+        self.export_seconds = export_seconds
+        self._series = {}            # (source, stage) -> _Series of milliseconds
+        self._cache_events = {}      # (cache, event) -> count
+        self._caches = {}            # name -> object with stats() (SingleFlightCache)
+        self._lock = threading.Lock()
+        self._exported_at = 0.0
+        self._log_queue = queue.SimpleQueue()   # JSON lines (or flush events) for the writer thread
+        self._writer = None
+
+    # ---------- recording ----------
+    def observe(self, source: str, stage: str, ms: float):
+        with self._lock:
+            series = self._series.get((source, stage))
+            if series is None:
+                series = self._series[(source, stage)] = _Series(self.window)
+            series.window.append(ms)
+            series.total += ms
+            series.count += 1
+
+    def cache_event(self, cache: str, event: str, n: int = 1):
+        """Count events for caches we can't ask for stats (``st.cache_data`` functions)."""
+        with self._lock:
+            self._cache_events[(cache, event)] = self._cache_events.get((cache, event), 0) + n
+
+    def register_cache(self, name: str, cache):
+        self._caches[name] = cache
+
+    def record(self, source: str, stages: dict, **extra):
+        """One rerun / poll: observe every stage and append it to the JSON log."""
+        for stage, ms in stages.items():
+            self.observe(source, stage, ms)
+        entry = {"ts": round(time.time(), 3), "source": source,
+                 "stages": {k: round(v, 2) for k, v in stages.items()}, **extra}
+        self._append_log(entry)
+        if time.monotonic() - self._exported_at >= self.export_seconds:
+            self.export()
+
+    # ---------- reading ----------
+    def cache_stats(self) -> dict:
+        """cache name -> {hits, misses, ...}: SingleFlightCache stats plus counted events."""
+        stats = {name: dict(cache.stats()) for name, cache in self._caches.items()}
+        with self._lock:
+            events = dict(self._cache_events)
+        for (cache, event), n in events.items():
+            stats.setdefault(cache, {})[event] = n
+        for counts in stats.values():
+            if "calls" in counts:      # counted caches only know calls and misses
+                counts["hits"] = counts["calls"] - counts.get("misses", 0)
+        return stats
+
+    def summary(self, source: str = None) -> list:
+        """One dict per stage: count, p50 / p95 over the window, mean over everything."""
+        with self._lock:
+            items = [(key, list(s.window), s.total, s.count) for key, s in self._series.items()]
+        rows = []
+        for (src, stage), window, total, count in sorted(items):
+            if source is not None and src != source:
+                continue
+            p50, p95 = np.percentile(window, [q * 100 for q in QUANTILES]) if window else (np.nan, np.nan)
+            rows.append({"source": src, "stage": stage, "count": count, "p50_ms": round(float(p50), 2),
+                         "p95_ms": round(float(p95), 2), "mean_ms": round(total / count, 2) if count else 0.0})
+        return rows
+
+    def prometheus_text(self, upstream: dict = None) -> str:
+        lines = [
+            "# HELP daytrade_stage_seconds Hot-path stage latency (quantiles over the last samples).",
+            "# TYPE daytrade_stage_seconds summary",
+        ]
+        with self._lock:
+            items = [(key, list(s.window), s.total, s.count) for key, s in self._series.items()]
+        for (source, stage), window, total, count in sorted(items):
+            labels = f'source="{source}",stage="{stage}"'
+            if window:
+                for q, v in zip(QUANTILES, np.percentile(window, [q * 100 for q in QUANTILES])):
+                    lines.append(f'daytrade_stage_seconds{{{labels},quantile="{q}"}} {v / 1000:.6f}')
+            lines.append(f"daytrade_stage_seconds_sum{{{labels}}} {total / 1000:.6f}")
+            lines.append(f"daytrade_stage_seconds_count{{{labels}}} {count}")
+
+        lines += ["# HELP daytrade_cache_events_total Cache hits / misses / refreshes per cached function.",
+                  "# TYPE daytrade_cache_events_total counter"]
+        for cache, counts in sorted(self.cache_stats().items()):
+            for event, n in sorted(counts.items()):
+                if event not in ("entries", "inflight"):
+                    lines.append(f'daytrade_cache_events_total{{cache="{cache}",event="{event}"}} {n}')
+
+        if upstream:
+            provider = upstream.get("provider")
+            lines += ["# HELP daytrade_upstream_total Market-data provider counters since start.",
+                      "# TYPE daytrade_upstream_total counter"]
+            for key, value in upstream.items():
+                if isinstance(value, (int, float)):
+                    lines.append(f'daytrade_upstream_total{{provider="{provider}",field="{key}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+    # ---------- export ----------
+    def export(self, path: str = None):
+        from daytrade.providers import get_provider
+        path = path or self.prom_file
+        self._exported_at = time.monotonic()
+        if not path:
+            return None
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as fh:
+                fh.write(self.prometheus_text(get_provider().metrics()))
+            os.replace(tmp, path)   # scrapers never see a half-written file
+        except OSError:
+            log.exception("could not write %s", path)
+        return path
+
+    def _append_log(self, entry: dict):
+        if not self.log_file:
+            return
+        self._log_queue.put(json.dumps(entry, default=str) + "\n")
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_log, name="profile-log", daemon=True)
+                    self._writer.start()
+
+    def flush_log(self, timeout: float = None) -> bool:
+        """Wait until every line recorded so far is on disk."""
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._log_queue.put(done)
+        return done.wait(timeout)
+
+    def _write_log(self):
+        while True:
+            items = [self._log_queue.get()]
+            while True:
+                try:
+                    items.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = "".join(item for item in items if isinstance(item, str))
+            if lines:
+                try:
+                    if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > self.max_log_bytes:
+                        os.replace(self.log_file, self.log_file + ".1")
+                    with open(self.log_file, "a") as fh:
+                        fh.write(lines)
+                except OSError:
+                    log.exception("could not append to %s", self.log_file)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+REGISTRY = MetricsRegistry()
+
+
+class RerunProfile:
+    """Stage timings for one pass over the script (or one poll)."""
+
+    def __init__(self, source: str = "rerun", registry: MetricsRegistry = None):
+        self.source = source
+        self.registry = registry or REGISTRY
+        self.stages = {}
+        self._start = self._mark = time.perf_counter()
+
+    def lap(self, name: str) -> float:
+        """Time since the previous lap (or start) is charged to ``name``."""
+        now = time.perf_counter()
+        ms = (now - self._mark) * 1000
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+        self._mark = now
+        return ms
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def finish(self, **extra) -> dict:
+        self.stages["total"] = self.elapsed_ms
+        self.registry.record(self.source, self.stages, **extra)
+        return self.stages
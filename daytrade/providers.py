@@ -0,0 +1,287 @@
+"""Market-data providers: where bars and quotes come from.
+
+``fetch_batch`` (and through it the bar store, the poller, backtests and
+the CLI) asks the process-wide provider from ``get_provider()``. Every
+provider gets the same guard rails from the base class:
+
+* a token-bucket rate limit (calls per minute, with a small burst),
+* a hard timeout per request (a hung upstream call can't stall a poll, and
+  is left behind on its own daemon thread rather than tying up a pool),
+* request metrics: calls, symbols, rows, errors, timeouts, time spent.
+
+Failures never raise into the caller; they come back as empty frames and
+show up in ``metrics()``. Pick the provider with ``DAYTRADE_PROVIDER``::
+
+    DAYTRADE_PROVIDER=yahoo                  # default
+    DAYTRADE_PROVIDER=parquet:/data/bars     # local files, no network
+
+The Parquet stand-in reads ``<root>/<interval>/<SYMBOL>.parquet``; fill it
+with ``python -m daytrade provider record`` (from Yahoo) or
+``python -m daytrade provider synthetic`` (deterministic fake bars).
+"""
+import abc
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+import pandas as pd
+
+from daytrade.market_data import MARKET_TZ, last_change, split_batch, unique_symbols
+
+log = logging.getLogger(__name__)
+
+PROVIDER_SPEC = os.environ.get("DAYTRADE_PROVIDER", "yahoo")
+TIMEOUT_SECONDS = 20.0
+YAHOO_CALLS_PER_MINUTE = 60
+YAHOO_BURST = 10
+METRIC_FIELDS = ("calls", "symbols", "rows", "errors", "timeouts", "throttled_ms", "fetch_ms")
+
+
+def _call_with_timeout(fn, timeout: float, *args):
+    """``fn(*args)`` on a fresh daemon thread, raising ``FutureTimeout`` after ``timeout`` seconds.
+
+    A call that times out is abandoned, not joined: it finishes (or hangs) on
+    its own thread, so a few stuck upstream requests can never fill a shared
+    worker pool and starve every later fetch.
+    """
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="market-data", daemon=True).start()
+    return future.result(timeout=timeout)
+
+
+class RateLimiter:
+    """Token bucket: ``per_minute`` sustained, up to ``burst`` back to back."""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if the bucket is empty; returns seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            self._tokens -= 1          # may go negative: later callers queue up behind us
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class MarketDataProvider(abc.ABC):
+    """Base class: subclasses implement ``_fetch_bars``; callers use ``bars`` / ``quotes``."""
+
+    name = "base"
+
+    def __init__(self, calls_per_minute: float = None, burst: int = 1, timeout: float = TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._limiter = RateLimiter(calls_per_minute, burst) if calls_per_minute else None
+        self._metrics = dict.fromkeys(METRIC_FIELDS, 0)
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _fetch_bars(self, symbols: list, interval: str, period: str, start) -> dict:
+        """symbol -> raw OHLCV frame for whatever the upstream returned."""
+
+    def bars(self, symbols, interval: str = "15m", period: str = "5d", start=None) -> dict:
+        """symbol -> OHLCV frame (tz-aware ET index); empty frames for anything that failed."""
+        symbols = unique_symbols(symbols)
+        if not symbols:
+            return {}
+        waited = self._limiter.acquire() if self._limiter else 0.0
+        t0 = time.perf_counter()
+        error = timed_out = False
+        try:
+            frames = _call_with_timeout(self._fetch_bars, self.timeout, symbols, interval, period, start)
+        except FutureTimeout:
+            timed_out = True
+            frames = {}
+            self._last_error = f"timeout after {self.timeout:g}s ({interval}, {len(symbols)} symbols)"
+            log.warning("%s: %s", self.name, self._last_error)
+        except Exception as e:
+            error = True
+            frames = {}
+            self._last_error = f"{type(e).__name__}: {str(e)[:200]}"
+            log.warning("%s: %s", self.name, self._last_error)
+        frames = {sym: frames.get(sym, pd.DataFrame()) for sym in symbols}
+        with self._lock:
+            m = self._metrics
+            m["calls"] += 1
+            m["symbols"] += len(symbols)
+            m["rows"] += sum(len(df) for df in frames.values())
+            m["errors"] += int(error)
+            m["timeouts"] += int(timed_out)
+            m["throttled_ms"] += waited * 1000
+            m["fetch_ms"] += (time.perf_counter() - t0) * 1000
+        return frames
+
+    def quotes(self, symbols) -> dict:
+        """symbol -> (last price, % change vs previous close); symbols without data are left out."""
+        quotes = {}
+        for sym, df in self.bars(symbols, interval="1d", period="5d").items():
+            move = last_change(df)
+            if move:
+                quotes[sym] = (float(move[0]), float(move[1]))
+        return quotes
+
+    def metrics(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._metrics)
+        snapshot["provider"] = self.name
+        snapshot["last_error"] = self._last_error
+        return snapshot
+
+
+class YahooProvider(MarketDataProvider):
+    name = "yahoo"
+
+    def __init__(self, calls_per_minute: float = YAHOO_CALLS_PER_MINUTE, burst: int = YAHOO_BURST,
+                 timeout: float = TIMEOUT_SECONDS):
+        super().__init__(calls_per_minute, burst, timeout)
+
+    def _fetch_bars(self, symbols, interval, period, start) -> dict:
+        import yfinance as yf  # ~0.3s to import, only needed once we actually fetch
+        window = {"start": start} if start is not None else {"period": period}
+        raw = yf.download(
+            symbols,
+            **window,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            ignore_tz=False,
+            threads=True,
+            progress=False,
+            timeout=self.timeout,
+        )
+        return split_batch(raw, symbols)
+
+
+class ParquetProvider(MarketDataProvider):
+    """Local stand-in: one Parquet file per (interval, symbol), served like Yahoo would."""
+
+    name = "parquet"
+
+    def __init__(self, root: str, calls_per_minute: float = None, burst: int = 1,
+                 timeout: float = TIMEOUT_SECONDS):
+        super().__init__(calls_per_minute, burst, timeout)
+        self.root = root
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, symbol.replace("^", "_") + ".parquet")
+
+    def save(self, frames: dict, interval: str) -> int:
+        os.makedirs(os.path.join(self.root, interval), exist_ok=True)
+        saved = 0
+        for sym, df in frames.items():
+            if df is not None and not df.empty:
+                df.to_parquet(self.path(sym, interval))
+                saved += 1
+        return saved
+
+    def _fetch_bars(self, symbols, interval, period, start) -> dict:
+        from daytrade.bar_store import period_days
+        frames = {}
+        for sym in symbols:
+            path = self.path(sym, interval)
+            if not os.path.exists(path):
+                continue
+            df = pd.read_parquet(path)
+            if df.index.tz is not None:
+                df.index = df.index.tz_convert(MARKET_TZ)
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start)]
+            else:
+                sessions = df.index.normalize().unique()[-period_days(period):]
+                df = df[df.index.normalize() >= sessions[0]] if len(sessions) else df
+            frames[sym] = df
+        return frames
+
+
+def provider_from_spec(spec: str) -> MarketDataProvider:
+    kind, _, arg = spec.partition(":")
+    if kind == "yahoo":
+        return YahooProvider()
+    if kind == "parquet":
+        return ParquetProvider(arg or "market_data")
+    raise ValueError(f"unknown market data provider {spec!r} (expected 'yahoo' or 'parquet:<dir>')")
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = provider_from_spec(PROVIDER_SPEC)
+        return _provider
+
+
+def set_provider(provider: MarketDataProvider) -> MarketDataProvider:
+    """Swap the process-wide provider (stand-ins for benchmarks, replays, scripts); returns the old one."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
+
+
+def metrics_delta(before: dict, after: dict) -> dict:
+    """What happened between two ``metrics()`` snapshots (e.g. one poll)."""
+    delta = {k: round(after[k] - before.get(k, 0), 1) for k in METRIC_FIELDS}
+    delta["provider"] = after.get("provider")
+    return delta
+
+
+# ---------- CLI ----------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade provider",
+                                     description="Fill a Parquet directory for DAYTRADE_PROVIDER=parquet:<dir>")
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="download bars from Yahoo into the directory")
+    record.add_argument("--tickers", nargs="+", required=True)
+    record.add_argument("--interval", nargs="+", default=["15m", "1d"])
+    record.add_argument("--period", default="60d")
+    record.add_argument("--dir", default="market_data")
+    synthetic = sub.add_parser("synthetic", help="write deterministic synthetic bars (no network)")
+    synthetic.add_argument("--tickers", nargs="+", required=True)
+    synthetic.add_argument("--days", type=int, default=60)
+    synthetic.add_argument("--seed", type=int, default=0)
+    synthetic.add_argument("--dir", default="market_data")
+    args = parser.parse_args(argv)
+
+    target = ParquetProvider(args.dir)
+    if args.command == "record":
+        source = YahooProvider()
+        for interval in args.interval:
+            saved = target.save(source.bars(args.tickers, interval=interval, period=args.period), interval)
+            print(f"{interval}: {saved}/{len(args.tickers)} symbols -> {os.path.join(args.dir, interval)}")
+        print(source.metrics())
+    else:
+        from daytrade.synthetic import synthetic_bars
+        for interval in ("15m", "1d"):
+            frames = {sym: synthetic_bars(sym, args.days, args.seed, interval=interval) for sym in args.tickers}
+            saved = target.save(frames, interval)
+            print(f"{interval}: {saved} symbols -> {os.path.join(args.dir, interval)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Images and charts that used to be built inline in app.py.
+
+Matplotlib and Plotly are imported inside the functions so importing this
+module (or the headless scanner) stays cheap.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from daytrade.profiling import REGISTRY
+
+SNAPSHOT_DPI = 220
+MAX_IMAGE_ROWS = 100        # strongest first, so the cut-off rows are the Sit Outs
+MAX_IMAGE_PIXELS = 9000     # width + height, under Telegram's 10,000 px photo limit
+SNAPSHOT_CACHE_SIZE = 32
+PNG_COMPRESSION = 1         # zlib level: flat table colors compress fine, level 6 took most of the render
+MONO_FONT = "DejaVu Sans Mono"   # ships with Matplotlib; fixed width keeps the columns lined up
+MAX_CHART_BARS = 500        # longer histories are merged into coarser candles before they go to the browser
+CHART_CACHE_SIZE = 8        # figures kept per session (one per ticker whose plan was opened)
+_EMOJI = re.compile("[\U0001F300-\U0001FAFF\u2600-\u27BF]")   # no emoji glyphs in DejaVu; the row color says it
+
+
+def signal_color(signal: str) -> str:
+    if "Strong Buy" in signal:
+        return '#15803d'      # dark green
+    elif "Caution Buy" in signal:
+        return '#f59e0b'      # orange — clear “caution” signal
+    elif "Buy" in signal:
+        return '#16a34a'      # green
+    elif "Watch" in signal:
+        return '#f59e0b'
+    return '#b91c1c'          # red (Sit Out)
+
+
+def table_digest(df_table: pd.DataFrame, regime: str, dpi: int) -> str:
+    """Cache key for a snapshot image: table cells + headers + regime + resolution."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df_table.astype(str), index=False).to_numpy().tobytes())
+    digest.update(repr((list(map(str, df_table.columns)), regime, dpi)).encode())
+    return digest.hexdigest()
+
+
+def signals_image(df_table: pd.DataFrame, regime: str, now: datetime = None, dpi: int = SNAPSHOT_DPI,
+                  figure=None) -> BytesIO:
+    """Telegram-friendly PNG of the signal table (no Chrome needed).
+
+    Pass ``figure`` to draw into a reused ``matplotlib.figure.Figure``.
+    No pyplot, so it's safe off the main thread.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import PolyCollection
+    from matplotlib.figure import Figure
+
+    now = now or datetime.now(ZoneInfo("America/New_York"))
+    hidden = max(0, len(df_table) - MAX_IMAGE_ROWS)
+    df_table = df_table.head(MAX_IMAGE_ROWS)
+    width, height = 11, len(df_table) * 0.65 + 2
+    # Telegram rejects photos whose width + height exceed 10,000 px: long tables get a lower dpi instead
+    dpi = min(dpi, MAX_IMAGE_PIXELS / (width + height))
+
+    fig = figure if figure is not None else Figure()
+    fig.clear()
+    fig.set_size_inches(width, height)
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    header = 1.6 / height
+    ax = fig.add_axes([0.01, 0.01, 0.98, 1 - header - 0.01])
+    ax.axis('off')
+
+    # A few artists for the whole table instead of a patch + text per cell (the old ax.table
+    # spent ~3 ms a cell): one polygon collection for the row colors, one line collection, one mono text per row
+    rows = len(df_table) + 1
+    colors = ['#1e3a8a'] + [signal_color(str(signal)) for signal in df_table.iloc[:, 0]]
+    ax.add_collection(PolyCollection([[(0, i), (1, i), (1, i + 1), (0, i + 1)] for i in range(rows)],
+                                     facecolors=colors, edgecolors='none'))
+    ax.hlines(range(1, rows), 0, 1, colors='white', linewidth=1.5)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(rows, 0)
+
+    cells = [[str(c) for c in df_table.columns]] + [
+        [_EMOJI.sub('', str(v)).strip() for v in row] for row in df_table.itertuples(index=False)
+    ]
+    widths = [max(len(row[j]) for row in cells) + 2 for j in range(len(df_table.columns))]
+    # Mono glyphs are ~0.6 em wide: the biggest font (up to 15pt) that fits, extra room spread over the columns
+    fontsize = min(15, 72 * width * 0.94 / (0.6 * sum(widths)))
+    room = int(72 * width * 0.94 / (0.6 * fontsize)) - sum(widths)
+    widths = [w + room * w // sum(widths) for w in widths]
+    for i, row in enumerate(cells):
+        ax.text(0.5, i + 0.5, "".join(v.center(w) for v, w in zip(row, widths)), ha='center', va='center',
+                family=MONO_FONT, fontsize=fontsize, color='white', weight='bold' if i == 0 else 'normal')
+
+    fig.text(0.5, 1 - 0.35 / height, f"{_EMOJI.sub('', regime).strip()}\n{now.strftime('%A, %B %d %Y — %H:%M ET')}",
+             ha='center', va='top', fontsize=12)
+    fig.text(0.5, 1 - 1.15 / height, "Day Trade Monitor — Live Signals Snapshot",
+             ha='center', va='top', fontsize=18, color='#1e3a8a')
+    if hidden:
+        fig.text(0.99, 0.002, f"+{hidden} more rows not shown", ha='right', va='bottom', fontsize=9, color='#64748b')
+
+    img_bytes = BytesIO()
+    fig.savefig(img_bytes, format='png', dpi=dpi, facecolor='white', pil_kwargs={'compress_level': PNG_COMPRESSION})
+    img_bytes.seek(0)
+    return img_bytes
+
+
+class SnapshotRenderer:
+    """Renders signal-table PNGs on one background thread, cached by table contents + regime + dpi.
+
+    ``submit`` returns a Future of PNG bytes straight away: an unchanged
+    table hands back the finished (or still running) render, so repeat
+    sends cost a hash. The worker reuses one Figure, and Matplotlib's font
+    cache stays warm in that thread.
+    """
+
+    def __init__(self, cache_size: int = SNAPSHOT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshot-render")
+        self._cache = OrderedDict()      # digest -> Future of PNG bytes
+        self._lock = threading.Lock()
+        self._figure = None
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, df_table: pd.DataFrame, regime: str, dpi: int = SNAPSHOT_DPI) -> Future:
+        key = table_digest(df_table, regime, dpi)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._cache[key] = self._executor.submit(self._render, df_table.copy(), regime, dpi)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return future
+
+    def render(self, df_table: pd.DataFrame, regime: str, dpi: int = SNAPSHOT_DPI, timeout: float = None) -> bytes:
+        return self.submit(df_table, regime, dpi).result(timeout=timeout)
+
+    def _render(self, df_table: pd.DataFrame, regime: str, dpi: int) -> bytes:
+        from matplotlib.figure import Figure
+
+        if self._figure is None:
+            self._figure = Figure()
+        started = time.perf_counter()
+        png = signals_image(df_table, regime, dpi=dpi, figure=self._figure).getvalue()
+        REGISTRY.observe("render", "signals_image", (time.perf_counter() - started) * 1000)
+        return png
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache),
+                    "inflight": sum(not f.done() for f in self._cache.values())}
+
+
+def downsample_bars(hist: pd.DataFrame, max_bars: int = MAX_CHART_BARS) -> pd.DataFrame:
+    """Merge runs of consecutive bars into at most ``max_bars`` candles (OHLC kept, indicators at the run's close).
+
+    Runs are aligned on the last bar, so the newest candle is always the
+    live one; anything already short enough comes back untouched.
+    """
+    n = len(hist)
+    if n <= max_bars:
+        return hist
+    step = -(-n // max_bars)
+    starts = np.arange((n - 1) % step + 1 - step, n, step).clip(min=0)
+    ends = np.append(starts[1:], n) - 1
+    out = hist.iloc[ends].copy()
+    out['Open'] = hist['Open'].to_numpy()[starts]
+    out['High'] = np.maximum.reduceat(hist['High'].to_numpy(), starts)
+    out['Low'] = np.minimum.reduceat(hist['Low'].to_numpy(), starts)
+    return out
+
+
+def chart_key(hist: pd.DataFrame) -> tuple:
+    """Changes when a bar is added / dropped or the forming bar moves."""
+    if hist.empty:
+        return (0,)
+    return (len(hist), hist.index[0], hist.index[-1], hist.iloc[-1].to_numpy().tobytes())
+
+
+def price_chart(tick: str, hist: pd.DataFrame):
+    """Candles + EMA9 over a MACD panel; ``hist`` must already carry the indicator columns.
+
+    The x axis is the bar number (dates are tick labels and hover text), so
+    overnight and weekend gaps vanish without rangebreaks and the line
+    traces can be WebGL. Long histories are merged down to MAX_CHART_BARS.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Create clean subplot chart
+    fig = make_subplots(
+        rows=2, cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.03,
+        row_heights=[0.70, 0.30],
+        subplot_titles=(f"{tick} Price + EMA9", "MACD Histogram")
+    )
+
+    # Candlestick
+    fig.add_trace(go.Candlestick(name="Price", hoverinfo="y+text"), row=1, col=1)
+
+    # EMA9 line
+    fig.add_trace(
+        go.Scattergl(line=dict(color="#FFD700", width=2), name="EMA9", hovertemplate="EMA9 %{y:.2f}<extra></extra>"),
+        row=1, col=1
+    )
+
+    # MACD Histogram (green/red bars): a two-step colorscale on the values instead of a color string per bar
+    fig.add_trace(
+        go.Bar(
+            marker=dict(colorscale=[[0, '#ff0000'], [0.5, '#ff0000'], [0.5, '#00cc00'], [1, '#00cc00']], cmid=0),
+            name="MACD Histogram",
+            hovertemplate="Hist %{y:.3f}<extra></extra>"
+        ),
+        row=2, col=1
+    )
+
+    # MACD lines (optional thin lines)
+    fig.add_trace(
+        go.Scattergl(line=dict(color="#00ccff", width=1), name="MACD Line", hovertemplate="MACD %{y:.3f}<extra></extra>"),
+        row=2, col=1
+    )
+    fig.add_trace(
+        go.Scattergl(line=dict(color="#ff00ff", width=1), name="Signal Line",
+                     hovertemplate="Signal %{y:.3f}<extra></extra>"),
+        row=2, col=1
+    )
+
+    # Layout polish
+    fig.update_layout(
+        height=680,
+        template="plotly_dark",
+        showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02),
+        xaxis_rangeslider_visible=False,
+        uirevision=tick,      # keep the user's zoom when the bars update
+    )
+    update_price_chart(fig, hist)
+    return fig
+
+
+def update_price_chart(fig, hist: pd.DataFrame):
+    """Write ``hist`` into a figure from ``price_chart``: trace arrays and date ticks only, no rebuild."""
+    hist = downsample_bars(hist)
+    x = np.arange(len(hist), dtype=np.int32)
+    col = {c: hist[c].to_numpy(dtype=np.float32) for c in ('Open', 'High', 'Low', 'Close', 'EMA9', 'MACD', 'Signal',
+                                                          'MACD Hist')}
+    index = hist.index
+    sessions = np.flatnonzero(np.r_[True, index.normalize()[1:] != index.normalize()[:-1]]) if len(index) else x
+    candle, ema, macd_hist, macd_line, signal_line = fig.data
+    with fig.batch_update():
+        candle.update(x=x, open=col['Open'], high=col['High'], low=col['Low'], close=col['Close'],
+                      hovertext=index.strftime('%a %b %d %H:%M'))
+        ema.update(x=x, y=col['EMA9'])
+        macd_hist.update(x=x, y=col['MACD Hist'], marker_color=col['MACD Hist'])
+        macd_line.update(x=x, y=col['MACD'])
+        signal_line.update(x=x, y=col['Signal'])
+        # x axes are shared: the bottom one carries the date labels
+        fig.layout.xaxis2.update(tickmode='array', tickvals=sessions, ticktext=index[sessions].strftime('%a %b %d'))
+    return fig
+
+
+class PriceCharts:
+    """Plotly figures per ticker, kept between reruns and updated in place.
+
+    A rerun with the same bars gets the same figure back; a new (or still
+    forming) bar only rewrites the trace arrays of the cached figure instead
+    of building the subplots, traces and layout again. Figures are mutated,
+    so keep one of these per session rather than sharing it.
+    """
+
+    def __init__(self, size: int = CHART_CACHE_SIZE):
+        self.size = size
+        self._figures = OrderedDict()      # ticker -> (chart_key, figure)
+
+    def figure(self, tick: str, hist: pd.DataFrame):
+        key = chart_key(hist)
+        cached = self._figures.get(tick)
+        if cached is not None and cached[0] == key:
+            event, fig = "hits", cached[1]
+        elif cached is not None:
+            event, fig = "updates", update_price_chart(cached[1], hist)
+        else:
+            event, fig = "misses", price_chart(tick, hist)
+        REGISTRY.cache_event("price_chart", event)
+        self._figures[tick] = (key, fig)
+        self._figures.move_to_end(tick)
+        while len(self._figures) > self.size:
+            self._figures.popitem(last=False)
+        return fig
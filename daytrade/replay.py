@@ -0,0 +1,379 @@
+"""Deterministic market replay through the full signal pipeline.
+
+A ``SimClock`` stands in for ``datetime.now`` and a ``ReplaySource``
+stands in for Yahoo, so ``MarketPoller.poll_once`` (gates, labels,
+regime), the alert path and the signal journal all run exactly as live,
+only against recorded bars and at whatever speed you ask for::
+
+    python -m daytrade replay --date 2025-06-02                  # last recorded morning, max speed
+    python -m daytrade replay --date 2025-06-02 --speed 100      # 100x real time
+    python -m daytrade replay --synthetic 50 --days 3 --json     # offline load test, 50 tickers
+
+The same bars + the same clock always give the same labels, transitions
+and alerts. A 15m bar becomes visible once the clock reaches its start
+time, carrying its final OHLCV (Yahoo shows the forming bar; the replay
+can't know the intra-bar path). Daily bars for the watchlist are rebuilt
+from the visible 15m bars, so there's no look-ahead on today's close.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from daytrade.alerts import AlertDedupeStore, AlertDispatcher, alert_rows, signal_alert
+from daytrade.market_calendar import REGULAR_CLOSE, REGULAR_OPEN, session
+from daytrade.market_data import BENCHMARK, MARKET_TZ
+from daytrade.poller import MarketPoller
+from daytrade.profiling import MetricsRegistry
+
+SESSION_START = REGULAR_OPEN
+SESSION_END = REGULAR_CLOSE
+SESSIONS = 5            # same lookback the live poller loads
+REPLAY_JOURNAL_DIR = "replay_journal"
+
+
+class SimClock:
+    """Callable clock for ``MarketPoller(clock=...)``; only moves when told to."""
+
+    def __init__(self, start: datetime):
+        self.now = pd.Timestamp(start).tz_convert(MARKET_TZ).to_pydatetime()
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def set(self, when: datetime):
+        self.now = pd.Timestamp(when).tz_convert(MARKET_TZ).to_pydatetime()
+
+    def advance(self, seconds: float):
+        self.now += timedelta(seconds=seconds)
+
+
+class _Recording:
+    """One symbol's recorded 15m bars with session boundaries precomputed."""
+
+    def __init__(self, bars: pd.DataFrame):
+        self.bars = bars.sort_index()
+        days = self.bars.index.normalize()
+        self.session_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        self.sessions = days[self.session_starts]
+        grouped = self.bars.groupby(days)
+        self.daily = pd.DataFrame({
+            "Open": grouped["Open"].first(), "High": grouped["High"].max(), "Low": grouped["Low"].min(),
+            "Close": grouped["Close"].last(), "Volume": grouped["Volume"].sum(),
+        })
+
+    def visible(self, now: pd.Timestamp, sessions: int) -> pd.DataFrame:
+        pos = int(self.bars.index.searchsorted(now, side="right"))
+        if pos == 0:
+            return self.bars.iloc[:0]
+        last = int(np.searchsorted(self.session_starts, pos - 1, side="right")) - 1
+        first = self.session_starts[max(0, last - sessions + 1)]
+        return self.bars.iloc[first:pos]
+
+
+class ReplaySource:
+    """Data source for ``MarketPoller(source=...)`` that serves recorded bars as of ``clock()``."""
+
+    def __init__(self, intraday: dict, clock, daily: dict = None, sessions: int = SESSIONS):
+        self.clock = clock
+        self.sessions = sessions
+        self._intraday = {s: _Recording(f) for s, f in intraday.items() if f is not None and not f.empty}
+        self._daily = {s: f.sort_index() for s, f in (daily or {}).items() if f is not None and not f.empty}
+
+    def intraday(self, symbols) -> dict:
+        now = pd.Timestamp(self.clock())
+        frames = {}
+        for symbol in symbols:
+            rec = self._intraday.get(symbol)
+            if rec is not None:
+                view = rec.visible(now, self.sessions)
+                if not view.empty:
+                    frames[symbol] = view
+        return frames
+
+    def daily(self, symbols) -> dict:
+        now = pd.Timestamp(self.clock())
+        today = now.normalize()
+        frames = {}
+        for symbol in symbols:
+            rec = self._intraday.get(symbol)
+            if rec is not None:
+                # Finished sessions from the recording + today's bar so far
+                done = rec.daily[rec.daily.index < today].tail(self.sessions - 1)
+                bars_today = rec.visible(now, 1)
+                bars_today = bars_today[bars_today.index.normalize() == today]
+                if not bars_today.empty:
+                    partial = pd.DataFrame({
+                        "Open": [bars_today["Open"].iloc[0]], "High": [bars_today["High"].max()],
+                        "Low": [bars_today["Low"].min()], "Close": [bars_today["Close"].iloc[-1]],
+                        "Volume": [bars_today["Volume"].sum()],
+                    }, index=pd.DatetimeIndex([today]))
+                    done = pd.concat([done, partial])
+                if not done.empty:
+                    frames[symbol] = done
+                continue
+            recorded = self._daily.get(symbol)
+            if recorded is not None:
+                # Daily-only symbols (VIX, indices): today's row only once the session is over
+                cutoff = today + pd.Timedelta(days=1) if now.time() >= SESSION_END else today
+                frame = recorded[recorded.index < cutoff].tail(self.sessions)
+                if not frame.empty:
+                    frames[symbol] = frame
+        return frames
+
+    def session_days(self) -> list:
+        days = set()
+        for rec in self._intraday.values():
+            days.update(rec.sessions)
+        return sorted(days)
+
+
+class RecordingBot:
+    """TeleBot stand-in for dry runs: remembers what would have been sent, and when."""
+
+    def __init__(self, token: str = "dry-run"):
+        self.token = token
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send_message(self, chat_id, text, **kwargs):
+        with self._lock:
+            self.sent.append((time.perf_counter(), str(chat_id), text))
+
+    def send_photo(self, chat_id, photo, caption=None, **kwargs):
+        with self._lock:
+            self.sent.append((time.perf_counter(), str(chat_id), caption or "<photo>"))
+
+
+def _percentiles(samples_ms) -> dict:
+    if not samples_ms:
+        return {"n": 0}
+    arr = np.asarray(samples_ms)
+    return {
+        "n": len(arr),
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "max_ms": round(float(arr.max()), 3),
+        "mean_ms": round(float(arr.mean()), 3),
+    }
+
+
+def replay_steps(days, poll_seconds: float = 60, start: dt_time = SESSION_START, end: dt_time = SESSION_END):
+    """Simulated poll times: every ``poll_seconds`` from ``start`` to ``end`` ET on each session day.
+
+    Half days stop at their 1:00 PM close.
+    """
+    for day in days:
+        day = pd.Timestamp(day)
+        day = day.tz_localize(MARKET_TZ) if day.tzinfo is None else day.tz_convert(MARKET_TZ)
+        day = day.normalize()
+        t = day + pd.Timedelta(hours=start.hour, minutes=start.minute)
+        stop = day + pd.Timedelta(hours=end.hour, minutes=end.minute)
+        hours = session(day.date())
+        if hours is not None and hours.early_close:
+            stop = min(stop, pd.Timestamp(hours.close))
+        while t <= stop:
+            yield t.to_pydatetime()
+            t += pd.Timedelta(seconds=poll_seconds)
+
+
+def run_replay(intraday: dict, tickers, days, daily: dict = None, mode: str = "balanced",
+               speed: float = None, poll_seconds: float = 60, start: dt_time = SESSION_START,
+               end: dt_time = SESSION_END, dispatcher: AlertDispatcher = None, bot: RecordingBot = None,
+               token: str = "dry-run", chat_id: str = "replay", journal=None, on_transition=None) -> dict:
+    """Replay ``days`` through a fresh ``MarketPoller``; returns a summary (labels are deterministic).
+
+    ``speed`` is a multiple of real time (100 -> a 60s poll every 0.6s); ``None`` runs flat out.
+    Pass the ``RecordingBot`` behind ``dispatcher`` as ``bot`` to get alert delivery latency.
+    """
+    steps = list(replay_steps(days, poll_seconds, start, end))
+    if not steps:
+        raise ValueError("nothing to replay: no session days in range")
+    clock = SimClock(steps[0])
+    source = ReplaySource(intraday, clock, daily)
+    metrics = MetricsRegistry(prom_file=None, log_file=None)   # keep replays out of the live exports
+    poller = MarketPoller(None, tickers, poll_seconds=poll_seconds, journal=journal, source=source, clock=clock,
+                          metrics=metrics)
+
+    labels, transitions = {}, []
+    last_bar = {}
+    step_ms, bar_ms = [], []
+    submitted = {}
+    alerts_queued = 0
+    wall_start = time.perf_counter()
+
+    for i, when in enumerate(steps):
+        clock.set(when)
+        t0 = time.perf_counter()
+        snapshot = poller.poll_once()
+        rows = snapshot.rows(mode, tickers)
+        due = alert_rows(rows, when.time())
+        if dispatcher is not None and due:
+            queued = dispatcher.submit_alerts([signal_alert(token, chat_id, sig) for sig in due])
+            alerts_queued += len(queued)
+            for alert in queued:
+                submitted[alert.text] = time.perf_counter()
+        elapsed = (time.perf_counter() - t0) * 1000
+        step_ms.append(elapsed)
+
+        for sig in rows:
+            tick, label, bar_ts = sig.ticker, sig.label, sig.bar_ts
+            if last_bar.get(tick) != bar_ts:
+                last_bar[tick] = bar_ts
+                bar_ms.append(elapsed)      # bar visible -> signal published (+ alerts queued)
+            if labels.get(tick) != label:
+                event = {"at": when.isoformat(), "ticker": tick, "from": labels.get(tick), "to": label,
+                         "strength": sig.strength, "price": round(sig.price, 2),
+                         "chg_pct": round(sig.chg_from_open, 1)}
+                transitions.append(event)
+                labels[tick] = label
+                if on_transition:
+                    on_transition(event, snapshot)
+
+        if speed:
+            target = wall_start + (i + 1) * poll_seconds / speed
+            pause = target - time.perf_counter()
+            if pause > 0:
+                time.sleep(pause)
+
+    delivery_ms = []
+    if dispatcher is not None:
+        dispatcher.flush(timeout=60)
+    if bot is not None:
+        for sent_at, _, text in bot.sent:
+            for line in text.split("\n"):   # alerts for one chat go out batched, one per line
+                if line in submitted:
+                    delivery_ms.append((sent_at - submitted.pop(line)) * 1000)
+    if journal is not None:
+        journal.flush()
+
+    wall = time.perf_counter() - wall_start
+    simulated = (steps[-1] - steps[0]).total_seconds() + poll_seconds
+    return {
+        "mode": mode,
+        "tickers": list(tickers),
+        "days": [pd.Timestamp(d).strftime("%Y-%m-%d") for d in days],
+        "steps": len(steps),
+        "sim_start": steps[0].isoformat(),
+        "sim_end": steps[-1].isoformat(),
+        "wall_seconds": round(wall, 3),
+        "speedup": round(simulated / wall, 1) if wall else None,
+        "transitions": transitions,
+        "final_labels": labels,
+        "regime": snapshot.regime,
+        "alerts_queued": alerts_queued,
+        "step_latency": _percentiles(step_ms),
+        "bar_to_signal_latency": _percentiles(bar_ms),
+        "alert_delivery_latency": _percentiles(delivery_ms),
+        "poll_stages": {row["stage"]: row for row in metrics.summary("poll")},
+    }
+
+
+# ---------- CLI ----------
+def load_recording(args) -> tuple:
+    """(intraday frames, daily frames, tickers) from the local bar store or the synthetic generator."""
+    if args.synthetic:
+        from daytrade.synthetic import DEFAULT_END, synthetic_bars, synthetic_symbols
+        tickers = args.tickers or synthetic_symbols(args.synthetic)
+        frames = {s: synthetic_bars(s, args.days + SESSIONS, args.seed, end=args.date or DEFAULT_END)
+                  for s in dict.fromkeys(tickers + [BENCHMARK])}
+        return frames, {}, tickers
+
+    from daytrade.bar_store import BarStore
+    tickers = args.tickers or ["SOXL", "TQQQ", "TECL", "FNGU", "NVDL", "TSLL", "SPXL", "QLD", "UPRO"]
+    store = BarStore(args.bar_db) if args.bar_db else BarStore()
+    frames = {}
+    for symbol in dict.fromkeys(tickers + [BENCHMARK]):
+        bars = store.load(symbol, "15m")
+        if bars is not None and not bars.empty:
+            frames[symbol] = bars
+    if not frames:
+        raise SystemExit("no recorded 15m bars in the bar store; run the app or `python -m daytrade scan` first,"
+                         " or use --synthetic N")
+    return frames, {}, tickers
+
+
+def pick_days(all_days, date: str, count: int) -> list:
+    if not all_days:
+        return []
+    if date:
+        target = pd.Timestamp(date).tz_localize(all_days[0].tz) if all_days[0].tz else pd.Timestamp(date)
+        upto = [d for d in all_days if d <= target]
+    else:
+        upto = list(all_days)
+    return upto[-count:]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade replay", description=__doc__.split("\n")[0])
+    parser.add_argument("--date", help="last session to replay (default: the latest recorded one)")
+    parser.add_argument("--days", type=int, default=1, help="number of sessions to replay, ending at --date")
+    parser.add_argument("--tickers", nargs="+")
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--speed", type=float, default=None, help="multiple of real time (default: as fast as possible)")
+    parser.add_argument("--poll-seconds", type=float, default=60)
+    parser.add_argument("--from", dest="start", default="09:30", help="ET time each session starts (HH:MM)")
+    parser.add_argument("--to", dest="end", default="16:00", help="ET time each session ends (HH:MM)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="replay N synthetic tickers instead of the bar store")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bar-db", help="bar store to replay from (default: DAYTRADE_BAR_DB / market_bars.db)")
+    parser.add_argument("--alerts", choices=["dry", "off"], default="dry",
+                        help="dry: run the real dispatcher against a recording bot (default)")
+    parser.add_argument("--journal", default=REPLAY_JOURNAL_DIR, help="journal directory ('' to disable)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    intraday, daily, tickers = load_recording(args)
+    source_days = ReplaySource(intraday, clock=None).session_days()
+    days = pick_days(source_days, args.date, args.days)
+    if not days:
+        raise SystemExit("no recorded session on or before --date")
+    mode = "strict" if args.strict else "balanced"
+
+    journal = None
+    if args.journal:
+        from daytrade.journal import SignalJournal
+        journal = SignalJournal(args.journal)
+
+    with tempfile.TemporaryDirectory(prefix="daytrade-replay-") as tmp:
+        dispatcher = bot = None
+        if args.alerts == "dry":
+            # Fresh dedupe DB per run so a replay never suppresses (or is suppressed by) live alerts
+            bot = RecordingBot()
+            dispatcher = AlertDispatcher(AlertDedupeStore(f"{tmp}/alerts.db"), bot_factory=lambda token: bot).start()
+
+        def show(event, snapshot):
+            if not args.json:
+                print(f"{event['at'][:16]}  {event['ticker']:<6} {str(event['from']):<12} -> {event['to']:<12}"
+                      f" {event['strength']}/9  ${event['price']:,.2f}  {event['chg_pct']:+.1f}%", flush=True)
+
+        summary = run_replay(
+            intraday, tickers, days, daily, mode=mode, speed=args.speed, poll_seconds=args.poll_seconds,
+            start=dt_time.fromisoformat(args.start), end=dt_time.fromisoformat(args.end),
+            dispatcher=dispatcher, bot=bot, journal=journal, on_transition=show,
+        )
+
+    if args.json:
+        print(json.dumps(summary, indent=2, default=str))
+    else:
+        print(f"\n{summary['steps']} polls over {', '.join(summary['days'])} in {summary['wall_seconds']}s"
+              f" ({summary['speedup']}x real time), {len(summary['transitions'])} label changes,"
+              f" {summary['alerts_queued']} alerts")
+        for name in ("step_latency", "bar_to_signal_latency", "alert_delivery_latency"):
+            stats = summary[name]
+            if stats["n"]:
+                print(f"  {name:<24} p50 {stats['p50_ms']:>8.2f} ms   p95 {stats['p95_ms']:>8.2f} ms"
+                      f"   max {stats['max_ms']:>8.2f} ms   (n={stats['n']})")
+        for stage, stats in summary["poll_stages"].items():
+            print(f"  poll:{stage:<19} p50 {stats['p50_ms']:>8.2f} ms   p95 {stats['p95_ms']:>8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
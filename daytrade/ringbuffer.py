@@ -0,0 +1,259 @@
+"""Fixed-capacity, array-backed bar buffers.
+
+The poller keeps one ``BarRing`` per (symbol, interval): int64 timestamps
+plus a float32 OHLCV block, written in place as bars arrive (the forming
+bar is rewritten, the oldest bar is overwritten once the ring is full).
+Every poll hands the snapshot an immutable ``Bars`` view, so a snapshot
+of a few hundred symbols is a few MB of NumPy instead of a DataFrame with
+a tz-aware index per symbol. Unchanged rings hand out the same view, so
+consecutive snapshots share it.
+
+pandas only comes back at the edges: ``Bars.to_frame()`` for the chart and
+exports, ``Bars.from_frame()`` for whatever the store / provider returns.
+"""
+import numpy as np
+import pandas as pd
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+CAPACITY = {"15m": 130, "1d": 10}    # five regular 15m sessions (what the gates and chart use), two weeks of dailies
+DEFAULT_CAPACITY = 256
+INITIAL_ROWS = 64
+
+
+def bar_index(ts: np.ndarray, tz) -> pd.DatetimeIndex:
+    if tz is None:
+        return pd.DatetimeIndex(ts.astype("datetime64[ns]"))
+    return pd.DatetimeIndex(ts.astype("datetime64[ns]")).tz_localize("UTC").tz_convert(tz)
+
+
+class RingBuffer:
+    """Up to ``capacity`` rows of float32 columns keyed by int64 timestamps; the oldest row goes first.
+
+    Storage starts at ``INITIAL_ROWS`` and doubles until it reaches
+    ``capacity``, so a stream that has only seen a few sessions doesn't pay
+    for months of bars up front.
+    """
+    __slots__ = ("columns", "capacity", "ts", "values", "_start", "_size")
+
+    def __init__(self, capacity: int, columns):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        rows = min(capacity, INITIAL_ROWS)
+        self.ts = np.zeros(rows, dtype=np.int64)
+        self.values = np.zeros((rows, len(self.columns)), dtype=np.float32)
+        self._start = 0
+        self._size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.ts.nbytes + self.values.nbytes
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _pos(self, i: int) -> int:
+        return (self._start + i) % len(self.ts)
+
+    @property
+    def last_ts(self):
+        return int(self.ts[self._pos(self._size - 1)]) if self._size else None
+
+    def last_row(self) -> np.ndarray:
+        return self.values[self._pos(self._size - 1)]
+
+    def clear(self):
+        self._start = self._size = 0
+
+    def _reserve(self, rows: int):
+        allocated = len(self.ts)
+        if rows <= allocated or allocated == self.capacity:
+            return
+        grown = min(self.capacity, max(rows, allocated * 2))
+        ts, values = self.arrays()
+        self.ts = np.zeros(grown, dtype=np.int64)
+        self.values = np.zeros((grown, len(self.columns)), dtype=np.float32)
+        self.ts[:len(ts)], self.values[:len(values)] = ts, values
+        self._start = 0
+
+    def append(self, ts: int, row):
+        self._reserve(self._size + 1)
+        if self._size < len(self.ts):
+            pos = self._pos(self._size)
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = self._pos(1)
+        self.ts[pos] = ts
+        self.values[pos] = row
+
+    def extend(self, ts: np.ndarray, values: np.ndarray):
+        """Append many rows in one go (only the newest ``capacity`` survive)."""
+        n, cap = len(ts), self.capacity
+        if n == 0:
+            return
+        if n >= cap:
+            self.ts = np.array(ts[-cap:], dtype=np.int64)
+            self.values = np.array(values[-cap:], dtype=np.float32)
+            self._start, self._size = 0, cap
+            return
+        self._reserve(self._size + n)
+        allocated = len(self.ts)
+        pos = (self._start + self._size + np.arange(n)) % allocated
+        self.ts[pos], self.values[pos] = ts, values
+        overflow = max(0, self._size + n - allocated)
+        self._size = min(allocated, self._size + n)
+        self._start = (self._start + overflow) % allocated
+
+    def replace_last(self, row):
+        self.values[self._pos(self._size - 1)] = row
+
+    def arrays(self):
+        """(timestamps, values) copies, oldest first."""
+        order = (self._start + np.arange(self._size)) % len(self.ts)
+        return self.ts[order], self.values[order]
+
+    def copy(self) -> "RingBuffer":
+        clone = RingBuffer.__new__(RingBuffer)
+        clone.columns, clone.capacity = self.columns, self.capacity
+        clone._start, clone._size = self._start, self._size
+        clone.ts, clone.values = self.ts.copy(), self.values.copy()
+        return clone
+
+
+class Bars:
+    """Read-only OHLCV bars for one symbol, oldest first (what a snapshot holds)."""
+    __slots__ = ("ts", "values", "tz")
+
+    def __init__(self, ts: np.ndarray, values: np.ndarray, tz=None):
+        ts.setflags(write=False)
+        values.setflags(write=False)
+        self.ts = ts            # int64 ns since the epoch (UTC; wall time for naive frames)
+        self.values = values    # float32, one column per FIELDS entry
+        self.tz = tz
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls(np.zeros(0, dtype=np.int64), np.zeros((0, len(FIELDS)), dtype=np.float32))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "Bars":
+        if df is None or len(df) == 0:
+            return cls.empty()
+        index = pd.DatetimeIndex(df.index)
+        n = len(df)
+        values = np.column_stack([
+            df[c].to_numpy(dtype=np.float32) if c in df.columns else np.full(n, np.nan, dtype=np.float32)
+            for c in FIELDS
+        ])
+        return cls(index.as_unit("ns").asi8.copy(), values, index.tz)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.values[:, 3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.values[:, 4]
+
+    @property
+    def nbytes(self) -> int:
+        return self.ts.nbytes + self.values.nbytes
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return bar_index(self.ts, self.tz)
+
+    def timestamp(self, i: int = -1) -> pd.Timestamp:
+        ts = pd.Timestamp(int(self.ts[i]))
+        return ts.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else ts
+
+    def session_start(self) -> int:
+        """Position of the first bar of the latest session (same calendar day as the last bar)."""
+        day = self.timestamp(-1).normalize()
+        day_ns = day.tz_convert("UTC").value if self.tz is not None else day.value
+        return int(np.searchsorted(self.ts, day_ns, side="left"))
+
+    def change_from_open(self) -> float:
+        """% change of the last bar vs the first bar of the latest session."""
+        if not len(self):
+            return 0.0
+        today_open = float(self.open[self.session_start()])
+        curr = float(self.close[-1])
+        return (curr - today_open) / today_open * 100 if today_open != 0 else 0.0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Back to a float64 OHLCV frame (charts, exports)."""
+        return pd.DataFrame(self.values.astype(float), index=self.index, columns=list(FIELDS))
+
+
+def as_bars(bars) -> Bars:
+    return bars if isinstance(bars, Bars) else Bars.from_frame(bars)
+
+
+class BarRing:
+    """Bars for one (symbol, interval), merged in place from overlapping fetches."""
+    __slots__ = ("buffer", "tz", "_view")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.buffer = RingBuffer(capacity, FIELDS)
+        self.tz = None
+        self._view = None
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes
+
+    def update(self, bars) -> int:
+        """Merge a fresh fetch: the forming bar is rewritten, newer bars appended; returns rows touched."""
+        new = as_bars(bars)
+        if not len(new):
+            return 0
+        buf = self.buffer
+        last = buf.last_ts
+        touched = 0
+        if last is None or new.tz != self.tz or new.ts[-1] < last:
+            # First fill, or a different history altogether (a replay starting over)
+            buf.clear()
+            self.tz = new.tz
+            start = 0
+        else:
+            start = int(np.searchsorted(new.ts, last, side="left"))
+            if start < len(new) and new.ts[start] == last:
+                if not np.array_equal(buf.last_row(), new.values[start]):
+                    buf.replace_last(new.values[start])
+                    touched += 1
+                start += 1
+        buf.extend(new.ts[start:], new.values[start:])
+        touched += len(new) - start
+        if touched:
+            self._view = None
+        return touched
+
+    def view(self) -> Bars:
+        """Immutable copy of the ring, oldest first; the same object until the ring changes."""
+        if self._view is None:
+            ts, values = self.buffer.arrays()
+            self._view = Bars(ts, values, self.tz)
+        return self._view
+
+
+def ring_capacity(interval: str) -> int:
+    return CAPACITY.get(interval, DEFAULT_CAPACITY)
@@ -0,0 +1,251 @@
+"""Cross-sectional screener: all 9 gates over hundreds of symbols at once.
+
+The live signal loop walks the watchlist one ticker (one DataFrame) at a
+time, which is fine for a dozen symbols and slow for 500. Here the 15m
+bars of the whole universe become wide ``(time x symbol)`` NumPy arrays,
+each column right-aligned so row ``-1`` is every symbol's latest bar, and
+EMA 9/12/26/50/200, MACD, RSI(14), volume ratio, change from open and
+relative strength are computed in one vectorized pass over time.
+
+The indicator math is the same as ``IndicatorStream`` (EMAs seeded with
+the first close, simple-average RSI over the last 14 moves), so a symbol
+gets the same ``TickerSignal`` here as it would on the watchlist. Callers
+sort by strength and render one page at a time (``page``).
+"""
+import argparse
+import math
+import sys
+from dataclasses import replace
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from daytrade.gates import LABELS, GateThresholds, signal_label, thresholds_for
+from daytrade.indicators import EMA_SPANS, MACD_SIGNAL_SPAN, RSI_PERIOD
+from daytrade.market_data import BENCHMARK, MARKET_TZ, change_from_open, unique_symbols
+from daytrade.signals import MIN_HISTORY_BARS, TickerSignal
+
+FETCH_CHUNK = 100      # symbols per bulk download when syncing a big universe
+PAGE_SIZE = 21         # 3 rows of the 7-column heat-map grid
+
+# Edit these as the lists change; "all" is the union of every list
+UNIVERSES = {
+    "leveraged_etfs": (
+        "TQQQ", "SQQQ", "SOXL", "SOXS", "TECL", "TECS", "FNGU", "FNGD", "SPXL", "SPXS", "UPRO", "SPXU",
+        "QLD", "QID", "SSO", "SDS", "UDOW", "SDOW", "TNA", "TZA", "LABU", "LABD", "NVDL", "NVDD", "TSLL",
+        "TSLQ", "TSLT", "FAS", "FAZ", "CURE", "DFEN", "DPST", "DRN", "DRV", "ERX", "ERY", "GUSH", "DRIP",
+        "NAIL", "NUGT", "DUST", "JNUG", "JDST", "YINN", "YANG", "WEBL", "WEBS", "BULZ", "HIBL", "HIBS",
+        "RETL", "MIDU", "UTSL", "TMF", "TMV", "TYD", "TYO", "USD", "SSG", "ROM", "REW", "UYG", "SKF", "UCO",
+        "SCO", "BOIL", "KOLD", "AGQ", "ZSL", "UGL", "GLL", "CONL", "MSTU", "AMZU", "AAPU", "GGLL", "METU",
+        "MSFU", "BITX", "ETHU",
+    ),
+    "nasdaq100": (
+        "AAPL", "MSFT", "NVDA", "AMZN", "META", "AVGO", "GOOGL", "GOOG", "TSLA", "COST", "NFLX", "AMD",
+        "PEP", "ADBE", "CSCO", "TMUS", "LIN", "INTU", "QCOM", "TXN", "AMGN", "ISRG", "CMCSA", "AMAT",
+        "BKNG", "HON", "VRTX", "ADP", "PANW", "ADI", "MU", "GILD", "LRCX", "SBUX", "MELI", "KLAC", "MDLZ",
+        "INTC", "CTAS", "REGN", "PYPL", "SNPS", "CDNS", "CRWD", "MAR", "ASML", "ORLY", "CEG", "MRVL",
+        "FTNT", "ADSK", "ABNB", "DASH", "ROP", "PDD", "WDAY", "NXPI", "CHTR", "TEAM", "PCAR", "AEP",
+        "MNST", "CPRT", "PAYX", "ROST", "KDP", "FAST", "ODFL", "EA", "BKR", "VRSK", "CTSH", "DDOG", "GEHC",
+        "KHC", "EXC", "XEL", "LULU", "CCEP", "IDXX", "TTWO", "AZN", "MCHP", "FANG", "CSGP", "ZS", "ANSS",
+        "ON", "TTD", "DXCM", "CDW", "BIIB", "WBD", "GFS", "MDB", "ARM", "ILMN", "SMCI", "APP", "PLTR",
+        "MSTR", "AXON", "SHOP",
+    ),
+}
+UNIVERSES["all"] = tuple(unique_symbols(*UNIVERSES.values()))
+
+
+def _panel(frames: dict, symbols: list, index: pd.DatetimeIndex, fields) -> list:
+    """One (time x symbol) float array per field on the union ``index``; NaN where a symbol has no bar."""
+    stamps = index.as_unit("ns").asi8
+    out = [np.full((len(index), len(symbols)), np.nan) for _ in fields]
+    for j, sym in enumerate(symbols):
+        df = frames[sym]
+        rows = np.searchsorted(stamps, df.index.as_unit("ns").asi8)
+        values = df.to_numpy(dtype=float)    # one block copy; picking columns by label is slower
+        for field, arr in zip(fields, out):
+            arr[rows, j] = values[:, df.columns.get_loc(field)]
+    return out
+
+
+def _right_align(valid: np.ndarray, *arrays) -> list:
+    """Shift every column's valid rows to the bottom (keeping their order); missing rows end up on top."""
+    order = np.argsort(valid, axis=0, kind="stable")   # False (missing) first, then valid rows in time order
+    return [np.take_along_axis(a, order, axis=0) for a in arrays]
+
+
+def _ema_pass(close: np.ndarray) -> tuple:
+    """Stream EMAs, MACD signal and histogram down the rows; returns last / previous values per column."""
+    alphas = np.array([2.0 / (span + 1) for span in EMA_SPANS])[:, None]
+    sig_alpha = 2.0 / (MACD_SIGNAL_SPAN + 1)
+    i12, i26 = EMA_SPANS.index(12), EMA_SPANS.index(26)
+    n = close.shape[1]
+    emas = np.full((len(EMA_SPANS), n), np.nan)
+    signal = np.full(n, np.nan)
+    macd_hist = np.full(n, np.nan)
+    for row in close:
+        # First bar seeds every EMA with the close, like IndicatorStream (columns are right-aligned,
+        # so NaN only ever appears before a symbol's first bar)
+        emas = np.where(np.isnan(emas), row, emas + alphas * (row - emas))
+        macd_line = emas[i12] - emas[i26]
+        signal = np.where(np.isnan(signal), macd_line, signal + sig_alpha * (macd_line - signal))
+        prev_hist, macd_hist = macd_hist, macd_line - signal
+    return emas, macd_line, signal, macd_hist, prev_hist
+
+
+def screen(frames: dict, symbols, qqq_chg_from_open: float = None, th: GateThresholds = None,
+           now_et_time=None) -> list:
+    """``TickerSignal`` for the latest bar of every symbol with enough history, strongest first.
+
+    ``frames`` maps symbol -> 15m bars; ``qqq_chg_from_open`` defaults to the QQQ frame in ``frames``.
+    """
+    th = th or thresholds_for(False)
+    if qqq_chg_from_open is None:
+        qqq_chg_from_open = change_from_open(frames.get(BENCHMARK))
+    if now_et_time is None:
+        now_et_time = datetime.now(ZoneInfo(MARKET_TZ)).time()
+    symbols = [s for s in unique_symbols(symbols)
+               if frames.get(s) is not None and len(frames[s]) >= MIN_HISTORY_BARS]
+    if not symbols:
+        return []
+
+    index = frames[symbols[0]].index.append([frames[s].index for s in symbols[1:]]).unique().sort_values()
+    close, open_, volume = _panel(frames, symbols, index, ("Close", "Open", "Volume"))
+    valid = ~np.isnan(close)
+    day = np.broadcast_to(index.normalize().asi8[:, None], close.shape)
+    stamp = np.broadcast_to(np.arange(len(index))[:, None], close.shape)
+    close, open_, volume, day, stamp = _right_align(valid, close, open_, volume, day, stamp)
+    cols = np.arange(len(symbols))
+
+    curr, prev_close = close[-1], close[-2]
+    curr_vol, prev_vol = volume[-1], volume[-2]
+
+    # Today's open: first bar of each symbol's latest session
+    first_today = np.argmax((day == day[-1]) & ~np.isnan(close), axis=0)
+    today_open = open_[first_today, cols]
+    chg_from_open = np.where(today_open != 0, (curr - today_open) / today_open * 100, 0.0)
+
+    vol_ratio = np.where(prev_vol > 0, curr_vol / np.where(prev_vol > 0, prev_vol, 1), 1.0)
+    vol_ok = curr_vol > prev_vol * th.min_vol_ratio
+
+    emas, macd_line, signal_line, macd_hist, prev_hist = _ema_pass(close)
+    ema9, ema50, ema200 = (emas[EMA_SPANS.index(s)] for s in (9, 50, 200))
+
+    moves = np.diff(close[-(RSI_PERIOD + 1):], axis=0)
+    avg_gain = np.clip(moves, 0, None).sum(axis=0) / RSI_PERIOD
+    avg_loss = np.maximum(np.clip(-moves, 0, None).sum(axis=0) / RSI_PERIOD, 1e-10)
+    rsi = np.clip(100 - 100 / (1 + avg_gain / avg_loss), 0, 100)
+
+    bull = ema50 > ema200
+    rsi_ok = rsi < th.max_rsi
+    pullback_ok = chg_from_open < th.max_chg_from_open
+    dist = np.abs(curr - ema9) / ema9
+    near_9ema = dist < th.max_dist_9ema
+    time_ok = np.full(len(symbols), th.window_start <= now_et_time <= th.window_end)
+    macd_bullish = macd_line > signal_line
+    hist_rising = macd_hist > prev_hist
+    histogram_ok = (macd_hist > 0) & (hist_rising if th.require_hist_rising else True)
+    rel_strength_ok = chg_from_open > qqq_chg_from_open - th.rel_strength_margin
+
+    gates = np.vstack([bull, vol_ok, rsi_ok, pullback_ok, near_9ema, time_ok,
+                       macd_bullish, histogram_ok, rel_strength_ok])
+    strength = gates.sum(axis=0)
+    sacred = bull & pullback_ok
+    labels = np.select([strength >= 9, (strength >= 8) | ((strength == 7) & sacred), strength >= 7],
+                       LABELS[:3], default=LABELS[3])
+    bar_ts = index[stamp[-1]]
+
+    records = [
+        TickerSignal(
+            ticker=sym, price=float(curr[j]), prev_close=float(prev_close[j]),
+            chg_from_open=float(chg_from_open[j]), strength=int(strength[j]), label=str(labels[j]),
+            bar_ts=bar_ts[j].isoformat(),
+            bull=bool(bull[j]), vol_ok=bool(vol_ok[j]), rsi_ok=bool(rsi_ok[j]), pullback_ok=bool(pullback_ok[j]),
+            near_9ema=bool(near_9ema[j]), time_ok=bool(time_ok[j]), macd_bullish=bool(macd_bullish[j]),
+            histogram_ok=bool(histogram_ok[j]), rel_strength_ok=bool(rel_strength_ok[j]),
+            sacred_passed=bool(sacred[j]),
+            rsi=float(rsi[j]), ema9=float(ema9[j]), vol_ratio=float(vol_ratio[j]),
+            dist_9ema_pct=float(dist[j] * 100), macd_line=float(macd_line[j]), macd_hist=float(macd_hist[j]),
+        )
+        for j, sym in enumerate(symbols)
+    ]
+    records.sort(key=_rank)
+    return records
+
+
+def _rank(record) -> tuple:
+    # Strongest first; among equals, the tightest pullback to the 9-EMA
+    return (-record.strength, record.dist_9ema_pct)
+
+
+def rescore(records: list, qqq_chg_from_open: float, th: GateThresholds = None, now_et_time=None) -> list:
+    """Re-run the two gates that depend on the moment, not the bars: relative strength and the time window.
+
+    Lets a cached ``screen`` result follow the live QQQ move and clock; the
+    other seven gates only change when the bars do.
+    """
+    th = th or thresholds_for(False)
+    if now_et_time is None:
+        now_et_time = datetime.now(ZoneInfo(MARKET_TZ)).time()
+    time_ok = th.window_start <= now_et_time <= th.window_end
+    out = []
+    for r in records:
+        rel_strength_ok = r.chg_from_open > qqq_chg_from_open - th.rel_strength_margin
+        if rel_strength_ok != r.rel_strength_ok or time_ok != r.time_ok:
+            strength = r.strength - r.rel_strength_ok - r.time_ok + rel_strength_ok + time_ok
+            r = replace(r, rel_strength_ok=rel_strength_ok, time_ok=time_ok, strength=strength,
+                        label=signal_label(strength, r.sacred_passed))
+        out.append(r)
+    out.sort(key=_rank)
+    return out
+
+
+def page(records: list, number: int, size: int = PAGE_SIZE) -> tuple:
+    """(records on page ``number`` (1-based, clamped), page count)."""
+    pages = max(1, math.ceil(len(records) / size))
+    number = min(max(1, number), pages)
+    return records[(number - 1) * size:number * size], pages
+
+
+def load_universe(store, symbols, sessions: int = 5) -> dict:
+    """Sync and load 15m bars for a whole universe (plus QQQ) in ``FETCH_CHUNK``-sized bulk downloads."""
+    from daytrade.bar_store import load_bars, sync_bars
+    symbols = unique_symbols(symbols, [BENCHMARK])
+    for i in range(0, len(symbols), FETCH_CHUNK):
+        sync_bars(store, symbols[i:i + FETCH_CHUNK], interval="15m", period=f"{sessions}d")
+    return load_bars(store, symbols, "15m", sessions=sessions)
+
+
+# ---------- CLI ----------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m daytrade screen",
+                                     description="Rank a whole universe by 9-gate strength")
+    parser.add_argument("--universe", choices=sorted(UNIVERSES), default="all")
+    parser.add_argument("--tickers", nargs="+", help="screen these instead of a named universe")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="N synthetic symbols (no network)")
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        from daytrade.synthetic import synthetic_symbols, synthetic_universe
+        symbols = synthetic_symbols(args.synthetic)
+        frames = synthetic_universe(args.synthetic, 5)
+    else:
+        from daytrade.bar_store import BarStore
+        symbols = list(args.tickers or UNIVERSES[args.universe])
+        frames = load_universe(BarStore(), symbols)
+
+    started = datetime.now()
+    records = screen(frames, symbols, th=thresholds_for(args.strict))
+    elapsed = (datetime.now() - started).total_seconds() * 1000
+    print(f"{len(records)}/{len(symbols)} symbols screened in {elapsed:,.0f} ms")
+    for r in records[:args.top]:
+        print(f"  {r.ticker:<6} {r.label:<12} {r.strength}/9  ${r.price:>9,.2f}  {r.chg_from_open:+.1f}%"
+              f"  RSI {r.rsi:5.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
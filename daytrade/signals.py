@@ -0,0 +1,148 @@
+"""Live 9-gate evaluation for the latest bar of each ticker, plus regime / VIX labels."""
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from daytrade.gates import GateThresholds, signal_label
+from daytrade.indicators import IndicatorEngine
+from daytrade.ringbuffer import Bars, as_bars
+
+MIN_HISTORY_BARS = 50
+
+
+@dataclass(frozen=True, slots=True)
+class TickerSignal:
+    """Gate result for the latest 15m bar of one ticker (one signal-table row)."""
+    ticker: str
+    price: float            # last 15m close
+    prev_close: float       # previous 15m close
+    chg_from_open: float    # % vs today's first 15m open
+    strength: int           # gates passed, 0-9
+    label: str              # "Strong Buy" / "Caution Buy" / "Watch" / "Sit Out"
+    bar_ts: str
+    bull: bool
+    vol_ok: bool
+    rsi_ok: bool
+    pullback_ok: bool
+    near_9ema: bool
+    time_ok: bool
+    macd_bullish: bool
+    histogram_ok: bool
+    rel_strength_ok: bool
+    sacred_passed: bool
+    rsi: float
+    ema9: float
+    vol_ratio: float
+    dist_9ema_pct: float
+    macd_line: float
+    macd_hist: float
+
+
+def market_regime(qqq_chg_from_open: float) -> str:
+    if qqq_chg_from_open > 0.8:
+        return "🟢 Bullish Day – Trade Aggressively"
+    elif qqq_chg_from_open > -0.8:
+        return "🟡 Neutral Day – Stick to Strong Buys"
+    return "🔴 Choppy/Bearish Day – Caution Advised"
+
+
+def vix_regime(vix: float) -> str:
+    if vix > 35:
+        return "🔴 EXTREME VOL – Avoid or ultra tight stops"
+    elif vix > 25:
+        return "🟠 High Vol – Caution, smaller size"
+    elif vix > 18:
+        return "🟡 Normal Vol"
+    return "🟢 Low Vol – Aggressive OK"
+
+
+def evaluate_ticker(tick: str, hist: Bars, qqq_chg_from_open: float, th: GateThresholds,
+                    engine: IndicatorEngine, now_et_time=None, interval: str = "15m"):
+    """``TickerSignal`` for the last bar of ``hist`` (``Bars`` or an OHLCV frame), or None without enough history."""
+    if hist is None or len(hist) < MIN_HISTORY_BARS:
+        return None
+    hist = as_bars(hist)
+    close, volume = hist.close, hist.volume
+
+    curr = float(close[-1])
+    prev_close = float(close[-2]) if len(hist) > 1 else curr
+
+    # Correct today's open (first 9:30 bar of the day)
+    today_open = float(hist.open[hist.session_start()])
+    chg_from_open = (curr - today_open) / today_open * 100 if today_open != 0 else 0
+
+    prev_vol = float(volume[-2]) if len(hist) > 1 else 0
+    curr_vol = float(volume[-1])
+    vol_ratio = curr_vol / prev_vol if prev_vol > 0 else 1.0
+    vol_ok = curr_vol > prev_vol * th.min_vol_ratio
+
+    # All indicators now on clean 15m bars (streamed: only new bars are processed)
+    ind = engine.update(tick, interval, hist)
+    rsi = ind.rsi
+    rsi_ok = rsi < th.max_rsi
+
+    bull = ind.ema50 > ind.ema200
+
+    ema9 = ind.ema9
+    near_9ema = abs(curr - ema9) / ema9 < th.max_dist_9ema
+    dist_9ema_pct = abs(curr - ema9) / ema9 * 100 if ema9 != 0 else 0
+
+    if now_et_time is None:
+        now_et_time = datetime.now(ZoneInfo("America/New_York")).time()
+    time_ok = th.window_start <= now_et_time <= th.window_end
+
+    macd_bullish = ind.macd_line > ind.signal_line
+    hist_positive = ind.macd_hist > 0
+    hist_rising = ind.macd_hist > ind.prev_macd_hist if ind.bars > 1 else False
+    histogram_ok = hist_positive and (hist_rising if th.require_hist_rising else True)
+
+    rel_strength_ok = chg_from_open > qqq_chg_from_open - th.rel_strength_margin
+
+    pullback_ok = chg_from_open < th.max_chg_from_open
+    conditions_met = sum([bull, vol_ok, rsi_ok, pullback_ok,
+                          near_9ema, time_ok, macd_bullish, histogram_ok, rel_strength_ok])
+
+    sacred_passed = bull and pullback_ok
+
+    label = signal_label(conditions_met, sacred_passed)
+
+    return TickerSignal(
+        ticker=tick,
+        price=float(curr),
+        prev_close=float(prev_close),
+        chg_from_open=float(chg_from_open),
+        strength=int(conditions_met),
+        label=label,
+        bar_ts=hist.timestamp(-1).isoformat(),
+        bull=bool(bull),
+        vol_ok=bool(vol_ok),
+        rsi_ok=bool(rsi_ok),
+        pullback_ok=bool(pullback_ok),
+        near_9ema=bool(near_9ema),
+        time_ok=bool(time_ok),
+        macd_bullish=bool(macd_bullish),
+        histogram_ok=bool(histogram_ok),
+        rel_strength_ok=bool(rel_strength_ok),
+        sacred_passed=bool(sacred_passed),
+        rsi=float(rsi),
+        ema9=float(ema9),
+        vol_ratio=float(vol_ratio),
+        dist_9ema_pct=float(dist_9ema_pct),
+        macd_line=float(ind.macd_line),
+        macd_hist=float(ind.macd_hist),
+    )
+
+
+def evaluate_watchlist(tickers, intraday: dict, qqq_chg_from_open: float, th: GateThresholds,
+                       engine: IndicatorEngine, now_et_time=None) -> list:
+    records = []
+    for tick in tickers:
+        try:
+            record = evaluate_ticker(tick, intraday.get(tick), qqq_chg_from_open, th, engine, now_et_time)
+        except Exception:
+            record = None  # one bad symbol never blanks the whole table
+        if record is not None:
+            records.append(record)
+    return records
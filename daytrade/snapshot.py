@@ -0,0 +1,127 @@
+"""The one market snapshot every section of the dashboard reads.
+
+The poller builds a ``MarketSnapshot`` once per refresh: bars, QQQ / VIX
+regime, a ``Quote`` per symbol and a typed ``TickerSignal`` per ticker and
+strategy mode. The header, indices, heat-map, signal table, trade plan,
+alerts, Grok prompt, Telegram image, journal and CLI all read from it, so
+a price or a QQQ move shown in one place is the number every other place
+used. Snapshots are frozen; a newer refresh publishes a new one.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from daytrade.market_data import MARKET_TZ
+from daytrade.signals import TickerSignal, market_regime, vix_regime
+
+TABLE_COLUMNS = ["Signal", "Ticker", "Strength", "Price", "Chg %", "RSI", "Vol ×", "To 9EMA %", "MACD Hist"]
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    """Latest price and the day's move for one symbol."""
+    symbol: str
+    price: float            # last 15m close when we have intraday bars, else the daily close
+    prev_close: float       # previous daily close (NaN if unknown)
+    chg_pct: float          # % vs previous daily close (NaN if unknown)
+
+
+def build_quotes(symbols, intraday: dict, daily: dict) -> dict:
+    """symbol -> Quote from ``Bars``; symbols with no bars at all are left out."""
+    quotes = {}
+    for sym in symbols:
+        bars = intraday.get(sym)
+        days = daily.get(sym)
+        if bars is not None and len(bars) > 0:
+            price = float(bars.close[-1])
+        elif days is not None and len(days) > 0:
+            price = float(days.close[-1])
+        else:
+            continue
+        prev = float(days.close[-2]) if days is not None and len(days) > 1 else float("nan")
+        chg = (price - prev) / prev * 100 if prev else float("nan")
+        quotes[sym] = Quote(sym, price, prev, chg)
+    return quotes
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    version: int
+    taken_at: datetime
+    watchlist: tuple
+    intraday: MappingProxyType          # symbol -> 15m Bars (read-only arrays; .to_frame() for charts)
+    daily: MappingProxyType             # symbol -> daily Bars
+    qqq_chg_from_open: float            # from 15m bars: drives the regime banner and relative strength
+    vix: float
+    regime: str
+    vix_status: str
+    signals: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))  # mode -> tuple of TickerSignal
+    quotes: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))   # symbol -> Quote
+    upstream: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))  # provider calls this poll
+    timings: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))   # poll stage -> ms
+
+    @classmethod
+    def empty(cls) -> "MarketSnapshot":
+        # Placeholder until the first poll finishes
+        return cls(
+            version=0, taken_at=datetime.now(ZoneInfo(MARKET_TZ)), watchlist=(),
+            intraday=MappingProxyType({}), daily=MappingProxyType({}),
+            qqq_chg_from_open=0.0, vix=0,
+            regime=market_regime(0.0), vix_status=vix_regime(0),
+        )
+
+    def rows(self, mode: str, tickers=None) -> list:
+        """TickerSignals for ``mode``, in ``tickers`` order (all of them when None)."""
+        records = self.signals.get(mode, ())
+        if tickers is None:
+            return list(records)
+        by_ticker = {r.ticker: r for r in records}
+        return [by_ticker[t] for t in tickers if t in by_ticker]
+
+    def signal(self, mode: str, ticker: str):
+        for record in self.signals.get(mode, ()):
+            if record.ticker == ticker:
+                return record
+        return None
+
+    def quote(self, symbol: str):
+        return self.quotes.get(symbol)
+
+    def price(self, symbol: str) -> float:
+        quote = self.quotes.get(symbol)
+        return quote.price if quote is not None else float("nan")
+
+    def strong_buys(self, mode: str, tickers=None) -> list:
+        return [r for r in self.rows(mode, tickers) if r.label == "Strong Buy"]
+
+
+def signal_emoji(label: str) -> str:
+    if label == "Strong Buy":
+        return "🟢"
+    elif label in ("Caution Buy", "Watch"):
+        return "🟡"
+    return "🔴"
+
+
+def signal_table(records) -> pd.DataFrame:
+    """The signal overview table (also the Telegram image input), strongest first."""
+    table = pd.DataFrame([{
+        "Signal": f"{signal_emoji(r.label)} {r.label}",
+        "Ticker": r.ticker,
+        "Strength": r.strength,
+        "Price": round(r.price, 2),
+        "Chg %": round(r.chg_from_open, 1),
+        "RSI": round(r.rsi, 1),
+        "Vol ×": round(r.vol_ratio, 1),
+        "To 9EMA %": round(r.dist_9ema_pct, 2),
+        "MACD Hist": round(r.macd_hist, 4),
+    } for r in records], columns=TABLE_COLUMNS)
+    return table.sort_values(by="Strength", ascending=False, kind="stable")
+
+
+def signal_line(record: TickerSignal) -> str:
+    """One-line summary used by alerts, the Grok prompt and the morning summary."""
+    return f"{record.ticker} @ ${record.price:,.2f} ({record.chg_from_open:+.1f}%) — {record.strength}/9"
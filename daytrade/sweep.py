@@ -0,0 +1,168 @@
+"""Parallel parameter sweep over strategy thresholds and tickers.
+
+Bars are read from the local bar store once, packed into one ``.npy``
+file per symbol and memory-mapped read-only by every worker process, so
+a sweep of hundreds of combinations never re-downloads or re-pickles
+history. Each worker also keeps its indicator frames per ticker, so only
+the threshold-dependent gate logic and the exit search run per job.
+
+    python -m daytrade.sweep --tickers SOXL TQQQ TECL --workers 8 --out sweep.csv
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+
+from daytrade.backtest import (
+    MAX_SESSIONS, MIN_BARS, STOP_LOSS_PCT, TAKE_PROFIT_PCT, backtest_entries, gate_entries, session_grid,
+)
+from daytrade.gates import GateThresholds, gate_frame, thresholds_for
+from daytrade.indicators import indicator_frame
+from daytrade.market_data import BENCHMARK, MARKET_TZ
+
+# Threshold names a grid may vary, on top of GateThresholds' fields
+EXIT_PARAMS = ("take_profit", "stop_loss", "min_label")
+DEFAULT_GRID = {
+    "max_chg_from_open": [3.0, 4.5],
+    "min_vol_ratio": [1.5, 1.8],
+    "max_rsi": [75, 78],
+    "max_dist_9ema": [0.015, 0.02],
+    "take_profit": [TAKE_PROFIT_PCT],
+    "stop_loss": [STOP_LOSS_PCT],
+}
+BAR_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def expand_grid(grid: dict) -> list:
+    allowed = set(GateThresholds.__dataclass_fields__) | set(EXIT_PARAMS)
+    unknown = set(grid) - allowed
+    if unknown:
+        raise ValueError(f"Unknown sweep parameter(s): {', '.join(sorted(unknown))}")
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+# ====================== SHARED BAR ARRAYS ======================
+def pack_bars(frames: dict, directory: str) -> dict:
+    """Write each frame as an (n, 6) float64 array [epoch seconds, OHLCV]; returns symbol -> path."""
+    paths = {}
+    for sym, df in frames.items():
+        if df is None or df.empty:
+            continue
+        ts = (df.index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+        arr = np.column_stack([np.asarray(ts, dtype=np.float64), df[BAR_FIELDS].to_numpy(dtype=np.float64)])
+        path = os.path.join(directory, f"{sym.replace('^', '_')}.npy")
+        np.save(path, arr)
+        paths[sym] = path
+    return paths
+
+
+def unpack_bars(path: str) -> pd.DataFrame:
+    arr = np.load(path, mmap_mode="r")
+    index = pd.to_datetime(arr[:, 0].astype(np.int64), unit="s", utc=True).tz_convert(MARKET_TZ)
+    return pd.DataFrame(np.asarray(arr[:, 1:]), index=index, columns=BAR_FIELDS)
+
+
+# ====================== WORKERS ======================
+_PATHS = {}
+_PREPARED = {}
+
+
+def _init_worker(paths: dict):
+    global _PATHS
+    _PATHS = paths
+    _PREPARED.clear()
+
+
+def _prepared(ticker: str):
+    # Everything that does not depend on the thresholds, built once per worker and ticker
+    if ticker not in _PREPARED:
+        hist = unpack_bars(_PATHS[ticker])
+        qqq = unpack_bars(_PATHS[BENCHMARK]) if BENCHMARK in _PATHS else None
+        _PREPARED[ticker] = (hist, qqq, indicator_frame(hist['Close']), session_grid(hist, MAX_SESSIONS))
+    return _PREPARED[ticker]
+
+
+def run_job(ticker: str, combo: dict, is_strict: bool = False) -> dict:
+    hist, qqq, ind, grid = _prepared(ticker)
+    row = {"Ticker": ticker, **combo}
+    if len(hist) < MIN_BARS:
+        return row
+    th_fields = {k: v for k, v in combo.items() if k not in EXIT_PARAMS}
+    th = replace(thresholds_for(is_strict), **th_fields)
+    gates = gate_frame(hist, qqq, th, ind=ind)
+    entries = gate_entries(gates, grid, combo.get("min_label", "Caution Buy"))
+    stats = backtest_entries(
+        grid, entries, combo.get("take_profit", TAKE_PROFIT_PCT), combo.get("stop_loss", STOP_LOSS_PCT)
+    )
+    row.update(stats or {"signals": 0})
+    return row
+
+
+def _run_chunk(args):
+    ticker, combos, is_strict = args
+    return [run_job(ticker, combo, is_strict) for combo in combos]
+
+
+def run_sweep(frames: dict, tickers, grid: dict = None, is_strict: bool = False, workers: int = None,
+              rank_by: str = "total_pl", chunk: int = 16) -> pd.DataFrame:
+    """Backtest every (ticker, combination) on a process pool and return one ranked table.
+
+    ``frames`` maps symbol -> NY-indexed 15m bars and should include QQQ
+    for the relative-strength gate.
+    """
+    combos = expand_grid(grid or DEFAULT_GRID)
+    tickers = [t for t in tickers if t in frames and not frames[t].empty]
+    jobs = [(t, combos[i:i + chunk], is_strict) for t in tickers for i in range(0, len(combos), chunk)]
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="daytrade_sweep_") as tmp:
+        paths = pack_bars({s: frames[s] for s in set(tickers) | {BENCHMARK} if s in frames}, tmp)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(paths,)) as pool:
+            for chunk_rows in pool.map(_run_chunk, jobs):
+                rows.extend(chunk_rows)
+    table = pd.DataFrame(rows)
+    if table.empty or rank_by not in table:
+        return table
+    # No combination with stats means no win_rate column at all (every row is just {"signals": 0})
+    keys = [c for c in dict.fromkeys((rank_by, "win_rate")) if c in table]
+    table = table.sort_values(keys, ascending=False, na_position="last").reset_index(drop=True)
+    table.insert(0, "Rank", np.arange(1, len(table) + 1))
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m daytrade.sweep", description=__doc__.split("\n")[0])
+    parser.add_argument("--tickers", nargs="+", required=True)
+    parser.add_argument("--grid", help="JSON file mapping parameter -> list of values (default: built-in grid)")
+    parser.add_argument("--strict", action="store_true", help="start from Strict instead of Balanced thresholds")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rank-by", default="total_pl")
+    parser.add_argument("--no-sync", action="store_true", help="use only bars already in the local store")
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args(argv)
+
+    from daytrade.bar_store import BarStore, load_bars, sync_bars
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as fh:
+            grid = json.load(fh)
+    symbols = list(dict.fromkeys(args.tickers + [BENCHMARK]))
+    store = BarStore()
+    if not args.no_sync:
+        sync_bars(store, symbols, interval="15m", period="60d")
+    frames = load_bars(store, symbols, "15m", sessions=MAX_SESSIONS)
+    table = run_sweep(frames, args.tickers, grid, args.strict, args.workers, args.rank_by)
+    table.to_csv(args.out, index=False)
+    print(table.head(20).to_string(index=False))
+    print(f"\n{len(table)} results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
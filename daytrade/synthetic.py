@@ -0,0 +1,68 @@
+"""Deterministic synthetic OHLCV bars for offline benchmarks and replays.
+
+Same (symbol, days, seed, end) -> byte-identical frames on every machine:
+the RNG is seeded from a CRC of the symbol, never from ``hash()``. Bars
+sit on the regular-session grid (9:30-15:45 ET for 15m) with the same
+column names and tz-aware ET index that ``fetch_batch`` returns.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from daytrade.market_data import BENCHMARK, MARKET_TZ
+
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+DEFAULT_END = "2025-06-30"
+
+
+def symbol_seed(symbol: str, seed: int = 0) -> int:
+    return zlib.crc32(symbol.encode()) ^ (seed * 0x9E3779B1 & 0xFFFFFFFF)
+
+
+def session_index(days: int, interval: str = "15m", end=DEFAULT_END) -> pd.DatetimeIndex:
+    sessions = pd.bdate_range(end=pd.Timestamp(end).normalize(), periods=days)
+    if interval == "1d":
+        return sessions.tz_localize(MARKET_TZ)
+    step = pd.Timedelta(interval.replace("m", "min"))
+    offsets = pd.timedelta_range(SESSION_OPEN, SESSION_CLOSE - step, freq=step)
+    stamps = (sessions.values[:, None] + offsets.values[None, :]).ravel()
+    return pd.DatetimeIndex(stamps).tz_localize(MARKET_TZ)
+
+
+def synthetic_bars(symbol: str, days: int, seed: int = 0, interval: str = "15m", end=DEFAULT_END,
+                   start_price: float = None, vol: float = None) -> pd.DataFrame:
+    """Random-walk OHLCV with a little drift, intraday U-shaped volume and realistic wicks."""
+    rng = np.random.default_rng(symbol_seed(symbol, seed))
+    idx = session_index(days, interval, end)
+    n = len(idx)
+    vol = vol if vol is not None else rng.uniform(0.002, 0.008) * (4.0 if interval == "1d" else 1.0)
+    price = start_price if start_price is not None else rng.uniform(15, 150)
+
+    close = price * np.exp(np.cumsum(rng.normal(vol * 0.02, vol, n)))
+    open_ = np.r_[price, close[:-1]] * (1 + rng.normal(0, vol / 4, n))
+    wick = np.abs(rng.normal(0, vol / 2, (2, n)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+
+    if interval == "1d":
+        shape = np.ones(n)
+    else:
+        minutes = (idx.hour * 60 + idx.minute).to_numpy()
+        x = (minutes - minutes.min()) / max(1, minutes.max() - minutes.min())
+        shape = 0.6 + 1.6 * (x - 0.5) ** 2 * 4   # heavy at the open and into the close
+    volume = np.round(rng.lognormal(12.5, 0.35, n) * shape)
+
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=idx)
+
+
+def synthetic_symbols(n: int) -> list:
+    return [f"SYN{i:03d}" for i in range(n)]
+
+
+def synthetic_universe(n_tickers: int, days: int, seed: int = 0, interval: str = "15m",
+                       end=DEFAULT_END) -> dict:
+    """``n_tickers`` synthetic symbols plus the QQQ benchmark, keyed like ``split_batch`` output."""
+    symbols = synthetic_symbols(n_tickers) + [BENCHMARK]
+    return {s: synthetic_bars(s, days, seed, interval, end) for s in symbols}
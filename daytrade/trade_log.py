@@ -0,0 +1,146 @@
+"""Trade journal stored in SQLite (WAL) instead of a rewritten CSV.
+
+Every "Log Trade" is a single INSERT, so two sessions logging at the same
+moment can't drop each other's rows, and the page only ever reads the
+open positions and the last few trades through indexed queries.
+DataFrames come back with the legacy ``trade_log.csv`` column names.
+"""
+import logging
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+TRADE_DB_FILE = os.environ.get("DAYTRADE_TRADE_DB", "trade_log.db")
+LEGACY_CSV_FILE = "trade_log.csv"
+COLUMNS = ["Date", "Ticker", "Entry Price", "Exit Price", "Shares", "P/L $", "Notes"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    date        TEXT    NOT NULL,
+    ticker      TEXT    NOT NULL,
+    entry_price REAL    NOT NULL,
+    exit_price  REAL,
+    shares      REAL    NOT NULL,
+    pl          REAL,
+    notes       TEXT    NOT NULL DEFAULT '',
+    is_open     INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_ticker ON trades (ticker);
+CREATE INDEX IF NOT EXISTS trades_date ON trades (date);
+CREATE INDEX IF NOT EXISTS trades_open ON trades (is_open);
+CREATE TABLE IF NOT EXISTS imports (
+    source      TEXT PRIMARY KEY,
+    rows        INTEGER NOT NULL,
+    imported_at TEXT    NOT NULL
+);
+"""
+_SELECT = ("SELECT date AS 'Date', ticker AS 'Ticker', entry_price AS 'Entry Price', exit_price AS 'Exit Price',"
+           " shares AS 'Shares', pl AS 'P/L $', notes AS 'Notes' FROM trades")
+
+
+def _number_or_none(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value == value else None  # NaN -> None
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value)
+
+
+def _exit_or_none(value):
+    # Legacy CSV rows use "", 0 or NaN for "still open"
+    return _number_or_none(value) or None
+
+
+class TradeLog:
+    def __init__(self, path: str = TRADE_DB_FILE):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def add_trade(self, ticker: str, entry_price: float, shares: float, exit_price: float = None,
+                  pl: float = None, notes: str = "", date: str = None) -> int:
+        exit_price = _exit_or_none(exit_price)
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO trades (date, ticker, entry_price, exit_price, shares, pl, notes, is_open)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (date or datetime.now().strftime("%Y-%m-%d %H:%M"), ticker.upper(), float(entry_price),
+                 exit_price, float(shares), _number_or_none(pl), notes or "",
+                 int(exit_price is None)),
+            )
+        return cur.lastrowid
+
+    def _query(self, sql: str, params=()) -> pd.DataFrame:
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def open_trades(self) -> pd.DataFrame:
+        return self._query(_SELECT + " WHERE is_open = 1 ORDER BY id")
+
+    def open_tickers(self) -> list:
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute("SELECT DISTINCT ticker FROM trades WHERE is_open = 1 ORDER BY ticker")]
+
+    def last_trades(self, n: int = 10) -> pd.DataFrame:
+        return self._query(f"SELECT * FROM ({_SELECT.replace(' FROM', ', id FROM')} ORDER BY id DESC LIMIT ?)"
+                           " ORDER BY id", (n,)).drop(columns="id")
+
+    def trades_for(self, ticker: str) -> pd.DataFrame:
+        return self._query(_SELECT + " WHERE ticker = ? ORDER BY id", (ticker.upper(),))
+
+    def all_trades(self) -> pd.DataFrame:
+        return self._query(_SELECT + " ORDER BY id")
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+
+    def import_csv(self, path: str = LEGACY_CSV_FILE) -> int:
+        """One-time import of the old CSV journal; returns rows imported (0 if already done / missing)."""
+        source = os.path.abspath(path)
+        if not os.path.exists(path):
+            return 0
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+                return 0
+        legacy = pd.read_csv(path)
+        rows, skipped = [], []
+        for line, rec in enumerate(legacy.to_dict("records"), start=2):
+            entry_price = _number_or_none(rec.get("Entry Price"))
+            if entry_price is None:
+                # entry_price is NOT NULL: one blank cell would roll back the whole import
+                skipped.append(line)
+                continue
+            exit_price = _exit_or_none(rec.get("Exit Price"))
+            rows.append((
+                _text(rec.get("Date")), _text(rec.get("Ticker")).upper(), entry_price,
+                exit_price, _number_or_none(rec.get("Shares")) or 0.0, _number_or_none(rec.get("P/L $")),
+                _text(rec.get("Notes")), int(exit_price is None),
+            ))
+        if skipped:
+            log.warning("%s: skipped %d row(s) without an entry price (CSV lines %s)",
+                        path, len(skipped), ", ".join(map(str, skipped)))
+        with self._connect() as conn:  # one transaction: all rows + the import marker, or nothing
+            conn.executemany(
+                "INSERT INTO trades (date, ticker, entry_price, exit_price, shares, pl, notes, is_open)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+            conn.execute("INSERT INTO imports VALUES (?, ?, ?)", (source, len(rows), datetime.now().isoformat()))
+        return len(rows)
+
+    def to_excel(self, output, sheet_name: str = "Trade_Log"):
+        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            self.all_trades().to_excel(writer, index=False, sheet_name=sheet_name)
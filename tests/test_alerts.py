@@ -0,0 +1,125 @@
+"""Durable alert dedupe, batching and retry policy of ``AlertDispatcher``."""
+import sqlite3
+import time
+
+import pytest
+
+from daytrade.alerts import Alert, AlertDedupeStore, AlertDispatcher
+from daytrade.replay import RecordingBot
+
+
+class TelegramError(Exception):
+    """Shaped like telebot's ApiTelegramException."""
+
+    def __init__(self, code: int, retry_after: int = None):
+        super().__init__(f"Error code: {code}")
+        self.error_code = code
+        self.result_json = {"error_code": code, "parameters": {"retry_after": retry_after} if retry_after else {}}
+
+
+class FlakyBot(RecordingBot):
+    """Raises the queued errors first, then records like ``RecordingBot``."""
+
+    def __init__(self, *errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+
+    def send_message(self, chat_id, text, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        super().send_message(chat_id, text)
+
+
+def _alert(ticker: str = "SOXL", chat_id: str = "42", bar_ts: str = "2025-06-02T10:15") -> Alert:
+    return Alert("token", chat_id, ticker, 9, bar_ts, f"🚀 Strong Buy {ticker}")
+
+
+def _dispatcher(db, bot, batch_window: float = 0.05, **kwargs) -> AlertDispatcher:
+    return AlertDispatcher(AlertDedupeStore(str(db)), batch_window=batch_window, backoff=0.01,
+                           bot_factory=lambda token: bot, **kwargs).start()
+
+
+def test_two_dispatchers_share_one_db(tmp_path):
+    db = tmp_path / "alerts.db"
+    first, second = RecordingBot(), RecordingBot()
+    a, b = _dispatcher(db, first), _dispatcher(db, second)
+    assert len(a.submit_alerts([_alert()])) == 1
+    assert b.submit_alerts([_alert()]) == []
+    assert a.flush(timeout=5) and b.flush(timeout=5)
+    assert len(first.sent) + len(second.sent) == 1
+
+
+def test_restart_does_not_resend(tmp_path):
+    db = tmp_path / "alerts.db"
+    bot = RecordingBot()
+    before = _dispatcher(db, bot)
+    before.submit_alerts([_alert()])
+    before.flush(timeout=5)
+    # A new process (new dispatcher, new store) on the same file, e.g. after a reload
+    after = _dispatcher(db, bot)
+    assert after.submit_alerts([_alert(), _alert(bar_ts="2025-06-02T10:30")]) == [_alert(bar_ts="2025-06-02T10:30")]
+    after.flush(timeout=5)
+    assert len(bot.sent) == 2
+
+
+def test_failed_send_is_released(tmp_path):
+    db = tmp_path / "alerts.db"
+    bot = FlakyBot(TelegramError(400))
+    dispatcher = _dispatcher(db, bot)
+    dispatcher.submit_alerts([_alert()])
+    dispatcher.flush(timeout=5)
+    assert (bot.calls, dispatcher.failed, bot.sent) == (1, 1, [])   # permanent error: no retries
+    # The claim was released, so the next refresh gets another go
+    assert len(dispatcher.submit_alerts([_alert()])) == 1
+    dispatcher.flush(timeout=5)
+    assert len(bot.sent) == 1 and dispatcher.sent == 1
+
+
+@pytest.mark.parametrize("error", [TelegramError(429, retry_after=0), TelegramError(502), ConnectionResetError()])
+def test_transient_errors_are_retried(tmp_path, error):
+    bot = FlakyBot(error)
+    dispatcher = _dispatcher(tmp_path / "alerts.db", bot)
+    dispatcher.submit_alerts([_alert()])
+    dispatcher.flush(timeout=5)
+    assert bot.calls == 2 and len(bot.sent) == 1 and dispatcher.failed == 0
+
+
+def test_retries_give_up(tmp_path):
+    bot = FlakyBot(*[TelegramError(503)] * 3)
+    dispatcher = _dispatcher(tmp_path / "alerts.db", bot, max_retries=2)
+    dispatcher.submit_alerts([_alert()])
+    dispatcher.flush(timeout=5)
+    assert bot.calls == 3 and dispatcher.failed == 1
+    assert len(dispatcher.submit_alerts([_alert()])) == 1
+
+
+def test_batch_window(tmp_path):
+    bot = RecordingBot()
+    dispatcher = _dispatcher(tmp_path / "alerts.db", bot, batch_window=0.5)
+    dispatcher.submit_alerts([_alert("SOXL")])
+    time.sleep(0.1)
+    dispatcher.submit_alerts([_alert("TQQQ"), _alert("TECL", chat_id="7")])
+    dispatcher.flush(timeout=5)
+    # One message per chat for everything that arrived inside the window
+    texts = {chat: text for _, chat, text in bot.sent}
+    assert len(bot.sent) == 2
+    assert texts["42"] == "🚀 Strong Buy SOXL\n🚀 Strong Buy TQQQ"
+    assert texts["7"] == "🚀 Strong Buy TECL"
+    # A later alert starts a new batch
+    dispatcher.submit_alerts([_alert("FNGU")])
+    dispatcher.flush(timeout=5)
+    assert len(bot.sent) == 3
+
+
+def test_start_prunes_old_claims(tmp_path):
+    db = tmp_path / "alerts.db"
+    store = AlertDedupeStore(str(db))
+    store.claim(_alert())
+    with sqlite3.connect(db) as conn:
+        conn.execute("UPDATE sent_alerts SET sent_at = sent_at - 30 * 86400")
+    dispatcher = _dispatcher(db, RecordingBot())
+    dispatcher.flush(timeout=5)
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sent_alerts").fetchone()[0] == 0
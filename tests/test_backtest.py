@@ -0,0 +1,52 @@
+"""The vectorized ``run_backtest`` against the original bar-by-bar loop."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from daytrade.backtest import MARKET_TZ, MIN_BARS, backtest_reference, run_backtest
+
+SEEDS = range(5)
+
+
+def _bars(days: int, seed: int, vol: float = 0.006) -> pd.DataFrame:
+    """Random-walk 15m bars on the 9:30-15:45 ET grid, like a yfinance download."""
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(end="2025-06-30", periods=days)
+    offsets = pd.timedelta_range("9h30min", "15h45min", freq="15min")
+    idx = pd.DatetimeIndex((sessions.values[:, None] + offsets.values[None, :]).ravel()).tz_localize(MARKET_TZ)
+    n = len(idx)
+    close = rng.uniform(15, 150) * np.exp(np.cumsum(rng.normal(vol * 0.02, vol, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, vol / 4, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+    volume = np.round(rng.lognormal(12.5, 0.35, n))
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}, index=idx)
+
+
+@pytest.mark.parametrize("is_strict", [False, True])
+@pytest.mark.parametrize("days", [30, 8])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_matches_reference(seed, days, is_strict):
+    hist = _bars(days, seed)
+    assert run_backtest(hist, is_strict) == backtest_reference(hist, is_strict)
+
+
+@pytest.mark.parametrize("is_strict", [False, True])
+@pytest.mark.parametrize("cut", [1, 7, 13, 20])
+def test_matches_reference_mid_session(cut, is_strict):
+    # History ending part-way through the last session (a live fetch before the close)
+    hist = _bars(10, seed=cut).iloc[:-cut]
+    assert run_backtest(hist, is_strict) == backtest_reference(hist, is_strict)
+
+
+@pytest.mark.parametrize("is_strict", [False, True])
+def test_too_short_history(is_strict):
+    hist = _bars(10, seed=0).iloc[:MIN_BARS - 1]
+    assert run_backtest(hist, is_strict) is None
+    assert backtest_reference(hist, is_strict) is None
+
+
+def test_trades_were_taken():
+    # Guards the parity tests above against passing on two empty results
+    stats = run_backtest(_bars(30, seed=1), False)
+    assert stats is not None and stats["signals"] > 0
@@ -0,0 +1,124 @@
+"""BarStore append / load / prune and the cold-vs-warm split in ``sync_bars``."""
+import pandas as pd
+import pytest
+
+from daytrade.bar_store import BarStore, period_days, sync_bars
+from daytrade.market_data import MARKET_TZ
+from daytrade.providers import MarketDataProvider, set_provider
+from daytrade.synthetic import synthetic_bars
+
+BARS_PER_SESSION = 26
+
+
+class StubProvider(MarketDataProvider):
+    """Serves fixed frames up to ``until`` and records every request."""
+
+    name = "stub"
+
+    def __init__(self, frames: dict):
+        super().__init__()
+        self.frames = frames
+        self.until = None
+        self.requests = []
+
+    def _fetch_bars(self, symbols, interval, period, start) -> dict:
+        self.requests.append({"symbols": sorted(symbols), "period": None if start is not None else period,
+                              "start": start})
+        out = {}
+        for sym in symbols:
+            df = self.frames[sym]
+            if self.until is not None:
+                df = df[df.index <= self.until]
+            if start is not None:
+                df = df[df.index >= start]
+            else:
+                sessions = df.index.normalize().unique()[-period_days(period):]
+                df = df[df.index.normalize() >= sessions[0]]
+            out[sym] = df
+        return out
+
+
+@pytest.fixture
+def provider():
+    stub = StubProvider({sym: synthetic_bars(sym, 10) for sym in ("SOXL", "TQQQ", "TECL")})
+    previous = set_provider(stub)
+    yield stub
+    set_provider(previous)
+
+
+def _at(day: str, hhmm: str) -> pd.Timestamp:
+    return pd.Timestamp(f"{day} {hhmm}", tz=MARKET_TZ)
+
+
+def test_append_load_round_trip(tmp_path):
+    store = BarStore(str(tmp_path / "bars.db"))
+    bars = synthetic_bars("SOXL", 3)
+    assert store.append("SOXL", "15m", bars) == len(bars)
+    loaded = store.load("SOXL", "15m")
+    assert str(loaded.index.tz) == MARKET_TZ
+    pd.testing.assert_frame_equal(loaded, bars, check_freq=False, check_index_type=False)
+
+    # Upsert: re-appending an overlapping, revised tail doesn't duplicate rows
+    revised = bars.iloc[-3:].assign(Close=bars["Close"].iloc[-3:] + 1)
+    assert store.append("SOXL", "15m", revised) == 3
+    loaded = store.load("SOXL", "15m")
+    assert len(loaded) == len(bars)
+    assert loaded["Close"].iloc[-1] == pytest.approx(bars["Close"].iloc[-1] + 1)
+    assert store.last_timestamp("SOXL", "15m") == bars.index[-1]
+
+
+def test_load_last_sessions_and_prune(tmp_path):
+    store = BarStore(str(tmp_path / "bars.db"))
+    store.append("SOXL", "15m", synthetic_bars("SOXL", 5))
+    store.append("TQQQ", "15m", synthetic_bars("TQQQ", 3, end="2025-06-20"))
+    assert len(store.load("SOXL", "15m", sessions=2)) == 2 * BARS_PER_SESSION
+    assert store.load("NOPE", "15m").empty
+
+    store.prune(keep_sessions=2)
+    soxl, tqqq = store.load("SOXL", "15m"), store.load("TQQQ", "15m")
+    # Each (symbol, interval) keeps its own last two sessions
+    assert soxl.index.normalize().nunique() == 2 and soxl.index[-1].day == 30
+    assert tqqq.index.normalize().nunique() == 2 and tqqq.index[-1].day == 20
+
+
+def test_cold_then_warm_restart(provider, tmp_path):
+    path = str(tmp_path / "bars.db")
+    provider.until = _at("2025-06-30", "12:00")
+    written = sync_bars(BarStore(path), ["SOXL", "TQQQ"], period="5d")
+    assert provider.requests == [{"symbols": ["SOXL", "TQQQ"], "period": "5d", "start": None}]
+    assert written == {"SOXL": 4 * BARS_PER_SESSION + 11, "TQQQ": 4 * BARS_PER_SESSION + 11}
+
+    # Restart (new store object on the same file) an hour later
+    provider.requests.clear()
+    provider.until = _at("2025-06-30", "13:00")
+    store = BarStore(path)
+    written = sync_bars(store, ["SOXL", "TQQQ"], period="5d")
+    assert provider.requests == [{"symbols": ["SOXL", "TQQQ"], "period": None, "start": _at("2025-06-30", "12:00")}]
+    assert written == {"SOXL": 5, "TQQQ": 5}          # the re-fetched 12:00 bar plus four new ones
+    assert store.last_timestamp("SOXL", "15m") == _at("2025-06-30", "13:00")
+
+
+def test_longer_period_backfills_again(provider, tmp_path):
+    store = BarStore(str(tmp_path / "bars.db"))
+    sync_bars(store, ["SOXL"], period="2d")
+    sync_bars(store, ["SOXL"], period="5d")
+    assert [r["period"] for r in provider.requests] == ["2d", "5d"]
+    assert store.backfilled_days("SOXL", "15m") == 5
+
+
+def test_stale_symbol_does_not_widen_the_warm_fetch(provider, tmp_path):
+    store = BarStore(str(tmp_path / "bars.db"))
+    provider.until = _at("2025-06-25", "15:45")
+    sync_bars(store, ["TECL"], period="5d")               # last synced days ago
+    provider.until = _at("2025-06-30", "11:00")
+    sync_bars(store, ["SOXL", "TQQQ"], period="5d")
+    provider.requests.clear()
+
+    provider.until = _at("2025-06-30", "11:30")
+    written = sync_bars(store, ["SOXL", "TQQQ", "TECL"], period="5d")
+    assert sorted(provider.requests, key=lambda r: r["start"]) == [
+        {"symbols": ["TECL"], "period": None, "start": _at("2025-06-25", "15:45")},
+        {"symbols": ["SOXL", "TQQQ"], "period": None, "start": _at("2025-06-30", "11:00")},
+    ]
+    assert written["SOXL"] == written["TQQQ"] == 3
+    assert written["TECL"] == 1 + 2 * BARS_PER_SESSION + 9       # 15:45 again, Thu, Fri, Mon to 11:30
@@ -0,0 +1,99 @@
+"""BriefingService against the offline OpenAI-compatible stub."""
+import json
+import threading
+import time
+
+import pytest
+
+from daytrade.briefing import BriefingService, briefing_key, briefing_prompt, stub_briefing, stub_server
+
+DAY = "2025-06-02"
+PRICES = "SOXL: $41.20 (+3.1%)\nTQQQ: $74.05 (+1.8%)\nTECL: $98.40 (-0.4%)"
+
+
+@pytest.fixture
+def stub():
+    """Stub on a free port; ``stub.calls`` counts chat completion requests."""
+    server = stub_server(port=0, delay=0.01)
+    calls = []
+
+    class Counting(server.RequestHandlerClass):
+        def do_POST(self):
+            calls.append(self.path)
+            super().do_POST()
+
+    server.RequestHandlerClass = Counting
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.calls = calls
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _wait(briefing, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while briefing.streaming and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return briefing
+
+
+def test_concurrent_requests_generate_once_and_persist(stub, tmp_path):
+    service = BriefingService(api_key="test", base_url=stub.base_url, directory=str(tmp_path))
+    prompt = briefing_prompt("Monday, June 02", "🟢 Bullish – trend day", 1.2, 17.5, "SOXL 9/9", PRICES)
+    key = briefing_key("🟢 Bullish – trend day", 1.2, 17.5, ["SOXL"])
+
+    start = threading.Barrier(8)
+    results = []
+
+    def session():
+        start.wait()
+        results.append(service.request(DAY, key, prompt))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(b) for b in results}) == 1
+
+    # Tokens show up in latest() while the stream is still running
+    seen = set()
+    while results[0].streaming:
+        latest = service.latest(DAY)
+        assert latest is results[0]
+        seen.add(len(latest.text))
+        time.sleep(0.005)
+    assert len(seen) > 3
+
+    briefing = _wait(results[0])
+    assert briefing.done and briefing.error is None
+    assert briefing.text == stub_briefing(prompt)
+    assert len(stub.calls) == 1
+
+    # Saved for other processes / restarts
+    with open(tmp_path / f"{DAY}.json") as fh:
+        assert json.load(fh)[key]["text"] == briefing.text
+    fresh = BriefingService(api_key="test", base_url=stub.base_url, directory=str(tmp_path))
+    reloaded = fresh.request(DAY, key, prompt)
+    assert reloaded.done and reloaded.text == briefing.text
+    assert fresh.latest(DAY).text == briefing.text
+    assert len(stub.calls) == 1
+
+
+def test_new_bucket_generates_again(stub, tmp_path):
+    service = BriefingService(api_key="test", base_url=stub.base_url, directory=str(tmp_path))
+    first = _wait(service.request(DAY, "Bullish|QQQ +1.0%|VIX 15+|SOXL", "QQQ from open: +1.20%"))
+    second = _wait(service.request(DAY, "Bullish|QQQ +1.5%|VIX 15+|SOXL", "QQQ from open: +1.60%"))
+    assert first.done and second.done and len(stub.calls) == 2
+    assert service.latest(DAY) is second
+    assert "+1.60%" in second.text
+
+
+def test_failed_generation_is_not_saved(tmp_path):
+    service = BriefingService(api_key="test", base_url="http://127.0.0.1:9/v1", directory=str(tmp_path))
+    briefing = _wait(service.request(DAY, "key", "prompt"), timeout=60)
+    assert briefing.status == "error" and briefing.text.startswith("⚠️")
+    assert not (tmp_path / f"{DAY}.json").exists()
+    assert service.request(DAY, "key", "prompt") is not briefing      # the next refresh retries
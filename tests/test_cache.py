@@ -0,0 +1,143 @@
+"""SingleFlightCache: coalesced misses, stale-while-revalidate, failed loads."""
+import threading
+import time
+
+import pytest
+
+from daytrade.cache import SingleFlightCache
+
+N = 16
+
+
+class SlowLoader:
+    """Counts calls; each one blocks until ``release`` is set."""
+
+    def __init__(self, value="v", error: Exception = None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return f"{self.value}{self.calls}"
+
+
+def _get_in_threads(cache, key, loader, n: int = N):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(cache.get(key, loader))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_concurrent_misses_load_once():
+    cache = SingleFlightCache(ttl=60)
+    loader = SlowLoader()
+    threads, results, errors = _get_in_threads(cache, "SOXL", loader)
+    assert loader.started.wait(5)
+    assert _wait_for(lambda: cache.stats()["coalesced"] == N - 1)
+    loader.release.set()
+    for t in threads:
+        t.join()
+    assert loader.calls == 1 and errors == []
+    assert results == ["v1"] * N
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["inflight"]) == (1, N - 1, 0)
+    assert cache.get("SOXL", loader) == "v1" and cache.stats()["hits"] == 1
+
+
+def test_stale_hit_serves_old_value_while_one_refresh_runs():
+    cache = SingleFlightCache(ttl=0.05, stale_ttl=60)
+    first = SlowLoader()
+    first.release.set()
+    assert cache.get("QQQ", first) == "v1"
+    time.sleep(0.06)
+
+    refresh = SlowLoader("new")
+    threads, results, _ = _get_in_threads(cache, "QQQ", refresh)
+    for t in threads:
+        t.join(5)
+    # Every caller got the stale value at once; the refresh is still blocked
+    assert results == ["v1"] * N
+    assert refresh.started.wait(5) and refresh.calls == 1
+    assert cache.stats()["refreshes"] == 1 and cache.stats()["stale_hits"] == N
+
+    refresh.release.set()
+    assert _wait_for(lambda: cache.peek("QQQ") == "new1")
+    assert cache.get("QQQ", refresh) == "new1" and refresh.calls == 1
+
+
+def test_failed_refresh_keeps_the_stale_value():
+    cache = SingleFlightCache(ttl=0.05, stale_ttl=60)
+    ok = SlowLoader()
+    ok.release.set()
+    cache.get("QQQ", ok)
+    time.sleep(0.06)
+    broken = SlowLoader(error=RuntimeError("upstream down"))
+    broken.release.set()
+    assert cache.get("QQQ", broken) == "v1"
+    assert _wait_for(lambda: cache.stats()["errors"] == 1 and cache.stats()["inflight"] == 0)
+    assert cache.get("QQQ", broken) == "v1"
+
+
+def test_loader_error_reaches_every_waiter_and_is_not_cached():
+    cache = SingleFlightCache(ttl=60)
+    loader = SlowLoader(error=ValueError("bad symbol"))
+    threads, results, errors = _get_in_threads(cache, "NOPE", loader)
+    assert loader.started.wait(5)
+    assert _wait_for(lambda: cache.stats()["coalesced"] == N - 1)
+    loader.release.set()
+    for t in threads:
+        t.join()
+    assert results == [] and len(errors) == N
+    assert all(isinstance(e, ValueError) and str(e) == "bad symbol" for e in errors)
+    assert loader.calls == 1
+    assert cache.stats()["entries"] == 0 and cache.stats()["inflight"] == 0
+
+    # Nothing was cached: the next call loads again
+    retry = SlowLoader()
+    retry.release.set()
+    assert cache.get("NOPE", retry) == "v1" and retry.calls == 1
+
+
+def test_max_entries_evicts_the_oldest():
+    cache = SingleFlightCache(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get(key, lambda key=key: key)
+    assert cache.peek("a") is None and cache.peek("b") == "b" and cache.peek("c") == "c"
+
+
+def test_expired_past_stale_ttl_is_a_miss():
+    cache = SingleFlightCache(ttl=0.01, stale_ttl=0.01)
+    cache.get("k", lambda: 1)
+    time.sleep(0.03)
+    assert cache.get("k", lambda: 2) == 2
+    assert cache.stats()["misses"] == 2 and cache.stats()["stale_hits"] == 0
+
+
+@pytest.mark.parametrize("key", [None, "k"])
+def test_invalidate(key):
+    cache = SingleFlightCache(ttl=60)
+    cache.get("k", lambda: 1)
+    cache.invalidate(key)
+    assert cache.get("k", lambda: 2) == 2
@@ -0,0 +1,56 @@
+"""SignalJournal: ET day partitions, part files and reading a day back."""
+import os
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from daytrade.gates import thresholds_for
+from daytrade.journal import GATE_FIELDS, SignalJournal, journal_days, load_day
+from daytrade.market_data import MARKET_TZ
+from daytrade.screener import screen
+from daytrade.synthetic import synthetic_symbols, synthetic_universe
+
+ET = ZoneInfo(MARKET_TZ)
+
+
+@pytest.fixture(scope="module")
+def signals():
+    frames = synthetic_universe(3, 5)
+    return screen(frames, synthetic_symbols(3), th=thresholds_for(False), now_et_time=datetime(2025, 6, 2, 10).time())
+
+
+def test_utc_evening_rows_land_on_the_et_day(tmp_path, signals):
+    journal = SignalJournal(str(tmp_path))
+    # 00:30 UTC on the 3rd is 20:30 ET on the 2nd
+    journal.record(datetime(2025, 6, 3, 0, 30, tzinfo=timezone.utc), "balanced", signals, 7)
+    journal.record(datetime(2025, 6, 3, 10, 0, tzinfo=ET), "strict", signals, 8)
+    assert journal.flush() == 2 * len(signals)
+    assert journal_days(str(tmp_path)) == [date(2025, 6, 2), date(2025, 6, 3)]
+    day = load_day("2025-06-02", str(tmp_path))
+    assert len(day) == len(signals) and set(day["mode"]) == {"balanced"}
+    assert set(GATE_FIELDS) | {"sacred_passed", "strength"} <= set(day.columns)
+
+
+def test_part_files_are_named_in_et(tmp_path, signals):
+    journal = SignalJournal(str(tmp_path))
+    before = datetime.now(ET)
+    journal.record(before, "balanced", signals)
+    journal.flush()
+    after = datetime.now(ET)
+    (name,) = os.listdir(journal.partition(before.date()))
+    stamp = name.split("-")[1]
+    assert stamp in {f"{t:%H%M%S}" for t in (before + timedelta(seconds=s) for s in
+                                              range(int((after - before).total_seconds()) + 2))}
+
+
+def test_rollover_compacts_the_previous_day(tmp_path, signals):
+    journal = SignalJournal(str(tmp_path))
+    journal.record(datetime(2025, 6, 2, 11, 0, tzinfo=ET), "balanced", signals)
+    journal.flush()
+    journal.record(datetime(2025, 6, 2, 11, 1, tzinfo=ET), "balanced", signals)
+    journal.flush()
+    journal.record(datetime(2025, 6, 3, 9, 45, tzinfo=ET), "balanced", signals)
+    journal.flush()
+    assert os.listdir(journal.partition(date(2025, 6, 2))) == ["journal.parquet"]
+    assert len(load_day(date(2025, 6, 2), str(tmp_path))) == 2 * len(signals)
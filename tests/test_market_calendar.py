@@ -0,0 +1,118 @@
+"""NYSE holiday, half-day and poll scheduling rules."""
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from daytrade.market_calendar import (
+    AFTERNOON_POLL_SECONDS, CLOSE_SETTLE_SECONDS, POLL_SECONDS, PRE_MARKET_POLL_SECONDS, early_closes, holidays,
+    is_trading_day, market_status, next_session, poll_delay, session,
+)
+from daytrade.market_data import MARKET_TZ
+
+ET = ZoneInfo(MARKET_TZ)
+
+
+def _et(*args) -> datetime:
+    return datetime(*args, tzinfo=ET)
+
+
+def test_saturday_independence_day_observed_friday():
+    assert holidays(2026)[date(2026, 7, 3)] == "Independence Day"
+    assert date(2026, 7, 3) not in early_closes(2026)      # the holiday itself, not a half day
+    assert is_trading_day(date(2026, 7, 2)) and session(date(2026, 7, 2)).close.hour == 16
+
+
+def test_saturday_new_year_not_observed():
+    assert date(2021, 12, 31) not in holidays(2021)
+    assert date(2021, 12, 31) not in holidays(2022)
+    assert is_trading_day(date(2021, 12, 31))
+    assert holidays(2023)[date(2023, 1, 2)] == "New Year's Day"    # Sunday -> Monday still applies
+
+
+def test_juneteenth_from_2022():
+    assert "Juneteenth" not in holidays(2021).values()
+    assert holidays(2022)[date(2022, 6, 20)] == "Juneteenth"        # Sunday -> Monday
+    assert holidays(2025)[date(2025, 6, 19)] == "Juneteenth"
+
+
+@pytest.mark.parametrize("day", [date(2024, 3, 29), date(2025, 4, 18), date(2026, 4, 3)])
+def test_good_friday(day):
+    assert holidays(day.year)[day] == "Good Friday"
+    assert session(day) is None
+
+
+def test_day_after_thanksgiving_closes_early():
+    day = date(2025, 11, 28)
+    assert early_closes(2025)[day] == "Day after Thanksgiving"
+    hours = session(day)
+    assert hours.early_close
+    assert hours.close == _et(2025, 11, 28, 13, 0)
+    assert hours.post_close == _et(2025, 11, 28, 17, 0)
+    assert market_status(_et(2025, 11, 28, 13, 30)).phase == "post"
+    assert session(date(2025, 11, 27)) is None
+
+
+def test_next_session_skips_weekends_and_holidays():
+    assert next_session(date(2025, 4, 17)).day == date(2025, 4, 21)   # Thu -> Good Friday -> Mon
+
+
+@pytest.mark.parametrize("now, expected", [
+    (_et(2025, 6, 2, 9, 30), POLL_SECONDS),
+    (_et(2025, 6, 2, 11, 59), POLL_SECONDS),
+    (_et(2025, 6, 2, 12, 0), AFTERNOON_POLL_SECONDS),
+    (_et(2025, 6, 2, 14, 30), AFTERNOON_POLL_SECONDS),
+    (_et(2025, 6, 2, 7, 0), PRE_MARKET_POLL_SECONDS),
+    (_et(2025, 6, 2, 9, 28), 120),                 # pre-market, but the open comes first
+    (_et(2025, 6, 2, 15, 59), AFTERNOON_POLL_SECONDS),
+    (_et(2025, 6, 2, 16, 0), CLOSE_SETTLE_SECONDS),
+    (_et(2025, 6, 2, 16, 1), 60),
+])
+def test_poll_delay_during_the_day(now, expected):
+    assert poll_delay(now) == expected
+
+
+def test_slow_cadence_still_lands_on_the_settle_poll():
+    assert poll_delay(_et(2025, 6, 2, 15, 59), poll_seconds=300) == 60 + CLOSE_SETTLE_SECONDS
+
+
+def test_sleeps_until_next_pre_open_after_the_settle_poll():
+    settled = _et(2025, 6, 2, 16, 0) + timedelta(seconds=CLOSE_SETTLE_SECONDS)
+    assert settled + timedelta(seconds=poll_delay(settled)) == _et(2025, 6, 3, 4, 0)
+    friday = _et(2025, 6, 6, 18, 0)
+    assert friday + timedelta(seconds=poll_delay(friday)) == _et(2025, 6, 9, 4, 0)
+
+
+def test_sleeps_through_a_holiday():
+    evening = _et(2025, 4, 17, 20, 30)
+    assert evening + timedelta(seconds=poll_delay(evening)) == _et(2025, 4, 21, 4, 0)
+
+
+def test_early_close_settle_poll():
+    assert poll_delay(_et(2025, 11, 28, 12, 30)) == AFTERNOON_POLL_SECONDS
+    assert poll_delay(_et(2025, 11, 28, 13, 0)) == CLOSE_SETTLE_SECONDS
+
+
+@pytest.mark.parametrize("now, phase", [
+    (_et(2025, 6, 7, 11, 0), "closed"),       # Saturday
+    (_et(2025, 7, 4, 11, 0), "closed"),       # holiday
+    (_et(2025, 6, 2, 17, 0), "post"),
+    (_et(2025, 6, 2, 21, 0), "closed"),
+    (_et(2025, 6, 2, 3, 0), "closed"),
+])
+def test_no_cadence_while_closed(now, phase):
+    status = market_status(now)
+    assert status.phase == phase
+    assert status.cadence() is None
+    assert not status.is_open
+
+
+def test_cadence_while_trading():
+    assert market_status(_et(2025, 6, 2, 10, 0)).cadence() == POLL_SECONDS
+    assert market_status(_et(2025, 6, 2, 13, 0)).cadence() == AFTERNOON_POLL_SECONDS
+    assert market_status(_et(2025, 6, 2, 5, 0)).cadence() == PRE_MARKET_POLL_SECONDS
+
+
+def test_status_from_another_timezone():
+    status = market_status(datetime(2025, 6, 2, 14, 0, tzinfo=ZoneInfo("UTC")))   # 10:00 ET
+    assert status.in_signal_window and status.now.tzinfo is not None
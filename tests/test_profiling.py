@@ -0,0 +1,58 @@
+"""MetricsRegistry: stage summaries and the JSON-lines log written off the hot path."""
+import json
+import time
+
+from daytrade import profiling
+from daytrade.profiling import MetricsRegistry, RerunProfile
+
+
+def _registry(tmp_path, **kwargs) -> MetricsRegistry:
+    return MetricsRegistry(prom_file=None, log_file=str(tmp_path / "profile_log.jsonl"), **kwargs)
+
+
+def test_record_summarises_and_logs(tmp_path):
+    registry = _registry(tmp_path)
+    for ms in (10.0, 20.0, 30.0):
+        registry.record("rerun", {"snapshot": ms, "heat_map": 1.0}, version=1)
+    assert registry.flush_log(timeout=5)
+    rows = {r["stage"]: r for r in registry.summary("rerun")}
+    assert rows["snapshot"]["count"] == 3 and rows["snapshot"]["p50_ms"] == 20.0
+    lines = [json.loads(line) for line in (tmp_path / "profile_log.jsonl").read_text().splitlines()]
+    assert [line["stages"]["snapshot"] for line in lines] == [10.0, 20.0, 30.0]
+    assert lines[0]["source"] == "rerun" and lines[0]["version"] == 1
+
+
+def test_log_rolls_over(tmp_path):
+    registry = _registry(tmp_path, max_log_bytes=200)
+    for i in range(20):
+        registry.record("poll", {"gates": float(i)})
+        registry.flush_log(timeout=5)
+    assert (tmp_path / "profile_log.jsonl.1").exists()
+    assert (tmp_path / "profile_log.jsonl").stat().st_size < 400
+
+
+def test_slow_disk_does_not_block_reruns(tmp_path, monkeypatch):
+    real_getsize = profiling.os.path.getsize
+
+    def slow_getsize(path):
+        time.sleep(0.5)
+        return real_getsize(path)
+
+    (tmp_path / "profile_log.jsonl").write_text("")
+    monkeypatch.setattr(profiling.os.path, "getsize", slow_getsize)
+    registry = _registry(tmp_path)
+    started = time.perf_counter()
+    for _ in range(5):
+        profile = RerunProfile("rerun", registry)
+        profile.lap("snapshot")
+        profile.finish()
+    assert time.perf_counter() - started < 0.3
+    assert registry.flush_log(timeout=5)
+    assert len((tmp_path / "profile_log.jsonl").read_text().splitlines()) == 5
+
+
+def test_no_log_file(tmp_path):
+    registry = MetricsRegistry(prom_file=None, log_file=None)
+    registry.record("rerun", {"snapshot": 1.0})
+    assert registry.flush_log(timeout=1)
+    assert registry.summary()[0]["count"] == 1
@@ -0,0 +1,114 @@
+"""Providers against the Parquet stand-in: fetch_batch, the poller, request metrics, rate limits."""
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from daytrade.bar_store import BarStore
+from daytrade.market_data import MARKET_TZ, fetch_batch
+from daytrade.poller import MarketPoller
+from daytrade.profiling import MetricsRegistry
+from daytrade.providers import ParquetProvider, RateLimiter, metrics_delta, set_provider
+from daytrade.synthetic import synthetic_bars
+
+SYMBOLS = ["SOXL", "TQQQ", "QQQ", "^VIX"]
+BARS_PER_SESSION = 26
+
+
+@pytest.fixture
+def provider(tmp_path):
+    stand_in = ParquetProvider(str(tmp_path / "market_data"))
+    for interval in ("15m", "1d"):
+        stand_in.save({sym: synthetic_bars(sym, 20, interval=interval) for sym in SYMBOLS}, interval)
+    previous = set_provider(stand_in)
+    yield stand_in
+    set_provider(previous)
+
+
+class SlowProvider(ParquetProvider):
+    def _fetch_bars(self, symbols, interval, period, start) -> dict:
+        time.sleep(1)
+        return super()._fetch_bars(symbols, interval, period, start)
+
+
+class BrokenProvider(ParquetProvider):
+    def _fetch_bars(self, symbols, interval, period, start) -> dict:
+        raise ConnectionError("upstream down")
+
+
+def test_fetch_batch_reads_the_stand_in(provider):
+    frames = fetch_batch(["SOXL", "QQQ", "NOPE"], period="2d", interval="15m")
+    assert list(frames) == ["SOXL", "QQQ", "NOPE"]
+    assert len(frames["SOXL"]) == 2 * BARS_PER_SESSION
+    assert str(frames["SOXL"].index.tz) == MARKET_TZ
+    assert frames["NOPE"].empty
+
+    start = frames["QQQ"].index[-3]
+    assert list(fetch_batch(["QQQ"], interval="15m", start=start)["QQQ"].index) == list(frames["QQQ"].index[-3:])
+
+
+def test_request_metrics(provider):
+    before = provider.metrics()
+    provider.bars(["SOXL", "TQQQ", "NOPE"], interval="1d", period="5d")
+    provider.bars(["QQQ"], interval="15m", period="1d")
+    delta = metrics_delta(before, provider.metrics())
+    assert (delta["calls"], delta["symbols"], delta["rows"]) == (2, 4, 2 * 5 + BARS_PER_SESSION)
+    assert (delta["errors"], delta["timeouts"], delta["provider"]) == (0, 0, "parquet")
+
+
+def test_timeouts_and_errors_come_back_empty(provider):
+    slow = SlowProvider(provider.root, timeout=0.05)
+    started = time.perf_counter()
+    assert slow.bars(["SOXL"])["SOXL"].empty
+    assert time.perf_counter() - started < 0.5
+    assert slow.metrics()["timeouts"] == 1 and "timeout" in slow.metrics()["last_error"]
+
+    broken = BrokenProvider(provider.root)
+    frames = broken.bars(["SOXL", "QQQ"])
+    assert list(frames) == ["SOXL", "QQQ"] and all(df.empty for df in frames.values())
+    assert broken.metrics()["errors"] == 1 and broken.metrics()["last_error"].startswith("ConnectionError")
+
+
+def test_hung_calls_do_not_starve_later_fetches(provider):
+    slow = SlowProvider(provider.root, timeout=0.05)
+    for _ in range(8):          # more than any worker pool would hold
+        slow.bars(["SOXL"])
+    fast = ParquetProvider(provider.root, timeout=0.5)
+    assert not fast.bars(["SOXL"])["SOXL"].empty
+
+
+def test_rate_limiter_throttles():
+    limiter = RateLimiter(per_minute=600, burst=2)      # 10 per second after a burst of 2
+    started = time.perf_counter()
+    waits = [limiter.acquire() for _ in range(5)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == [pytest.approx(0.1, abs=0.02)] * 3
+    assert time.perf_counter() - started == pytest.approx(0.3, abs=0.05)
+
+
+def test_provider_counts_throttled_time(provider):
+    limited = ParquetProvider(provider.root, calls_per_minute=1200, burst=1)
+    for _ in range(3):
+        limited.bars(["SOXL"], period="1d")
+    assert limited.metrics()["throttled_ms"] >= 80
+
+
+def test_poll_once_against_the_stand_in(provider, tmp_path):
+    registry = MetricsRegistry(prom_file=str(tmp_path / "daytrade.prom"), log_file=str(tmp_path / "profile.jsonl"))
+    clock = lambda: datetime(2025, 6, 30, 11, 0, tzinfo=ZoneInfo(MARKET_TZ))
+    poller = MarketPoller(BarStore(str(tmp_path / "bars.db")), ["SOXL", "TQQQ"], clock=clock, metrics=registry)
+    snapshot = poller.poll_once()
+
+    assert snapshot.version == 1
+    assert {"SOXL", "TQQQ", "QQQ"} <= set(snapshot.intraday)
+    assert len(snapshot.intraday["SOXL"]) == 5 * BARS_PER_SESSION
+    assert snapshot.vix > 0
+    assert {len(rows) for rows in snapshot.signals.values()} == {2}
+    assert snapshot.upstream["calls"] == 2 and snapshot.upstream["timeouts"] == 0
+    assert snapshot.upstream["rows"] > 0
+
+    # Warm poll: the bar store only asks the provider for bars after what it holds
+    again = poller.poll_once()
+    assert again.version == 2 and again.upstream["calls"] == 2
+    assert again.upstream["rows"] < snapshot.upstream["rows"]
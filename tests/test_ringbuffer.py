@@ -0,0 +1,124 @@
+"""RingBuffer wraparound / growth and BarRing's in-place merge with read-only views."""
+import numpy as np
+import pytest
+
+from daytrade.ringbuffer import FIELDS, INITIAL_ROWS, BarRing, Bars, RingBuffer
+from daytrade.synthetic import synthetic_bars
+
+
+def _rows(start: int, n: int) -> np.ndarray:
+    # Values that float32 can't hold exactly, so the dtype shows up in the comparisons
+    return (np.arange(start, start + n, dtype=np.float64)[:, None] + np.arange(5) / 10 + 1 / 3)
+
+
+def test_append_wraps_oldest_first():
+    ring = RingBuffer(5, FIELDS)
+    rows = _rows(0, 8)
+    for i, row in enumerate(rows):
+        ring.append(i, row)
+    ts, values = ring.arrays()
+    assert len(ring) == 5 and ring.last_ts == 7
+    assert ts.tolist() == [3, 4, 5, 6, 7]
+    assert values.dtype == np.float32
+    np.testing.assert_array_equal(values, rows[3:].astype(np.float32))
+
+
+def test_storage_grows_then_wraps():
+    ring = RingBuffer(200, FIELDS)
+    assert len(ring.ts) == INITIAL_ROWS
+    for i, row in enumerate(_rows(0, 150)):
+        ring.append(i, row)
+    assert len(ring.ts) == 200 and ring.arrays()[0].tolist() == list(range(150))
+    ring.extend(np.arange(150, 260), _rows(150, 110))
+    ts, values = ring.arrays()
+    assert ts.tolist() == list(range(60, 260)) and len(ring.ts) == 200
+    np.testing.assert_array_equal(values, _rows(60, 200).astype(np.float32))
+
+
+@pytest.mark.parametrize("chunks", [[7, 6], [3, 3, 3, 3, 3], [12], [4, 10, 2]])
+def test_extend_wraparound(chunks):
+    ring = RingBuffer(10, FIELDS)
+    start = 0
+    for n in chunks:
+        ring.extend(np.arange(start, start + n), _rows(start, n))
+        start += n
+    ts, values = ring.arrays()
+    expected = list(range(max(0, start - 10), start))
+    assert ts.tolist() == expected
+    np.testing.assert_array_equal(values, _rows(expected[0], len(expected)).astype(np.float32))
+
+
+def test_replace_last_and_copy():
+    ring = RingBuffer(4, FIELDS)
+    ring.extend(np.arange(6), _rows(0, 6))
+    clone = ring.copy()
+    ring.replace_last(np.full(5, 9.5))
+    assert ring.arrays()[1][-1].tolist() == [9.5] * 5
+    np.testing.assert_array_equal(clone.arrays()[1][-1], _rows(5, 1)[0].astype(np.float32))
+
+
+def test_bar_ring_keeps_the_newest_bars_in_order():
+    bars = synthetic_bars("SOXL", 3)                 # 78 bars into a 40-bar ring
+    ring = BarRing(40)
+    assert ring.update(bars) == len(bars)
+    view = ring.view()
+    assert len(view) == 40
+    assert list(view.index) == list(bars.index[-40:])
+    np.testing.assert_array_equal(view.values, bars[list(FIELDS)].to_numpy(np.float32)[-40:])
+    assert view.values.dtype == np.float32 and view.ts.dtype == np.int64
+
+
+def test_bar_ring_rolls_forward_through_many_polls():
+    bars = synthetic_bars("TQQQ", 4)
+    ring = BarRing(30)
+    ring.update(bars.iloc[:5])
+    for end in range(6, len(bars) + 1):
+        ring.update(bars.iloc[max(0, end - 3):end])  # each poll re-fetches the last few bars
+    view = ring.view()
+    assert list(view.index) == list(bars.index[-30:])
+    np.testing.assert_array_equal(view.close, bars["Close"].to_numpy(np.float32)[-30:])
+
+
+def test_forming_bar_is_updated_in_place_and_old_views_stay_put():
+    bars = synthetic_bars("TECL", 2)
+    ring = BarRing(60)
+    ring.update(bars.iloc[:-1])
+    before = ring.view()
+    assert ring.view() is before                     # unchanged ring -> same view object
+
+    forming = bars.iloc[-3:-1].copy()
+    forming.iloc[-1, forming.columns.get_loc("Close")] += 0.5
+    assert ring.update(forming) == 1
+    after = ring.view()
+    assert after is not before and len(after) == len(before)
+    assert after.close[-1] == np.float32(bars["Close"].iloc[-2] + 0.5)
+    assert before.close[-1] == np.float32(bars["Close"].iloc[-2])   # the old snapshot didn't move
+
+    assert ring.update(forming) == 0 and ring.view() is after
+    assert ring.update(bars.iloc[-2:]) == 2          # corrected forming bar + one new bar
+    assert len(ring.view()) == len(before) + 1
+
+
+def test_views_are_read_only():
+    ring = BarRing(10)
+    ring.update(synthetic_bars("SOXL", 1))
+    view = ring.view()
+    with pytest.raises(ValueError):
+        view.values[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        view.ts[0] = 0
+
+
+def test_older_history_starts_over():
+    ring = BarRing(200)
+    ring.update(synthetic_bars("SOXL", 2))
+    replay = synthetic_bars("SOXL", 1, end="2025-06-02")
+    assert ring.update(replay) == len(replay)
+    assert list(ring.view().index) == list(replay.index)
+
+
+def test_from_frame_round_trip():
+    bars = synthetic_bars("SOXL", 1)
+    frame = Bars.from_frame(bars).to_frame()
+    assert list(frame.index) == list(bars.index)
+    np.testing.assert_allclose(frame.to_numpy(), bars.to_numpy(), rtol=1e-6)
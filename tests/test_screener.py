@@ -0,0 +1,98 @@
+"""The vectorized screener against the per-ticker watchlist path, and ``rescore``."""
+from dataclasses import fields
+from datetime import time
+
+import pytest
+
+from daytrade.gates import signal_label, thresholds_for
+from daytrade.indicators import IndicatorEngine
+from daytrade.market_data import BENCHMARK, change_from_open
+from daytrade.screener import page, rescore, screen
+from daytrade.signals import evaluate_watchlist
+from daytrade.synthetic import synthetic_bars, synthetic_symbols, synthetic_universe
+
+N_SYMBOLS = 150
+IN_WINDOW, AFTER_WINDOW = time(10, 15), time(13, 0)
+
+
+@pytest.fixture(scope="module")
+def universe():
+    frames = synthetic_universe(N_SYMBOLS, 5, seed=3)
+    symbols = synthetic_symbols(N_SYMBOLS)
+    # Ragged histories: a symbol missing its last bars, one with fewer sessions
+    frames[symbols[0]] = frames[symbols[0]].iloc[:-5]
+    frames[symbols[1]] = synthetic_bars(symbols[1], 3, seed=3)
+    return frames, symbols
+
+
+def _assert_same(expected, actual):
+    # The watchlist path reads float32 ring views, the screener float64 frames: gates and labels match
+    # exactly, the indicator values to float32 precision
+    for f in fields(expected):
+        want, got = getattr(expected, f.name), getattr(actual, f.name)
+        if isinstance(want, float):
+            assert got == pytest.approx(want, rel=1e-4, abs=1e-4), (expected.ticker, f.name)
+        else:
+            assert got == want, (expected.ticker, f.name)
+
+
+@pytest.mark.parametrize("now", [IN_WINDOW, AFTER_WINDOW])
+@pytest.mark.parametrize("is_strict", [False, True])
+def test_matches_evaluate_watchlist(universe, is_strict, now):
+    frames, symbols = universe
+    th = thresholds_for(is_strict)
+    qqq_chg = change_from_open(frames[BENCHMARK])
+    expected = {r.ticker: r for r in evaluate_watchlist(symbols, frames, qqq_chg, th, IndicatorEngine(), now)}
+    screened = screen(frames, symbols, qqq_chg, th, now)
+    assert {r.ticker for r in screened} == set(expected)
+    for record in screened:
+        _assert_same(expected[record.ticker], record)
+    assert [r.strength for r in screened] == sorted((r.strength for r in screened), reverse=True)
+
+
+def test_a_mix_of_labels(universe):
+    # Guards the parity test against comparing nothing but "Sit Out"
+    frames, symbols = universe
+    labels = {r.label for r in screen(frames, symbols, th=thresholds_for(False), now_et_time=IN_WINDOW)}
+    assert {"Sit Out", "Watch", "Caution Buy"} <= labels
+
+
+@pytest.mark.parametrize("is_strict", [False, True])
+@pytest.mark.parametrize("qqq_chg", [-2.0, 0.0, 0.4, 3.0])
+@pytest.mark.parametrize("cached_at, now", [(AFTER_WINDOW, IN_WINDOW), (IN_WINDOW, AFTER_WINDOW),
+                                            (IN_WINDOW, IN_WINDOW)])
+def test_rescore_matches_a_fresh_screen(universe, is_strict, qqq_chg, cached_at, now):
+    frames, symbols = universe
+    th = thresholds_for(is_strict)
+    cached = screen(frames, symbols, 1.0, th, cached_at)
+    fresh = screen(frames, symbols, qqq_chg, th, now)
+    rescored = rescore(cached, qqq_chg, th, now)
+    assert [r.ticker for r in rescored] == [r.ticker for r in fresh]
+    for want, got in zip(fresh, rescored):
+        assert got == want
+
+
+def test_rescore_updates_the_moment_dependent_gates(universe):
+    frames, symbols = universe
+    th = thresholds_for(False)
+    cached = screen(frames, symbols, -20.0, th, AFTER_WINDOW)     # QQQ far down: everyone is relatively strong
+    assert all(r.rel_strength_ok and not r.time_ok for r in cached)
+
+    rescored = {r.ticker: r for r in rescore(cached, 20.0, th, IN_WINDOW)}
+    for before in cached:
+        after = rescored[before.ticker]
+        assert after.time_ok and not after.rel_strength_ok
+        assert after.strength == before.strength                 # one gate gained, one lost
+        assert after.label == signal_label(after.strength, after.sacred_passed)
+
+    up = {r.ticker: r for r in rescore(cached, -20.0, th, IN_WINDOW)}
+    assert all(up[r.ticker].strength == r.strength + 1 for r in cached)
+    assert rescore(cached, -20.0, th, AFTER_WINDOW) == cached     # nothing moved: same records
+
+
+def test_page():
+    records = list(range(50))
+    assert page(records, 1, 21) == (records[:21], 3)
+    assert page(records, 3, 21) == (records[42:], 3)
+    assert page(records, 9, 21) == (records[42:], 3)
+    assert page([], 1, 21) == ([], 1)
@@ -0,0 +1,74 @@
+"""TradeLog: the legacy CSV import, open/last trade queries and the Excel export."""
+import io
+import logging
+
+import pandas as pd
+
+from daytrade.trade_log import COLUMNS, TradeLog
+
+LEGACY_CSV = """Date,Ticker,Entry Price,Exit Price,Shares,P/L $,Notes
+2025-05-01 10:05,soxl,40.10,41.30,100,120.0,clean win
+2025-05-02 10:20,TQQQ,72.50,,50,,still open
+2025-05-02 10:45,TECL,,99.00,10,5.0,entry lost
+2025-05-03 10:15,FNGU,182.00,0,5,,open (0 exit)
+2025-05-03 11:00,NVDL,55.25,54.00,20,nan,
+,,,,,,
+2025-05-04 10:30,TSLL,12.40,12.90,200,100.0,last
+"""
+
+
+def _import(tmp_path):
+    csv = tmp_path / "trade_log.csv"
+    csv.write_text(LEGACY_CSV)
+    log = TradeLog(str(tmp_path / "trade_log.db"))
+    return log, csv, log.import_csv(str(csv))
+
+
+def test_import_skips_rows_without_entry_price(tmp_path, caplog):
+    with caplog.at_level(logging.WARNING, logger="daytrade.trade_log"):
+        log, _, imported = _import(tmp_path)
+    assert imported == 5 and log.count() == 5
+    assert "skipped 2 row(s)" in caplog.text and "CSV lines 4, 7" in caplog.text
+    assert "TECL" not in set(log.all_trades()["Ticker"])
+
+
+def test_open_and_last_trades(tmp_path):
+    log, _, _ = _import(tmp_path)
+    open_ = log.open_trades()
+    assert list(open_.columns) == COLUMNS
+    assert list(open_["Ticker"]) == ["TQQQ", "FNGU"]          # blank and 0 exits are still open
+    assert open_["Exit Price"].isna().all()
+    assert log.open_tickers() == ["FNGU", "TQQQ"]
+
+    last = log.last_trades(3)
+    assert list(last["Ticker"]) == ["FNGU", "NVDL", "TSLL"]   # oldest first
+    nvdl = last.set_index("Ticker").loc["NVDL"]
+    assert pd.isna(nvdl["P/L $"]) and nvdl["Notes"] == ""       # NaN P/L stays NULL, no "nan" text
+    assert log.all_trades().iloc[0]["Ticker"] == "SOXL"
+
+
+def test_import_runs_once(tmp_path):
+    log, csv, first = _import(tmp_path)
+    assert first == 5
+    assert log.import_csv(str(csv)) == 0
+    assert TradeLog(log.path).import_csv(str(csv)) == 0      # a restart doesn't re-import either
+    assert log.count() == 5
+
+
+def test_missing_csv(tmp_path):
+    assert TradeLog(str(tmp_path / "trade_log.db")).import_csv(str(tmp_path / "nope.csv")) == 0
+
+
+def test_excel_round_trip(tmp_path):
+    log, _, _ = _import(tmp_path)
+    log.add_trade("upro", 80.0, 10, notes="after import")
+    buffer = io.BytesIO()
+    log.to_excel(buffer)
+    buffer.seek(0)
+    back = pd.read_excel(buffer, sheet_name="Trade_Log")
+    expected = log.all_trades()
+    assert list(back.columns) == COLUMNS and len(back) == 6
+    assert list(back["Ticker"]) == list(expected["Ticker"])
+    pd.testing.assert_series_equal(back["Entry Price"], expected["Entry Price"])
+    pd.testing.assert_series_equal(back["P/L $"], expected["P/L $"])
+    assert back["Exit Price"].isna().sum() == 3